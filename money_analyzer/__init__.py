@@ -1,5 +1,6 @@
 """Money analyzer package."""
 
 from .models import CANONICAL_COLUMNS, Transaction
+from .table import TransactionTable
 
-__all__ = ["CANONICAL_COLUMNS", "Transaction"]
+__all__ = ["CANONICAL_COLUMNS", "Transaction", "TransactionTable"]
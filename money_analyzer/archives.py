@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz")
+MEMBER_SEPARATOR = "!"
+NO_PDF_MEMBERS_WARNING = "archive contains no PDF statements"
+
+
+def archive_suffix(path: Path) -> str:
+    name = path.name.lower()
+    return next((suffix for suffix in ARCHIVE_SUFFIXES if name.endswith(suffix)), "")
+
+
+def is_archive(path: Path) -> bool:
+    return bool(archive_suffix(path))
+
+
+def archive_stem(path: Path) -> str:
+    return path.name[: len(path.name) - len(archive_suffix(path))]
+
+
+def member_source_name(archive: Path, member: str) -> str:
+    return f"{archive.name}{MEMBER_SEPARATOR}{member}"
+
+
+def member_output_stem(archive: Path, member: str) -> str:
+    # Members of different folders may share a file name, so the member's
+    # folders are kept in the flattened stem.
+    member_path = PurePosixPath(member)
+    flattened = member_path.with_suffix("").as_posix().strip("/").replace("/", "_")
+    return f"{archive_stem(archive)}{MEMBER_SEPARATOR}{flattened}"
+
+
+def _is_pdf_name(name: str) -> bool:
+    return name.lower().endswith(".pdf")
+
+
+def iter_archive_pdfs(archive: Path) -> Iterator[tuple[str, bytes | Exception]]:
+    # Members are decompressed straight into memory, one at a time; nothing
+    # is unpacked to disk. Tars are read as a stream, so compressed tars are
+    # decompressed once, front to back. A member that cannot be read is
+    # yielded with the exception in place of its bytes, so the caller can
+    # report it and the members after it are still read.
+    if archive.name.lower().endswith(".zip"):
+        with zipfile.ZipFile(archive) as bundle:
+            for info in bundle.infolist():
+                if info.is_dir() or not _is_pdf_name(info.filename):
+                    continue
+                try:
+                    data = bundle.read(info)
+                except Exception as error:  # noqa: BLE001
+                    yield info.filename, error
+                    continue
+                yield info.filename, data
+        return
+
+    with tarfile.open(archive, mode="r|*") as bundle:
+        for member in bundle:
+            if not member.isfile() or not _is_pdf_name(member.name):
+                continue
+            handle = bundle.extractfile(member)
+            if handle is None:
+                continue
+            try:
+                data = handle.read()
+            except Exception as error:  # noqa: BLE001
+                # A stream cannot seek past a damaged member, so the rest of
+                # the tar is unreadable too.
+                yield member.name, error
+                return
+            yield member.name, data
+
+
+def iter_statement_bytes(path: Path) -> Iterator[tuple[str, bytes | Exception]]:
+    # (member, bytes) for every statement in path; member is empty for a
+    # plain PDF.
+    if is_archive(path):
+        yield from iter_archive_pdfs(path)
+    else:
+        yield "", path.read_bytes()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import csv
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from time import perf_counter
+
+from money_analyzer.models import Transaction
+from money_analyzer.table import TransactionTable
+
+
+DEFAULT_CACHE_SIZE = 65_536
+RULE_KINDS = ("exact", "prefix", "substring", "regex")
+RULE_COLUMNS = ("match", "pattern", "category")
+# Regex rules that reference their own groups or set global inline flags
+# cannot be pasted into one alternation; they are matched one by one.
+GROUP_REFERENCE_PATTERN = re.compile(r"\\[1-9]|\(\?P=|\(\?\(")
+GLOBAL_FLAGS_PATTERN = re.compile(r"^\(\?[aiLmsux]+\)")
+
+
+def normalize_merchant(value: str) -> str:
+    return " ".join(value.split()).lower()
+
+
+@dataclass(frozen=True, slots=True)
+class CategoryRule:
+    kind: str
+    pattern: str
+    category: str
+
+
+class PrefixNode:
+    __slots__ = ("children", "category")
+
+    def __init__(self) -> None:
+        self.children: dict[str, PrefixNode] = {}
+        self.category: str | None = None
+
+
+@dataclass(slots=True)
+class CategorizeReport:
+    rows: int = 0
+    matched: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "CategorizeReport") -> None:
+        self.rows += other.rows
+        self.matched += other.matched
+        self.cache_hits += other.cache_hits
+        self.cache_misses += other.cache_misses
+        self.seconds += other.seconds
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.cache_hits + self.cache_misses
+        return self.cache_hits / lookups if lookups else 0.0
+
+    def summary(self) -> str:
+        return (
+            f"Categorized {self.rows} row(s), {self.matched} matched, "
+            f"{self.rows_per_second:,.0f} rows/s, cache hit rate {self.hit_rate:.1%}"
+        )
+
+
+def compile_rule_regex(pattern: str) -> re.Pattern[str]:
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def shares_alternation(pattern: str) -> bool:
+    return not (GROUP_REFERENCE_PATTERN.search(pattern) or GLOBAL_FLAGS_PATTERN.match(pattern))
+
+
+def load_category_rules(rules_file: Path) -> list[CategoryRule]:
+    rules = []
+    with rules_file.open("r", newline="", encoding="utf-8") as handle:
+        reader = csv.DictReader(handle)
+        missing = [column for column in RULE_COLUMNS if column not in (reader.fieldnames or ())]
+        if missing:
+            raise ValueError(f"{rules_file} is missing column(s): {', '.join(missing)}")
+        for line_number, row in enumerate(reader, start=2):
+            kind = row["match"].strip().lower()
+            if kind not in RULE_KINDS:
+                raise ValueError(
+                    f"{rules_file}:{line_number}: unknown match '{row['match']}', "
+                    f"expected one of {', '.join(RULE_KINDS)}"
+                )
+            if kind == "regex":
+                try:
+                    compile_rule_regex(row["pattern"])
+                except re.error as error:
+                    raise ValueError(
+                        f"{rules_file}:{line_number}: invalid regex '{row['pattern']}' ({error})"
+                    ) from error
+            rules.append(
+                CategoryRule(kind=kind, pattern=row["pattern"], category=row["category"].strip())
+            )
+    return rules
+
+
+class Categorizer:
+    # Rules are compiled per kind and tried in the order exact, longest
+    # prefix, substring, regex. Substring and regex rules each run as one
+    # alternation: the leftmost match wins, and at the same position the rule
+    # listed first. Regex rules that cannot share an alternation fall back to
+    # per-rule patterns with the same leftmost-then-first priority.
+    def __init__(
+        self, rules: Iterable[CategoryRule], cache_size: int = DEFAULT_CACHE_SIZE
+    ) -> None:
+        self.rules = list(rules)
+        self.exact: dict[str, str] = {}
+        self.prefix_trie = PrefixNode()
+        self.has_prefixes = False
+        substrings: list[CategoryRule] = []
+        regexes: list[CategoryRule] = []
+        for rule in self.rules:
+            if rule.kind == "exact":
+                self.exact.setdefault(normalize_merchant(rule.pattern), rule.category)
+            elif rule.kind == "prefix":
+                self._add_prefix(normalize_merchant(rule.pattern), rule.category)
+            elif rule.kind == "substring":
+                substrings.append(rule)
+            elif rule.kind == "regex":
+                regexes.append(rule)
+            else:
+                raise ValueError(f"Unknown rule kind '{rule.kind}'")
+
+        self.substring_categories = [rule.category for rule in substrings]
+        self.substring_pattern = self._alternation(
+            re.escape(normalize_merchant(rule.pattern)) for rule in substrings
+        )
+        self.regex_categories = [rule.category for rule in regexes]
+        self.regex_pattern: re.Pattern[str] | None = None
+        self.regex_rules: list[re.Pattern[str]] = []
+        if all(shares_alternation(rule.pattern) for rule in regexes):
+            try:
+                self.regex_pattern = self._alternation(
+                    [rule.pattern for rule in regexes], re.IGNORECASE
+                )
+            except re.error:
+                # e.g. two rules defining the same group name
+                self.regex_pattern = None
+        if regexes and self.regex_pattern is None:
+            for rule in regexes:
+                try:
+                    self.regex_rules.append(compile_rule_regex(rule.pattern))
+                except re.error as error:
+                    raise ValueError(f"Invalid regex rule '{rule.pattern}' ({error})") from error
+        self._lookup = lru_cache(maxsize=cache_size)(self._classify_normalized)
+
+    @classmethod
+    def from_file(cls, rules_file: Path, cache_size: int = DEFAULT_CACHE_SIZE) -> "Categorizer":
+        return cls(load_category_rules(rules_file), cache_size=cache_size)
+
+    @staticmethod
+    def _alternation(patterns: Iterable[str], flags: int = 0) -> re.Pattern[str] | None:
+        # The outer group names tell which rule matched via match.lastgroup.
+        groups = [f"(?P<r{index}>{pattern})" for index, pattern in enumerate(patterns)]
+        return re.compile("|".join(groups), flags) if groups else None
+
+    def _add_prefix(self, prefix: str, category: str) -> None:
+        node = self.prefix_trie
+        for char in prefix:
+            node = node.children.setdefault(char, PrefixNode())
+        if node.category is None:
+            node.category = category
+        self.has_prefixes = True
+
+    def _longest_prefix(self, merchant: str) -> str | None:
+        node = self.prefix_trie
+        found = node.category
+        for char in merchant:
+            child = node.children.get(char)
+            if child is None:
+                break
+            node = child
+            if node.category is not None:
+                found = node.category
+        return found
+
+    def _classify_normalized(self, merchant: str) -> str:
+        category = self.exact.get(merchant)
+        if category is not None:
+            return category
+        if self.has_prefixes:
+            category = self._longest_prefix(merchant)
+            if category is not None:
+                return category
+        for pattern, categories in (
+            (self.substring_pattern, self.substring_categories),
+            (self.regex_pattern, self.regex_categories),
+        ):
+            if pattern is not None:
+                match = pattern.search(merchant)
+                if match is not None and match.lastgroup is not None:
+                    return categories[int(match.lastgroup[1:])]
+        if self.regex_rules:
+            best_start = len(merchant) + 1
+            best = ""
+            for index, pattern in enumerate(self.regex_rules):
+                match = pattern.search(merchant)
+                if match is not None and match.start() < best_start:
+                    best_start, best = match.start(), self.regex_categories[index]
+            return best
+        return ""
+
+    def classify(self, merchant: str) -> str:
+        return self._lookup(normalize_merchant(merchant))
+
+    def _cache_counts(self) -> tuple[int, int]:
+        info = self._lookup.cache_info()
+        return info.hits, info.misses
+
+    def iter_categorized(
+        self, transactions: Iterable[Transaction], report: CategorizeReport
+    ) -> Iterator[Transaction]:
+        # Only rows without a category are filled; existing ones are kept.
+        hits, misses = self._cache_counts()
+        classify = self.classify
+        try:
+            for tx in transactions:
+                if not tx.category:
+                    started = perf_counter()
+                    tx.category = classify(tx.merchant or tx.description)
+                    report.seconds += perf_counter() - started
+                    report.rows += 1
+                    report.matched += bool(tx.category)
+                yield tx
+        finally:
+            after_hits, after_misses = self._cache_counts()
+            report.cache_hits += after_hits - hits
+            report.cache_misses += after_misses - misses
+
+    def categorize_table(self, table: TransactionTable, report: CategorizeReport) -> None:
+        started = perf_counter()
+        hits, misses = self._cache_counts()
+        categories = table.dictionaries["category"]
+        codes = table.codes["category"]
+        empty = categories.codes.get("")
+        merchants = table.text["merchant"]
+        descriptions = table.text["description"]
+        for index, code in enumerate(codes):
+            if code != empty:
+                continue
+            category = self.classify(merchants[index] or descriptions[index])
+            report.rows += 1
+            if category:
+                report.matched += 1
+                codes[index] = categories.encode(category)
+        after_hits, after_misses = self._cache_counts()
+        report.cache_hits += after_hits - hits
+        report.cache_misses += after_misses - misses
+        report.seconds += perf_counter() - started
@@ -1,10 +1,90 @@
 from __future__ import annotations
 
 import argparse
+import base64
+import csv
+import hashlib
+import heapq
+import json
+import tempfile
+from collections.abc import Container, Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from itertools import groupby
 from pathlib import Path
+from time import perf_counter
 
-from money_analyzer.csv_io import export_transactions_to_csv, load_transactions_from_csv
-from money_analyzer.models import Transaction
+from money_analyzer.categorize import CategorizeReport, Categorizer, load_category_rules
+from money_analyzer.columnar import write_columnar_ledger
+from money_analyzer.csv_io import (
+    export_transactions_to_csv,
+    iter_transactions_from_csv,
+    load_transactions_from_csv,
+    open_atomic_output,
+)
+from money_analyzer.dedup_index import (
+    DigestIndex,
+    DigestIndexError,
+    build_digest_index,
+    extend_digest_index,
+    write_digest_index,
+)
+from money_analyzer.metrics import (
+    CsvFileMetrics,
+    StageMetrics,
+    elapsed_ms,
+    profiled,
+    write_stats,
+)
+from money_analyzer.models import CANONICAL_COLUMNS, FINGERPRINT_BYTES, Transaction
+from money_analyzer.reconcile import (
+    DEFAULT_TRANSFER_WINDOW_DAYS,
+    default_transfers_path,
+    export_transfer_pairs,
+    mark_transfers,
+    match_transfers,
+)
+from money_analyzer.sqlite_ledger import SqliteLedger
+from money_analyzer.table import TransactionTable, export_table_to_csv
+
+
+MANIFEST_VERSION = 2
+MERGE_FAN_IN = 64
+# Run files carry each row's position in the inputs next to the canonical
+# columns, so the external combine keeps the same duplicate as the in-memory one.
+RUN_SEQ_COLUMN = "seq"
+DEFAULT_OUTPUT_DIR = Path("output/combined")
+# Each format gets its own default file, so a binary ledger never lands on
+# the CSV path that report, transfers and categorize read.
+LEDGER_SUFFIXES = {"csv": ".csv", "columnar": ".columnar", "sqlite": ".sqlite"}
+
+
+@dataclass(slots=True)
+class ManifestEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+    fingerprints: list[int] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class IncrementalCombineResult:
+    transactions: list[Transaction]
+    manifest: dict[str, ManifestEntry]
+    loaded_files: list[Path] = field(default_factory=list)
+    retracted_rows: int = 0
+    # Fingerprints of ``transactions``.
+    fingerprints: set[int] = field(default_factory=set)
+    # When set, ``transactions`` holds only the new rows, which are merged into
+    # the existing sorted ledger on save instead of replacing it.
+    merge_into_ledger: bool = False
+    ledger_rows: int = 0
+    # Manifest keys of merged inputs that are no longer among the inputs.
+    removed_inputs: list[str] = field(default_factory=list)
+
+    @property
+    def changes_ledger(self) -> bool:
+        return bool(self.loaded_files or self.removed_inputs)
 
 
 def collect_csv_files(inputs: list[Path]) -> list[Path]:
@@ -17,20 +97,292 @@ def collect_csv_files(inputs: list[Path]) -> list[Path]:
     return files
 
 
+def ledger_sort_key(tx: Transaction) -> tuple[object, ...]:
+    return (tx.date, tx.amount, tx.description.lower())
+
+
+def combine_csv_table(
+    csv_files: list[Path], metrics: StageMetrics | None = None
+) -> TransactionTable:
+    table = TransactionTable()
+    if metrics is None:
+        for csv_file in csv_files:
+            table.extend_from_csv(csv_file)
+        return table.deduplicated().sorted()
+
+    for csv_file in csv_files:
+        rows_before = len(table)
+        started = perf_counter()
+        table.extend_from_csv(csv_file)
+        load_ms = elapsed_ms(started)
+        metrics.record("load", load_ms)
+        metrics.files.append(
+            CsvFileMetrics(
+                source_file=str(csv_file),
+                bytes=csv_file.stat().st_size,
+                rows=len(table) - rows_before,
+                load_ms=load_ms,
+            )
+        )
+    with metrics.stage("dedupe"):
+        table = table.deduplicated()
+    with metrics.stage("sort"):
+        return table.sorted()
+
+
 def combine_csv_files(csv_files: list[Path]) -> list[Transaction]:
-    seen: set[tuple[str, ...]] = set()
-    combined: list[Transaction] = []
+    return combine_csv_table(csv_files).to_transactions()
+
+
+def combine_csv_files_external(
+    csv_files: list[Path],
+    output_file: Path,
+    max_rows_in_memory: int,
+    tmp_dir: Path | None = None,
+) -> int:
+    with tempfile.TemporaryDirectory(prefix="money-combine-", dir=tmp_dir) as run_dir:
+        runs = _spill_sorted_runs(csv_files, max_rows_in_memory, Path(run_dir))
+        merge_pass = 0
+        while len(runs) > MERGE_FAN_IN:
+            merged_runs = []
+            for start in range(0, len(runs), MERGE_FAN_IN):
+                group = runs[start : start + MERGE_FAN_IN]
+                merged = Path(run_dir) / f"merge-{merge_pass:03}-{start:06}.csv"
+                _write_run(_merge_sorted_runs(group), merged)
+                for run in group:
+                    run.unlink()
+                merged_runs.append(merged)
+            runs = merged_runs
+            merge_pass += 1
+        return export_transactions_to_csv(
+            _dedupe_sorted(_merge_sorted_runs(runs)), output_file
+        )
+
+
+def _run_sort_key(row: tuple[int, Transaction]) -> tuple[object, ...]:
+    # Equal keys keep input order, like the in-memory stable sort.
+    seq, tx = row
+    return (*ledger_sort_key(tx), seq)
+
+
+def _write_run(rows: Iterable[tuple[int, Transaction]], run: Path) -> None:
+    with open_atomic_output(run) as handle:
+        writer = csv.DictWriter(handle, fieldnames=[*CANONICAL_COLUMNS, RUN_SEQ_COLUMN])
+        writer.writeheader()
+        for seq, tx in rows:
+            writer.writerow({**tx.to_csv_row(), RUN_SEQ_COLUMN: seq})
+
+
+def _iter_run(run: Path) -> Iterator[tuple[int, Transaction]]:
+    with run.open("r", newline="", encoding="utf-8") as handle:
+        reader = csv.reader(handle)
+        position = next(reader).index(RUN_SEQ_COLUMN)
+        seqs = (int(row[position]) for row in reader)
+        yield from zip(seqs, iter_transactions_from_csv(run))
+
+
+def _spill_sorted_runs(csv_files: list[Path], run_rows: int, run_dir: Path) -> list[Path]:
+    runs: list[Path] = []
+    buffer: list[tuple[int, Transaction]] = []
+
+    def flush() -> None:
+        buffer.sort(key=_run_sort_key)
+        run = run_dir / f"run-{len(runs):06}.csv"
+        _write_run(buffer, run)
+        runs.append(run)
+        buffer.clear()
+
+    seq = 0
+    for csv_file in csv_files:
+        for tx in iter_transactions_from_csv(csv_file):
+            buffer.append((seq, tx))
+            seq += 1
+            if len(buffer) >= run_rows:
+                flush()
+    if buffer:
+        flush()
+    return runs
+
 
+def _merge_sorted_runs(runs: list[Path]) -> Iterator[tuple[int, Transaction]]:
+    return heapq.merge(*(_iter_run(run) for run in runs), key=_run_sort_key)
+
+
+def _dedupe_sorted(rows: Iterable[tuple[int, Transaction]]) -> Iterator[Transaction]:
+    # Duplicates share date and amount, so they always land in the same
+    # (date, amount) group of the sorted stream; only that group is held.
+    # The copy read first survives, as in the in-memory combine, even when a
+    # later copy sorts ahead of it (e.g. " coffee " before "Coffee").
+    for _, group in groupby(rows, key=lambda row: (row[1].date, row[1].amount)):
+        members = [(seq, tx, tx.fingerprint()) for seq, tx in group]
+        first_seq: dict[int, int] = {}
+        for seq, _, fingerprint in members:
+            if seq < first_seq.get(fingerprint, seq + 1):
+                first_seq[fingerprint] = seq
+        for seq, tx, fingerprint in members:
+            if first_seq[fingerprint] == seq:
+                yield tx
+
+
+def default_manifest_path(ledger_file: Path) -> Path:
+    return ledger_file.with_name(f"{ledger_file.name}.manifest.json")
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for block in iter(lambda: handle.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(manifest_file: Path) -> dict[str, ManifestEntry]:
+    if not manifest_file.exists():
+        return {}
+    payload = json.loads(manifest_file.read_text(encoding="utf-8"))
+    if payload.get("version") != MANIFEST_VERSION:
+        return {}
+    return {
+        key: ManifestEntry(
+            size=entry["size"],
+            mtime_ns=entry["mtime_ns"],
+            sha256=entry["sha256"],
+            fingerprints=unpack_fingerprints(entry["fingerprints"]),
+        )
+        for key, entry in payload["inputs"].items()
+    }
+
+
+def pack_fingerprints(fingerprints: Iterable[int]) -> str:
+    # 16 raw bytes per row instead of a JSON list of seven strings.
+    raw = b"".join(fingerprint.to_bytes(FINGERPRINT_BYTES, "big") for fingerprint in fingerprints)
+    return base64.b64encode(raw).decode("ascii")
+
+
+def unpack_fingerprints(packed: str) -> list[int]:
+    raw = base64.b64decode(packed)
+    return [
+        int.from_bytes(raw[start : start + FINGERPRINT_BYTES], "big")
+        for start in range(0, len(raw), FINGERPRINT_BYTES)
+    ]
+
+
+def save_manifest(manifest_file: Path, manifest: dict[str, ManifestEntry]) -> None:
+    manifest_file.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "version": MANIFEST_VERSION,
+        "inputs": {
+            key: {**asdict(entry), "fingerprints": pack_fingerprints(entry.fingerprints)}
+            for key, entry in sorted(manifest.items())
+        },
+    }
+    manifest_file.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def combine_csv_files_incremental(
+    csv_files: list[Path],
+    ledger_file: Path,
+    manifest_file: Path,
+    dedup_index: Path | None = None,
+) -> IncrementalCombineResult:
+    # Without the ledger the manifest describes nothing on disk; rebuild fully.
+    manifest = load_manifest(manifest_file) if ledger_file.exists() else {}
+
+    pending: list[tuple[str, Path, int, int, str]] = []
+    input_keys: set[str] = set()
     for csv_file in csv_files:
+        key = str(csv_file.resolve())
+        input_keys.add(key)
+        stat = csv_file.stat()
+        entry = manifest.get(key)
+        if entry and entry.size == stat.st_size and entry.mtime_ns == stat.st_mtime_ns:
+            continue
+        sha256 = file_sha256(csv_file)
+        if entry and entry.sha256 == sha256:
+            entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+            continue
+        pending.append((key, csv_file, stat.st_size, stat.st_mtime_ns, sha256))
+
+    result = IncrementalCombineResult(
+        transactions=[], manifest=manifest, removed_inputs=sorted(set(manifest) - input_keys)
+    )
+    if not pending and not result.removed_inputs:
+        return result
+
+    # The old rows of a changed or removed input are retracted unless another
+    # merged input still contains the same fingerprint.
+    changed_keys = {key for key, *_ in pending if key in manifest}
+    changed_keys.update(result.removed_inputs)
+
+    # Pure additions can be checked against the on-disk index of the ledger's
+    # fingerprints; the ledger itself is then only streamed once, on save.
+    if dedup_index is not None and manifest and not changed_keys:
+        try:
+            with DigestIndex(dedup_index) as index:
+                if index.covers(ledger_file):
+                    result.merge_into_ledger = True
+                    _load_pending(pending, result, index)
+                    return result
+        except DigestIndexError:
+            pass
+
+    stale: set[int] = set()
+    for key in changed_keys:
+        stale.update(manifest.pop(key).fingerprints)
+    for entry in manifest.values():
+        stale.difference_update(entry.fingerprints)
+
+    if manifest or changed_keys:
+        for tx in load_transactions_from_csv(ledger_file):
+            fingerprint = tx.fingerprint()
+            if fingerprint in stale:
+                result.retracted_rows += 1
+                continue
+            result.fingerprints.add(fingerprint)
+            result.transactions.append(tx)
+
+    _load_pending(pending, result)
+    result.ledger_rows = len(result.transactions)
+    return result
+
+
+def _load_pending(
+    pending: list[tuple[str, Path, int, int, str]],
+    result: IncrementalCombineResult,
+    known: Container[int] = (),
+) -> None:
+    seen = result.fingerprints
+    for key, csv_file, size, mtime_ns, sha256 in pending:
+        fingerprints: dict[int, None] = {}
         for tx in load_transactions_from_csv(csv_file):
             fingerprint = tx.fingerprint()
-            if fingerprint in seen:
+            fingerprints[fingerprint] = None
+            if fingerprint in seen or fingerprint in known:
                 continue
             seen.add(fingerprint)
-            combined.append(tx)
+            result.transactions.append(tx)
+        result.manifest[key] = ManifestEntry(
+            size=size, mtime_ns=mtime_ns, sha256=sha256, fingerprints=list(fingerprints)
+        )
+        result.loaded_files.append(csv_file)
+    result.transactions.sort(key=ledger_sort_key)
+
+
+@contextmanager
+def _no_stage(name: str) -> Iterator[None]:
+    yield
+
 
-    combined.sort(key=lambda tx: (tx.date, tx.amount, tx.description.lower()))
-    return combined
+def default_output_path(output_format: str) -> Path:
+    return DEFAULT_OUTPUT_DIR / f"transactions{LEDGER_SUFFIXES[output_format]}"
+
+
+def check_category_rules(rules_file: Path) -> None:
+    # Bad rules are reported as file:line before any input is read.
+    try:
+        load_category_rules(rules_file)
+    except (OSError, ValueError) as error:
+        raise SystemExit(f"Invalid --categories rules: {error}") from error
 
 
 def parse_args() -> argparse.Namespace:
@@ -44,20 +396,250 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--output",
         type=Path,
-        default=Path("output/combined/transactions.csv"),
-        help="Output combined CSV path",
+        default=None,
+        help=(
+            f"Output ledger path (default: {default_output_path('csv')}, with the "
+            "format's suffix for other --format values)"
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only load new or changed inputs and merge them into the existing output ledger",
+    )
+    parser.add_argument(
+        "--manifest",
+        type=Path,
+        default=None,
+        help="Manifest of merged inputs for --incremental (default: <output>.manifest.json)",
+    )
+    parser.add_argument(
+        "--dedup-index",
+        type=Path,
+        default=None,
+        help=(
+            "Sorted fingerprint index of the ledger for --incremental; when only new inputs "
+            "arrive they are deduplicated against it without loading the ledger"
+        ),
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--max-rows-in-memory",
+        type=int,
+        default=None,
+        help="Sort in bounded memory by spilling sorted runs of this many rows to temporary files",
+    )
+    parser.add_argument(
+        "--tmp-dir",
+        type=Path,
+        default=None,
+        help="Directory for temporary sort runs (default: system temp directory)",
+    )
+    parser.add_argument(
+        "--format",
+        choices=("csv", "columnar", "sqlite"),
+        default="csv",
+        help=(
+            "Output ledger format (columnar is a memory-mappable binary ledger; sqlite upserts "
+            "into an indexed SQLite ledger, keeping rows already stored there)"
+        ),
+    )
+    parser.add_argument(
+        "--categories",
+        type=Path,
+        default=None,
+        metavar="RULES",
+        help="Fill empty categories from a rules CSV with match,pattern,category columns",
+    )
+    parser.add_argument(
+        "--match-transfers",
+        action="store_true",
+        help=(
+            "Link opposite-signed rows of equal amount on different accounts as transfers: "
+            "both rows get transaction_type=transfer and the pairs are written to a CSV"
+        ),
+    )
+    parser.add_argument(
+        "--transfer-window",
+        type=int,
+        default=DEFAULT_TRANSFER_WINDOW_DAYS,
+        help="Maximum days between the two rows of a transfer",
+    )
+    parser.add_argument(
+        "--transfers-output",
+        type=Path,
+        default=None,
+        help="Transfer pairs CSV for --match-transfers (default: <output stem>.transfers.csv)",
+    )
+    parser.add_argument(
+        "--stats",
+        type=Path,
+        default=None,
+        help="Write per-file row counts and per-stage timings as JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Run under cProfile and dump pstats to this file",
+    )
+    args = parser.parse_args()
+    if args.max_rows_in_memory is not None and args.max_rows_in_memory < 1:
+        parser.error("--max-rows-in-memory must be at least 1")
+    if args.incremental and args.max_rows_in_memory is not None:
+        parser.error("--incremental cannot be combined with --max-rows-in-memory")
+    if args.match_transfers and (
+        args.incremental or args.max_rows_in_memory is not None or args.format == "sqlite"
+    ):
+        parser.error("--match-transfers is only supported for a full in-memory combine")
+    if args.categories is not None and (
+        args.incremental or args.max_rows_in_memory is not None or args.format == "sqlite"
+    ):
+        parser.error("--categories is only supported for a full in-memory combine")
+    if args.dedup_index is not None and not args.incremental:
+        parser.error("--dedup-index is only supported with --incremental")
+    if args.format != "csv" and (args.incremental or args.max_rows_in_memory is not None):
+        parser.error(f"--format {args.format} is only supported for a full combine")
+    if args.output is None:
+        args.output = default_output_path(args.format)
+    return args
 
 
 def main() -> None:
     args = parse_args()
-    csv_files = collect_csv_files(args.inputs)
+    if args.categories is not None:
+        check_category_rules(args.categories)
+    metrics = StageMetrics() if args.stats else None
+    started = perf_counter()
+    with profiled(args.profile):
+        run_combine(args, metrics)
+    if metrics is not None:
+        write_stats(
+            args.stats,
+            {"command": "combine", "total_ms": round(elapsed_ms(started), 3), **metrics.payload()},
+        )
+
+
+def run_combine(args: argparse.Namespace, metrics: StageMetrics | None = None) -> None:
+    # Stage timings are only taken when --stats is given; the disabled path
+    # runs exactly the uninstrumented calls.
+    measure = metrics.stage if metrics is not None else _no_stage
+    with measure("collect"):
+        csv_files = collect_csv_files(args.inputs)
     if not csv_files:
         raise SystemExit("No CSV files found in inputs")
-    combined = combine_csv_files(csv_files)
-    export_transactions_to_csv(combined, args.output)
-    print(f"Combined {len(csv_files)} file(s) into {args.output} ({len(combined)} rows)")
+
+    if args.max_rows_in_memory is not None:
+        with measure("external_sort"):
+            rows = combine_csv_files_external(
+                csv_files, args.output, args.max_rows_in_memory, tmp_dir=args.tmp_dir
+            )
+        print(f"Combined {len(csv_files)} file(s) into {args.output} ({rows} rows)")
+        return
+
+    if args.format == "sqlite":
+        with measure("upsert"), SqliteLedger(args.output) as ledger:
+            inserted = ledger.upsert(
+                tx for csv_file in csv_files for tx in iter_transactions_from_csv(csv_file)
+            )
+            rows = len(ledger)
+        print(
+            f"Upserted {len(csv_files)} file(s) into {args.output} "
+            f"({inserted} new, {rows} rows)"
+        )
+        return
+
+    if not args.incremental:
+        combined = combine_csv_table(csv_files, metrics)
+        if args.categories is not None:
+            with measure("categorize"):
+                report = CategorizeReport()
+                Categorizer.from_file(args.categories).categorize_table(combined, report)
+            print(report.summary())
+        if args.match_transfers:
+            with measure("transfers"):
+                pairs = match_transfers(combined, window_days=args.transfer_window)
+                mark_transfers(combined, pairs)
+                transfers_file = args.transfers_output or default_transfers_path(args.output)
+                export_transfer_pairs(combined, pairs, transfers_file)
+            print(f"Matched {len(pairs)} transfer pair(s) into {transfers_file}")
+        with measure("export"):
+            if args.format == "columnar":
+                write_columnar_ledger(combined, args.output)
+            else:
+                export_table_to_csv(combined, args.output)
+        print(f"Combined {len(csv_files)} file(s) into {args.output} ({len(combined)} rows)")
+        return
+
+    manifest_file = args.manifest or default_manifest_path(args.output)
+    with measure("incremental_merge"):
+        result = combine_csv_files_incremental(
+            csv_files, args.output, manifest_file, args.dedup_index
+        )
+    with measure("export"):
+        save_incremental_result(result, args.output, manifest_file, args.dedup_index)
+    print(describe_incremental_result(result, csv_files, args.output))
+
+
+def save_incremental_result(
+    result: IncrementalCombineResult,
+    ledger_file: Path,
+    manifest_file: Path,
+    dedup_index: Path | None = None,
+) -> None:
+    if result.merge_into_ledger:
+        # heapq.merge favours the ledger on ties, matching a stable sort of
+        # ledger rows followed by the new ones.
+        result.ledger_rows = export_transactions_to_csv(
+            heapq.merge(
+                iter_transactions_from_csv(ledger_file), result.transactions, key=ledger_sort_key
+            ),
+            ledger_file,
+        )
+    elif result.changes_ledger:
+        export_transactions_to_csv(result.transactions, ledger_file)
+    save_manifest(manifest_file, result.manifest)
+
+    if dedup_index is None or not ledger_file.exists():
+        return
+    if result.merge_into_ledger:
+        extend_digest_index(dedup_index, result.fingerprints, ledger_file)
+    elif result.changes_ledger:
+        write_digest_index(dedup_index, sorted(result.fingerprints), ledger_file)
+    elif not _index_covers(dedup_index, ledger_file):
+        build_digest_index(dedup_index, ledger_file)
+
+
+def _index_covers(dedup_index: Path, ledger_file: Path) -> bool:
+    try:
+        with DigestIndex(dedup_index) as index:
+            return index.covers(ledger_file)
+    except DigestIndexError:
+        return False
+
+
+def describe_incremental_result(
+    result: IncrementalCombineResult, csv_files: list[Path], ledger_file: Path
+) -> str:
+    if not result.changes_ledger:
+        return f"{ledger_file} is up to date with {len(csv_files)} file(s)"
+    removed = f", {len(result.removed_inputs)} removed" if result.removed_inputs else ""
+    return (
+        f"Combined {len(result.loaded_files)} new or changed of {len(csv_files)} file(s){removed} "
+        f"into {ledger_file} ({result.ledger_rows} rows, "
+        f"{result.retracted_rows} retracted)"
+    )
+
+
+def update_ledger_incremental(
+    csv_files: list[Path],
+    ledger_file: Path,
+    manifest_file: Path | None = None,
+    dedup_index: Path | None = None,
+) -> IncrementalCombineResult:
+    manifest_file = manifest_file or default_manifest_path(ledger_file)
+    result = combine_csv_files_incremental(csv_files, ledger_file, manifest_file, dedup_index)
+    save_incremental_result(result, ledger_file, manifest_file, dedup_index)
+    return result
 
 
 if __name__ == "__main__":
@@ -1,58 +1,833 @@
 from __future__ import annotations
 
 import argparse
+import glob
+import os
+import queue
+import signal
+import sys
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import ExitStack
+from dataclasses import dataclass, field
 from pathlib import Path
+from time import perf_counter
 
+from money_analyzer.archives import (
+    MEMBER_SEPARATOR,
+    NO_PDF_MEMBERS_WARNING,
+    is_archive,
+    iter_statement_bytes,
+    member_output_stem,
+    member_source_name,
+)
+from money_analyzer.categorize import (
+    CategorizeReport,
+    Categorizer,
+    CategoryRule,
+    load_category_rules,
+)
+from money_analyzer.cli.combine_csv import (
+    check_category_rules,
+    collect_csv_files,
+    describe_incremental_result,
+    update_ledger_incremental,
+)
 from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.metrics import (
+    FileMetrics,
+    elapsed_ms,
+    file_metrics_payload,
+    profiled,
+    write_stats,
+)
+from money_analyzer.models import Transaction
+from money_analyzer.parsing.base import NO_TRANSACTIONS_WARNING
+from money_analyzer.parsing.pdf_cache import (
+    DEFAULT_CACHE_MAX_BYTES,
+    PdfTextCache,
+    default_cache_dir,
+)
+from money_analyzer.parsing.pdf_text import (
+    DEFAULT_MIN_RANGE_PAGES,
+    PageRangeExtractor,
+    iter_pdf_data_pages,
+)
 from money_analyzer.parsing.router import ParserNotFoundError, ParserRouter
+from money_analyzer.sqlite_ledger import SqliteLedger
+from money_analyzer.watch import (
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_SETTLE_SECONDS,
+    FileSignature,
+    FolderWatcher,
+)
 
 
-def build_output_name(source_pdf: Path, parser_id: str) -> str:
-    stem = source_pdf.stem.replace(" ", "_")
-    return f"{stem}.{parser_id}.csv"
+@dataclass(slots=True)
+class IngestOutcome:
+    pdf_file: Path
+    member: str = ""
+    messages: list[str] = field(default_factory=list)
+    failed: bool = False
+    metrics: FileMetrics | None = None
+    categorize: CategorizeReport | None = None
 
 
-def run_ingest(pdf_files: list[Path], output_dir: Path) -> int:
-    router = ParserRouter()
-    output_dir.mkdir(parents=True, exist_ok=True)
-    failures = 0
+@dataclass(slots=True)
+class ParsedStatement:
+    pdf_file: Path
+    member: str = ""
+    parser_id: str = ""
+    transactions: list[Transaction] = field(default_factory=list)
+    error: str = ""
+    metrics: FileMetrics | None = None
+    categorize: CategorizeReport | None = None
+
+
+DEFAULT_IN_FLIGHT_PER_WORKER = 2
+MAX_WATCH_ATTEMPTS = 3
+
+
+def build_output_name(source_pdf: Path, parser_id: str, member: str = "") -> str:
+    stem = member_output_stem(source_pdf, member) if member else source_pdf.stem
+    return f"{stem.replace(' ', '_')}.{parser_id}.csv"
+
+
+def statement_name(pdf_file: Path, member: str = "") -> str:
+    # Archive members are named archive!member in messages and source_file.
+    return member_source_name(pdf_file, member) if member else pdf_file.name
 
-    for pdf_file in pdf_files:
+
+def success_messages(
+    name: str, parser_id: str, count: int, output_file: Path, ledger_new: int | None
+) -> list[str]:
+    message = f"OK {name}: parser={parser_id} transactions={count} output={output_file}"
+    if ledger_new is not None:
+        message += f" ledger_new={ledger_new}"
+    messages = [message]
+    if not count:
+        messages.append(f"WARN {name}: {NO_TRANSACTIONS_WARNING}")
+    return messages
+
+
+def upsert_ledger(ledger_file: Path, transactions: list[Transaction]) -> int:
+    # The ledger is only touched once the CSV is complete. The parsed rows are
+    # reused rather than copied; upsert commits them in batches.
+    with SqliteLedger(ledger_file) as ledger:
+        return ledger.upsert(transactions)
+
+
+def parse_statement(
+    router: ParserRouter,
+    pdf_file: Path,
+    data: bytes | None,
+    collect_stats: bool = False,
+    categorizer: Categorizer | None = None,
+    member: str = "",
+    pages: list[str] | None = None,
+) -> ParsedStatement:
+    # The CPU half of ingest: extraction, routing, parsing and categorizing
+    # of bytes that were already read, or of pages already extracted.
+    parsed = ParsedStatement(pdf_file=pdf_file, member=member)
+    metrics = parsed.metrics = statement_metrics(pdf_file, member) if collect_stats else None
+    try:
+        transactions, decision = router.stream_pdf(
+            pdf_file,
+            metrics=metrics,
+            data=data,
+            source_file=statement_name(pdf_file, member),
+            pages=pages,
+        )
+        parsed.parser_id = decision.parser_id
+        if categorizer is not None:
+            parsed.categorize = CategorizeReport()
+            transactions = categorizer.iter_categorized(transactions, parsed.categorize)
+        parsed.transactions = list(transactions)
+    except ParserNotFoundError as error:
+        parsed.error = str(error)
+    except Exception as error:  # noqa: BLE001
+        parsed.error = f"failed to ingest ({error})"
+    return parsed
+
+
+def write_statement(
+    parsed: ParsedStatement, output_dir: Path, ledger_file: Path | None = None
+) -> IngestOutcome:
+    # The I/O half of ingest: the CSV export and the ledger upsert.
+    outcome = IngestOutcome(
+        pdf_file=parsed.pdf_file,
+        member=parsed.member,
+        metrics=parsed.metrics,
+        categorize=parsed.categorize,
+    )
+    name = statement_name(parsed.pdf_file, parsed.member)
+    if parsed.error:
+        outcome.failed = True
+        outcome.messages.append(f"ERROR {name}: {parsed.error}")
+        return outcome
+    try:
+        output_file = output_dir / build_output_name(
+            parsed.pdf_file, parsed.parser_id, parsed.member
+        )
+        started = perf_counter()
+        count = export_transactions_to_csv(parsed.transactions, output_file)
+        if parsed.metrics is not None:
+            parsed.metrics.export_ms += elapsed_ms(started)
+        ledger_new = (
+            upsert_ledger(ledger_file, parsed.transactions) if ledger_file is not None else None
+        )
+        outcome.messages.extend(
+            success_messages(name, parsed.parser_id, count, output_file, ledger_new)
+        )
+    except Exception as error:  # noqa: BLE001
+        outcome.failed = True
+        outcome.messages.append(f"ERROR {name}: failed to ingest ({error})")
+    return outcome
+
+
+def statement_metrics(pdf_file: Path, member: str = "") -> FileMetrics:
+    source_file = f"{pdf_file}{MEMBER_SEPARATOR}{member}" if member else str(pdf_file)
+    return FileMetrics(source_file=source_file)
+
+
+@dataclass(slots=True)
+class _ReadStatement:
+    pdf_file: Path
+    member: str
+    parsed: Future[ParsedStatement] | None
+    read_ms: float
+    read_error: str = ""
+    warning: str = ""
+
+
+def iter_pipelined_outcomes(
+    pdf_files: list[Path],
+    submit: Callable[[Path, str, bytes], Future[ParsedStatement]],
+    output_dir: Path,
+    max_in_flight: int,
+    collect_stats: bool = False,
+    ledger_file: Path | None = None,
+) -> Iterator[IngestOutcome]:
+    # Three overlapping stages: a reader thread loads PDF bytes and submits
+    # them, the executor behind submit extracts and parses, and the calling
+    # thread writes CSVs and the ledger in input order. A statement holds one
+    # of max_in_flight slots from read until written, so memory stays bounded
+    # by that many PDFs and their rows however many files are queued. Archives
+    # are expanded member by member as slots free up.
+    slots = threading.Semaphore(max_in_flight)
+    stop = threading.Event()
+    pending: queue.Queue[_ReadStatement | BaseException | None] = queue.Queue()
+
+    def read_and_submit() -> None:
         try:
-            result, decision = router.parse_pdf(pdf_file)
-            output_file = output_dir / build_output_name(pdf_file, decision.parser_id)
-            export_transactions_to_csv(result.transactions, output_file)
-            print(
-                f"OK {pdf_file.name}: parser={decision.parser_id} "
-                f"transactions={len(result.transactions)} output={output_file}"
-            )
-            for warning in result.warnings:
-                print(f"WARN {pdf_file.name}: {warning}")
-        except ParserNotFoundError as error:
-            failures += 1
-            print(f"ERROR {pdf_file.name}: {error}")
-        except Exception as error:  # noqa: BLE001
+            for pdf_file in pdf_files:
+                statements = iter_statement_bytes(pdf_file)
+                read = 0
+                while True:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set():
+                        return
+                    started = perf_counter()
+                    try:
+                        member, data = next(statements)
+                    except StopIteration:
+                        if read or not is_archive(pdf_file):
+                            slots.release()
+                        else:
+                            pending.put(
+                                _ReadStatement(
+                                    pdf_file,
+                                    "",
+                                    None,
+                                    elapsed_ms(started),
+                                    warning=NO_PDF_MEMBERS_WARNING,
+                                )
+                            )
+                        break
+                    except Exception as error:  # noqa: BLE001
+                        pending.put(
+                            _ReadStatement(
+                                pdf_file,
+                                "",
+                                None,
+                                elapsed_ms(started),
+                                f"failed to ingest ({error})",
+                            )
+                        )
+                        break
+                    read += 1
+                    read_ms = elapsed_ms(started)
+                    if isinstance(data, Exception):
+                        # One unreadable archive member; the next ones are
+                        # still read.
+                        pending.put(
+                            _ReadStatement(
+                                pdf_file, member, None, read_ms, f"failed to read ({data})"
+                            )
+                        )
+                        continue
+                    pending.put(
+                        _ReadStatement(pdf_file, member, submit(pdf_file, member, data), read_ms)
+                    )
+            pending.put(None)
+        except BaseException as error:  # noqa: BLE001
+            pending.put(error)
+
+    reader = threading.Thread(target=read_and_submit, name="ingest-reader", daemon=True)
+    reader.start()
+    try:
+        while (item := pending.get()) is not None:
+            if isinstance(item, BaseException):
+                raise item
+            if item.warning:
+                name = statement_name(item.pdf_file, item.member)
+                yield IngestOutcome(item.pdf_file, item.member, [f"WARN {name}: {item.warning}"])
+                slots.release()
+                continue
+            if item.parsed is None:
+                metrics = statement_metrics(item.pdf_file, item.member) if collect_stats else None
+                parsed = ParsedStatement(
+                    item.pdf_file, item.member, error=item.read_error, metrics=metrics
+                )
+            else:
+                parsed = item.parsed.result()
+            if parsed.metrics is not None:
+                parsed.metrics.read_ms = item.read_ms
+            yield write_statement(parsed, output_dir, ledger_file)
+            slots.release()
+    finally:
+        stop.set()
+        reader.join()
+
+
+_worker_router: ParserRouter | None = None
+_worker_categorizer: Categorizer | None = None
+
+
+def build_page_extractor(
+    page_workers: int, min_range_pages: int = DEFAULT_MIN_RANGE_PAGES
+) -> PageRangeExtractor | None:
+    return PageRangeExtractor(page_workers, min_range_pages) if page_workers > 1 else None
+
+
+def _init_worker(
+    text_cache: PdfTextCache | None, category_rules: list[CategoryRule] | None = None
+) -> None:
+    global _worker_router, _worker_categorizer
+    # Workers never start a page pool of their own; long statements are split
+    # by the parent's shared pool (see start_parsers).
+    _worker_router = ParserRouter(text_cache=text_cache)
+    _worker_categorizer = Categorizer(category_rules) if category_rules is not None else None
+
+
+def _parse_in_worker(
+    pdf_file: Path, member: str, data: bytes, collect_stats: bool
+) -> ParsedStatement:
+    assert _worker_router is not None
+    return parse_statement(
+        _worker_router, pdf_file, data, collect_stats, _worker_categorizer, member
+    )
+
+
+def _parse_pages_in_worker(
+    pdf_file: Path, member: str, pages: list[str], collect_stats: bool
+) -> ParsedStatement:
+    assert _worker_router is not None
+    return parse_statement(
+        _worker_router, pdf_file, None, collect_stats, _worker_categorizer, member, pages
+    )
+
+
+def _init_watch_worker(
+    text_cache: PdfTextCache | None, category_rules: list[CategoryRule] | None = None
+) -> None:
+    # Ctrl+C stops the watch loop in the parent, which then shuts the pool down.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    _init_worker(text_cache, category_rules)
+    assert _worker_router is not None
+    _worker_router.warm_up()
+
+
+def _warm_worker(_: int) -> None:
+    return None
+
+
+def resolve_jobs(jobs: int) -> int:
+    if jobs <= 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def report_outcomes(
+    outcomes: Iterable[IngestOutcome],
+    metrics: list[FileMetrics] | None = None,
+    categorize: CategorizeReport | None = None,
+) -> int:
+    failures = 0
+    for outcome in outcomes:
+        for message in outcome.messages:
+            print(message)
+        if outcome.failed:
             failures += 1
-            print(f"ERROR {pdf_file.name}: failed to ingest ({error})")
+        if metrics is not None and outcome.metrics is not None:
+            metrics.append(outcome.metrics)
+        if categorize is not None and outcome.categorize is not None:
+            categorize.add(outcome.categorize)
+    if categorize is not None:
+        print(categorize.summary())
+    return failures
+
+
+def start_parsers(
+    stack: ExitStack,
+    workers: int,
+    text_cache: PdfTextCache | None,
+    category_rules: list[CategoryRule] | None,
+    page_workers: int = 1,
+    min_range_pages: int = DEFAULT_MIN_RANGE_PAGES,
+    collect_stats: bool = False,
+    warm_up: bool = False,
+) -> Callable[[Path, str, bytes], Future[ParsedStatement]]:
+    # Returns the submit callable of iter_pipelined_outcomes; the executor
+    # behind it is closed with stack.
+    executor: ThreadPoolExecutor | ProcessPoolExecutor
+    if workers <= 1:
+        # One parser thread still overlaps extraction with reads and writes.
+        page_extractor = build_page_extractor(page_workers, min_range_pages)
+        if page_extractor is not None:
+            stack.enter_context(page_extractor)
+        router = ParserRouter(text_cache=text_cache, page_extractor=page_extractor)
+        if warm_up:
+            router.warm_up()
+        categorizer = Categorizer(category_rules) if category_rules is not None else None
+        executor = stack.enter_context(
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="ingest-parser")
+        )
+
+        def submit(pdf_file: Path, member: str, data: bytes) -> Future[ParsedStatement]:
+            return executor.submit(
+                parse_statement, router, pdf_file, data, collect_stats, categorizer, member
+            )
+
+        return submit
+
+    executor = stack.enter_context(
+        ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_watch_worker if warm_up else _init_worker,
+            initargs=(text_cache, category_rules),
+        )
+    )
+    if warm_up:
+        list(executor.map(_warm_worker, range(workers)))
+
+    def submit(pdf_file: Path, member: str, data: bytes) -> Future[ParsedStatement]:
+        return executor.submit(_parse_in_worker, pdf_file, member, data, collect_stats)
+
+    page_extractor = build_page_extractor(page_workers, min_range_pages)
+    if page_extractor is None:
+        return submit
+
+    # One page pool in this process serves every job. A statement long enough
+    # to split is extracted here range by range and only its text is sent to a
+    # job, so no job process ever owns a pool of its own.
+    stack.enter_context(page_extractor)
+    dispatchers = stack.enter_context(
+        ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ingest-pages")
+    )
+
+    def dispatch(pdf_file: Path, member: str, data: bytes) -> ParsedStatement:
+        started = perf_counter()
+        # Cached text goes straight to a job; pypdf only opens cache misses.
+        pages = text_cache.get(text_cache.key_for(data)) if text_cache is not None else None
+        if pages is None:
+            try:
+                split = page_extractor.splits(data)
+            except Exception:  # noqa: BLE001
+                # The job reports the unreadable PDF like any other.
+                split = False
+            if not split:
+                return submit(pdf_file, member, data).result()
+            try:
+                pages = list(iter_pdf_data_pages(data, text_cache, page_extractor))
+            except Exception as error:  # noqa: BLE001
+                metrics = statement_metrics(pdf_file, member) if collect_stats else None
+                return ParsedStatement(
+                    pdf_file, member, error=f"failed to ingest ({error})", metrics=metrics
+                )
+        extract_ms = elapsed_ms(started)
+        parsed = executor.submit(
+            _parse_pages_in_worker, pdf_file, member, pages, collect_stats
+        ).result()
+        if parsed.metrics is not None:
+            parsed.metrics.bytes = len(data)
+            parsed.metrics.extract_ms += extract_ms
+        return parsed
+
+    def submit_split(pdf_file: Path, member: str, data: bytes) -> Future[ParsedStatement]:
+        return dispatchers.submit(dispatch, pdf_file, member, data)
+
+    return submit_split
 
+
+def run_ingest(
+    pdf_files: list[Path],
+    output_dir: Path,
+    jobs: int = 1,
+    text_cache: PdfTextCache | None = None,
+    stats_file: Path | None = None,
+    ledger_file: Path | None = None,
+    categories_file: Path | None = None,
+    max_in_flight: int | None = None,
+    page_workers: int = 1,
+    min_range_pages: int = DEFAULT_MIN_RANGE_PAGES,
+) -> int:
+    started = perf_counter()
+    output_dir.mkdir(parents=True, exist_ok=True)
+    # An archive may hold any number of statements, so only plain PDF lists
+    # cap the pool size.
+    workers = resolve_jobs(jobs)
+    if not any(is_archive(pdf_file) for pdf_file in pdf_files):
+        workers = max(min(workers, len(pdf_files)), 1)
+    collect_stats = stats_file is not None
+    metrics: list[FileMetrics] | None = [] if collect_stats else None
+    categorize = CategorizeReport() if categories_file is not None else None
+    # Rules are read and validated once here, before any worker starts.
+    category_rules = load_category_rules(categories_file) if categories_file else None
+    in_flight = max_in_flight or DEFAULT_IN_FLIGHT_PER_WORKER * workers
+
+    with ExitStack() as stack:
+        submit = start_parsers(
+            stack,
+            workers,
+            text_cache,
+            category_rules,
+            page_workers,
+            min_range_pages,
+            collect_stats,
+        )
+        # Outcomes come back in input order, so the printed report and the
+        # failure count match a sequential run regardless of completion order.
+        failures = report_outcomes(
+            iter_pipelined_outcomes(
+                pdf_files, submit, output_dir, in_flight, collect_stats, ledger_file
+            ),
+            metrics,
+            categorize,
+        )
+
+    if stats_file is not None and metrics is not None:
+        write_stats(
+            stats_file,
+            {
+                "command": "ingest",
+                "jobs": workers,
+                "max_in_flight": in_flight,
+                "total_ms": round(elapsed_ms(started), 3),
+                "failures": failures,
+                "files": file_metrics_payload(metrics),
+            },
+        )
+    return failures
+
+
+def has_current_output(pdf_file: Path, output_dir: Path) -> bool:
+    # Any parser's CSV for this statement counts, as long as it is not older
+    # than the PDF.
+    pattern = build_output_name(Path(glob.escape(pdf_file.name)), "*")
+    mtime_ns = pdf_file.stat().st_mtime_ns
+    return any(output.stat().st_mtime_ns >= mtime_ns for output in output_dir.glob(pattern))
+
+
+def _record_written(
+    outcomes: Iterable[IngestOutcome], written: set[Path]
+) -> Iterator[IngestOutcome]:
+    for outcome in outcomes:
+        if not outcome.failed:
+            written.add(outcome.pdf_file)
+        yield outcome
+
+
+def run_watch(
+    watch_dir: Path,
+    output_dir: Path,
+    jobs: int = 1,
+    text_cache: PdfTextCache | None = None,
+    combine_output: Path | None = None,
+    ledger_file: Path | None = None,
+    categories_file: Path | None = None,
+    page_workers: int = 1,
+    min_range_pages: int = DEFAULT_MIN_RANGE_PAGES,
+    poll_interval: float = DEFAULT_POLL_INTERVAL,
+    settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+    stop: threading.Event | None = None,
+) -> int:
+    # Runs until Ctrl+C or until stop is set. Returns the number of
+    # statements that were given up on.
+    output_dir.mkdir(parents=True, exist_ok=True)
+    stop = stop or threading.Event()
+
+    def is_current(pdf_file: Path, _: FileSignature) -> bool:
+        return has_current_output(pdf_file, output_dir)
+
+    watcher = FolderWatcher(watch_dir, settle_seconds=settle_seconds, is_current=is_current)
+    category_rules = load_category_rules(categories_file) if categories_file else None
+    workers = resolve_jobs(jobs)
+    attempts: dict[Path, int] = {}
+    failures = 0
+    combine_due = False
+    with ExitStack() as stack:
+        # The router (or the pool with one router per worker) is built once and
+        # reused for every batch, so a dropped statement only pays for its own
+        # extraction and parsing. It lives in its own stack so a broken pool
+        # can be replaced without stopping the watch.
+        parsers = stack.enter_context(ExitStack())
+        submit = start_parsers(
+            parsers,
+            workers,
+            text_cache,
+            category_rules,
+            page_workers,
+            min_range_pages,
+            warm_up=True,
+        )
+
+        print(f"Watching {watch_dir} for PDF statements (Ctrl+C to stop)", flush=True)
+        try:
+            while not stop.is_set():
+                ready = watcher.poll()
+                if ready:
+                    written: set[Path] = set()
+                    categorize = CategorizeReport() if categories_file is not None else None
+                    try:
+                        outcomes = iter_pipelined_outcomes(
+                            ready,
+                            submit,
+                            output_dir,
+                            DEFAULT_IN_FLIGHT_PER_WORKER * workers,
+                            ledger_file=ledger_file,
+                        )
+                        report_outcomes(_record_written(outcomes, written), categorize=categorize)
+                    except BrokenProcessPool as error:
+                        print(f"ERROR parser pool stopped ({error}); restarting it")
+                        parsers.close()
+                        parsers = stack.enter_context(ExitStack())
+                        submit = start_parsers(
+                            parsers,
+                            workers,
+                            text_cache,
+                            category_rules,
+                            page_workers,
+                            min_range_pages,
+                            warm_up=True,
+                        )
+                    # Statements that failed, or were lost with the pool, are
+                    # picked up again on a later poll. A statement that keeps
+                    # failing waits until the file changes.
+                    for pdf_file in ready:
+                        if pdf_file in written:
+                            attempts.pop(pdf_file, None)
+                            continue
+                        attempts[pdf_file] = attempts.get(pdf_file, 0) + 1
+                        if attempts[pdf_file] < MAX_WATCH_ATTEMPTS:
+                            watcher.retry(pdf_file)
+                        else:
+                            del attempts[pdf_file]
+                            failures += 1
+                            print(
+                                f"WARN {pdf_file.name}: giving up after {MAX_WATCH_ATTEMPTS} "
+                                "attempts until the file changes"
+                            )
+                    combine_due = combine_due or bool(written)
+                if combine_output is not None and combine_due:
+                    try:
+                        csv_files = collect_csv_files([output_dir])
+                        result = update_ledger_incremental(csv_files, combine_output)
+                        print(describe_incremental_result(result, csv_files, combine_output))
+                        combine_due = False
+                    except Exception as error:  # noqa: BLE001
+                        print(f"ERROR combine into {combine_output} failed ({error}); will retry")
+                sys.stdout.flush()
+                stop.wait(poll_interval)
+        except KeyboardInterrupt:
+            pass
     return failures
 
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Parse bank statements PDF files into CSV")
-    parser.add_argument("pdfs", nargs="+", type=Path, help="Input PDF statement files")
+    parser.add_argument(
+        "pdfs",
+        nargs="*",
+        type=Path,
+        help="Input PDF statement files, or zip/tar archives whose PDF members are ingested",
+    )
     parser.add_argument(
         "--out-dir",
         type=Path,
         default=Path("output/parsed"),
         help="Directory for per-statement CSV files",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes (0 uses all CPUs)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=None,
+        help=(
+            "Statements read ahead but not yet written; bounds memory while reads, parsing "
+            f"and CSV writes overlap (default: {DEFAULT_IN_FLIGHT_PER_WORKER} per job)"
+        ),
+    )
+    parser.add_argument(
+        "--page-workers",
+        type=int,
+        default=1,
+        help=(
+            "Split statements of at least 2 x --min-range-pages pages into page ranges "
+            "extracted in this many processes (one pool shared by all jobs)"
+        ),
+    )
+    parser.add_argument(
+        "--min-range-pages",
+        type=int,
+        default=DEFAULT_MIN_RANGE_PAGES,
+        help=f"Smallest page range handed to a page worker (default: {DEFAULT_MIN_RANGE_PAGES})",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=None,
+        help=f"Directory for the extracted PDF text cache (default: {default_cache_dir()})",
+    )
+    parser.add_argument(
+        "--cache-size-mb",
+        type=int,
+        default=DEFAULT_CACHE_MAX_BYTES // (1024 * 1024),
+        help="Size cap for the PDF text cache; least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always extract PDF text with pypdf and do not touch the cache",
+    )
+    parser.add_argument(
+        "--stats",
+        type=Path,
+        default=None,
+        help="Write per-file page, byte, line, transaction and stage timing metrics as JSON",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        help="Run under cProfile and dump pstats to this file (worker processes are not profiled)",
+    )
+    parser.add_argument(
+        "--sqlite-ledger",
+        type=Path,
+        default=None,
+        help="Also upsert every parsed transaction into this SQLite ledger",
+    )
+    parser.add_argument(
+        "--categories",
+        type=Path,
+        default=None,
+        metavar="RULES",
+        help="Fill empty categories from a rules CSV with match,pattern,category columns",
+    )
+    parser.add_argument(
+        "--watch",
+        type=Path,
+        default=None,
+        metavar="DIR",
+        help="Keep running and ingest PDFs that are added to or modified in DIR",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=DEFAULT_POLL_INTERVAL,
+        help="Seconds between folder scans in --watch mode",
+    )
+    parser.add_argument(
+        "--settle",
+        type=float,
+        default=DEFAULT_SETTLE_SECONDS,
+        help="Seconds a PDF must stay unchanged before --watch ingests it",
+    )
+    parser.add_argument(
+        "--combine-output",
+        type=Path,
+        default=None,
+        help="In --watch mode, merge new CSVs into this ledger with an incremental combine",
+    )
+    args = parser.parse_args()
+    if args.watch is None and not args.pdfs:
+        parser.error("pass PDF files or --watch DIR")
+    if args.watch is not None and (args.pdfs or args.stats):
+        parser.error("--watch cannot be combined with PDF arguments or --stats")
+    if args.max_in_flight is not None and args.max_in_flight < 1:
+        parser.error("--max-in-flight must be at least 1")
+    if args.min_range_pages < 1:
+        parser.error("--min-range-pages must be at least 1")
+    if args.combine_output is not None and args.watch is None:
+        parser.error("--combine-output is only supported with --watch")
+    return args
+
+
+def build_text_cache(args: argparse.Namespace) -> PdfTextCache | None:
+    if args.no_cache:
+        return None
+    return PdfTextCache(
+        args.cache_dir or default_cache_dir(),
+        max_bytes=args.cache_size_mb * 1024 * 1024,
+    )
 
 
 def main() -> None:
     args = parse_args()
-    failures = run_ingest(args.pdfs, args.out_dir)
+    if args.categories is not None:
+        check_category_rules(args.categories)
+    if args.watch is not None:
+        with profiled(args.profile):
+            failures = run_watch(
+                args.watch,
+                args.out_dir,
+                jobs=args.jobs,
+                text_cache=build_text_cache(args),
+                combine_output=args.combine_output,
+                ledger_file=args.sqlite_ledger,
+                categories_file=args.categories,
+                page_workers=args.page_workers,
+                min_range_pages=args.min_range_pages,
+                poll_interval=args.poll_interval,
+                settle_seconds=args.settle,
+            )
+        if failures:
+            raise SystemExit(1)
+        return
+
+    with profiled(args.profile):
+        failures = run_ingest(
+            args.pdfs,
+            args.out_dir,
+            jobs=args.jobs,
+            text_cache=build_text_cache(args),
+            stats_file=args.stats,
+            ledger_file=args.sqlite_ledger,
+            categories_file=args.categories,
+            max_in_flight=args.max_in_flight,
+            page_workers=args.page_workers,
+            min_range_pages=args.min_range_pages,
+        )
     if failures:
         raise SystemExit(1)
 
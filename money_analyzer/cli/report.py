@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+from typing import TextIO
+
+from money_analyzer.csv_io import open_atomic_output
+from money_analyzer.rollup import (
+    DIMENSIONS,
+    Rollup,
+    default_rollup_path,
+    group_rollup,
+    load_rollup,
+    save_rollup,
+    update_rollup,
+)
+from money_analyzer.table import format_cents
+
+
+AGGREGATE_COLUMNS = ["count", "sum", "min", "max"]
+
+
+def write_report(
+    groups: dict[tuple[str, ...], list[int]], dimensions: Sequence[str], handle: TextIO
+) -> int:
+    writer = csv.writer(handle)
+    writer.writerow([*dimensions, *AGGREGATE_COLUMNS])
+    for key, (count, total, low, high) in groups.items():
+        writer.writerow([*key, count, format_cents(total), format_cents(low), format_cents(high)])
+    return len(groups)
+
+
+def parse_dimensions(value: str) -> list[str]:
+    dimensions = [part.strip() for part in value.split(",") if part.strip()]
+    unknown = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+    if unknown:
+        raise argparse.ArgumentTypeError(
+            f"unknown dimension(s) {', '.join(unknown)}; expected {', '.join(DIMENSIONS)}"
+        )
+    return dimensions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Report sum, count, min and max of a combined ledger grouped by dimensions"
+    )
+    parser.add_argument(
+        "ledger",
+        type=Path,
+        help="Combined ledger CSV written by money-combine",
+    )
+    parser.add_argument(
+        "--by",
+        type=parse_dimensions,
+        default=["month"],
+        help=f"Comma separated grouping dimensions from {', '.join(DIMENSIONS)} (default: month)",
+    )
+    parser.add_argument(
+        "--rollup",
+        type=Path,
+        default=None,
+        help="Persisted monthly rollups reused across runs (default: <ledger>.rollup.json)",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Write the report CSV to this path instead of stdout",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.ledger.exists():
+        raise SystemExit(f"Ledger not found: {args.ledger}")
+    rollup_file = args.rollup or default_rollup_path(args.ledger)
+    try:
+        stored = load_rollup(rollup_file)
+    except ValueError as error:
+        # The rollup is only a cache of the ledger, so it is rebuilt.
+        print(f"WARN {error}; rebuilding it", file=sys.stderr)
+        stored = Rollup()
+    try:
+        rollup = update_rollup(args.ledger, stored)
+    except ValueError as error:
+        raise SystemExit(str(error)) from error
+    save_rollup(rollup_file, rollup)
+
+    groups = group_rollup(rollup, args.by)
+    if args.output is None:
+        write_report(groups, args.by, sys.stdout)
+    else:
+        with open_atomic_output(args.output) as handle:
+            write_report(groups, args.by, handle)
+    print(
+        f"Reused {rollup.reused_months} month(s), scanned {rollup.scanned_months} month(s) "
+        f"-> {len(groups)} group(s)",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+from money_analyzer.models import CANONICAL_COLUMNS, Transaction
+from money_analyzer.table import (
+    DICTIONARY_COLUMNS,
+    TEXT_COLUMNS,
+    StringDictionary,
+    TransactionTable,
+    export_table_to_csv,
+)
+
+
+MAGIC = b"MALCOL1\0"
+ALIGNMENT = 8
+
+DATE_COLUMNS = ("date", "posted_date")
+
+# Column kind -> array typecode of the fixed-width values stored on disk.
+TYPECODES = {
+    "date": "i",
+    "cents": "q",
+    "hundredths": "i",
+    "dictionary": "I",
+    "text": "q",
+}
+
+
+class ColumnarFormatError(ValueError):
+    pass
+
+
+def column_kind(name: str) -> str:
+    if name in DATE_COLUMNS:
+        return "date"
+    if name == "amount":
+        return "cents"
+    if name == "confidence":
+        return "hundredths"
+    if name in DICTIONARY_COLUMNS:
+        return "dictionary"
+    return "text"
+
+
+def _to_little_endian(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _pad(length: int) -> int:
+    return -length % ALIGNMENT
+
+
+def write_columnar_ledger(
+    transactions: TransactionTable | Iterable[Transaction], output_file: Path
+) -> int:
+    if isinstance(transactions, TransactionTable):
+        table = transactions
+    else:
+        table = TransactionTable.from_transactions(transactions)
+    rows = len(table)
+    dates = {"date": table.dates, "posted_date": table.posted_dates}
+    hundredths = array("i", (round(value * 100) for value in table.confidence))
+    text_offsets = {}
+    text_blobs = {}
+    for name in TEXT_COLUMNS:
+        offsets = array("q", [0])
+        blob = bytearray()
+        for value in table.text[name]:
+            blob += value.encode("utf-8")
+            offsets.append(len(blob))
+        text_offsets[name] = offsets
+        text_blobs[name] = blob
+
+    blocks: list[bytes] = []
+    position = 0
+
+    def add_block(data: bytes) -> dict[str, int]:
+        nonlocal position
+        block = {"offset": position, "length": len(data)}
+        blocks.append(data + b"\0" * _pad(len(data)))
+        position += len(data) + _pad(len(data))
+        return block
+
+    columns: dict[str, dict[str, object]] = {}
+    for name in CANONICAL_COLUMNS:
+        kind = column_kind(name)
+        column: dict[str, object] = {"kind": kind}
+        if kind == "date":
+            column["values"] = add_block(_to_little_endian(dates[name]))
+        elif kind == "cents":
+            column["values"] = add_block(_to_little_endian(table.cents))
+        elif kind == "hundredths":
+            column["values"] = add_block(_to_little_endian(hundredths))
+        elif kind == "dictionary":
+            column["values"] = add_block(_to_little_endian(table.codes[name]))
+            column["dictionary"] = table.dictionaries[name].values
+        else:
+            column["values"] = add_block(_to_little_endian(text_offsets[name]))
+            column["blob"] = add_block(bytes(text_blobs[name]))
+        columns[name] = column
+
+    header = json.dumps({"rows": rows, "columns": columns}, ensure_ascii=False).encode("utf-8")
+    header += b" " * _pad(len(MAGIC) + 8 + len(header))
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("wb") as handle:
+        handle.write(MAGIC)
+        handle.write(struct.pack("<Q", len(header)))
+        handle.write(header)
+        for block in blocks:
+            handle.write(block)
+    return rows
+
+
+class ColumnarLedger:
+    def __init__(self, ledger_file: Path) -> None:
+        self.ledger_file = ledger_file
+        self._handle = ledger_file.open("rb")
+        try:
+            self._mmap = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as error:
+            self._handle.close()
+            raise ColumnarFormatError(f"{ledger_file} is empty") from error
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ColumnarFormatError(f"{ledger_file} is not a columnar ledger")
+        (header_length,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        header_end = len(MAGIC) + 8 + header_length
+        header = json.loads(self._mmap[len(MAGIC) + 8 : header_end].decode("utf-8"))
+        self._data_start = header_end
+        self.rows: int = header["rows"]
+        self._columns: dict[str, dict[str, object]] = header["columns"]
+
+    def __enter__(self) -> "ColumnarLedger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Callers still hold zero-copy views; the mapping is released with them.
+            pass
+        self._handle.close()
+
+    @property
+    def column_names(self) -> list[str]:
+        return list(self._columns)
+
+    def raw(self, name: str) -> Sequence[int]:
+        column = self._column(name)
+        return self._read_array(TYPECODES[str(column["kind"])], column["values"])
+
+    def dictionary(self, name: str) -> list[str]:
+        column = self._column(name)
+        if column["kind"] != "dictionary":
+            raise ColumnarFormatError(f"Column '{name}' is not dictionary encoded")
+        return list(column["dictionary"])
+
+    def column(self, name: str) -> list[object]:
+        column = self._column(name)
+        kind = column["kind"]
+        values = self.raw(name)
+        if kind == "date":
+            return [date.fromordinal(value) if value else None for value in values]
+        if kind == "cents":
+            return [Decimal(value).scaleb(-2) for value in values]
+        if kind == "hundredths":
+            return [value / 100 for value in values]
+        if kind == "dictionary":
+            dictionary = self.dictionary(name)
+            return [dictionary[code] for code in values]
+        blob = self._block(column["blob"])
+        return [
+            str(blob[start:end], "utf-8") for start, end in zip(values, values[1:])
+        ]
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        columns = [self.column(name) for name in CANONICAL_COLUMNS]
+        for values in zip(*columns):
+            fields = dict(zip(CANONICAL_COLUMNS, values))
+            yield Transaction(**fields)
+
+    def to_transactions(self) -> list[Transaction]:
+        return list(self.iter_transactions())
+
+    def to_table(self) -> TransactionTable:
+        table = TransactionTable(
+            {name: StringDictionary(self.dictionary(name)) for name in DICTIONARY_COLUMNS}
+        )
+        table.dates.extend(self.raw("date"))
+        table.posted_dates.extend(self.raw("posted_date"))
+        table.cents.extend(self.raw("amount"))
+        table.confidence.extend(value / 100 for value in self.raw("confidence"))
+        for name in DICTIONARY_COLUMNS:
+            table.codes[name].extend(self.raw(name))
+        for name in TEXT_COLUMNS:
+            table.text[name] = self.column(name)
+        return table
+
+    def _column(self, name: str) -> dict[str, object]:
+        try:
+            return self._columns[name]
+        except KeyError as error:
+            raise ColumnarFormatError(f"Unknown column '{name}'") from error
+
+    def _block(self, block: object) -> memoryview:
+        assert isinstance(block, dict)
+        start = self._data_start + block["offset"]
+        return memoryview(self._mmap)[start : start + block["length"]]
+
+    def _read_array(self, typecode: str, block: object) -> Sequence[int]:
+        data = self._block(block)
+        if sys.byteorder == "little":
+            return data.cast(typecode)
+        values = array(typecode)
+        values.frombytes(data)
+        values.byteswap()
+        return values
+
+
+def csv_to_columnar(csv_file: Path, ledger_file: Path) -> int:
+    return write_columnar_ledger(TransactionTable.from_csv(csv_file), ledger_file)
+
+
+def columnar_to_csv(ledger_file: Path, csv_file: Path) -> int:
+    with ColumnarLedger(ledger_file) as ledger:
+        return export_table_to_csv(ledger.to_table(), csv_file)
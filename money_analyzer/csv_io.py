@@ -1,21 +1,192 @@
 from __future__ import annotations
 
 import csv
+import os
+from collections.abc import Callable, Iterable, Iterator
+from contextlib import contextmanager
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from operator import itemgetter
 from pathlib import Path
+from typing import TextIO
 
 from money_analyzer.models import CANONICAL_COLUMNS, Transaction
+from money_analyzer.utils import parse_amount, parse_iso_date
 
 
-def export_transactions_to_csv(transactions: list[Transaction], output_file: Path) -> None:
+# Values used by Transaction.from_csv_row when a column is absent from the file.
+COLUMN_DEFAULTS = {
+    "posted_date": "",
+    "currency": "EUR",
+    "account_id": "",
+    "account_name": "",
+    "transaction_type": "",
+    "description": "",
+    "merchant": "",
+    "category": "",
+    "source_file": "",
+    "parser_id": "",
+    "confidence": "1.0",
+}
+
+# Typed row values in CANONICAL_COLUMNS order.
+TransactionRecord = tuple[
+    date, date | None, Decimal, str, str, str, str, str, str, str, str, str, float
+]
+
+
+@contextmanager
+def open_atomic_output(output_file: Path) -> Iterator[TextIO]:
     output_file.parent.mkdir(parents=True, exist_ok=True)
-    with output_file.open("w", newline="", encoding="utf-8") as handle:
+    # Rows may come from a lazy parser stream; write next to the target and
+    # swap it in at the end so a failure mid-stream never leaves a partial CSV.
+    tmp_file = output_file.with_name(f".{output_file.name}.tmp")
+    try:
+        with tmp_file.open("w", newline="", encoding="utf-8") as handle:
+            yield handle
+        os.replace(tmp_file, output_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+
+
+def export_transactions_to_csv(transactions: Iterable[Transaction], output_file: Path) -> int:
+    count = 0
+    with open_atomic_output(output_file) as handle:
         writer = csv.DictWriter(handle, fieldnames=CANONICAL_COLUMNS)
         writer.writeheader()
         for tx in transactions:
             writer.writerow(tx.to_csv_row())
+            count += 1
+    return count
 
 
-def load_transactions_from_csv(csv_file: Path) -> list[Transaction]:
+def make_date_parser(optional: bool = False) -> Callable[[str], date | None]:
+    # Ledgers repeat the same few thousand dates, so strptime runs once per
+    # distinct string instead of once per row. Only an optional column maps
+    # "" to None; elsewhere it fails in strptime like any other bad date.
+    memo: dict[str, date | None] = {"": None} if optional else {}
+
+    def parse(value: str) -> date | None:
+        try:
+            return memo[value]
+        except KeyError:
+            parsed = memo[value] = parse_iso_date(value)
+            return parsed
+
+    return parse
+
+
+def parse_csv_amount(value: str) -> Decimal:
+    # Canonical files hold plain "%.2f" amounts, which Decimal reads directly;
+    # anything else goes through the general statement amount parser.
+    try:
+        return Decimal(value)
+    except InvalidOperation:
+        return parse_amount(value)
+
+
+def iter_canonical_rows(csv_file: Path) -> Iterator[tuple[str, ...]]:
     with csv_file.open("r", newline="", encoding="utf-8") as handle:
-        reader = csv.DictReader(handle)
-        return [Transaction.from_csv_row(row) for row in reader]
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return
+        positions = {column: index for index, column in enumerate(header)}
+        if "date" not in positions or "amount" not in positions:
+            raise ValueError(f"{csv_file} is missing the date or amount column")
+        width = len(header)
+        # Columns absent from the header point past the row into the defaults
+        # appended below, so every row is picked apart by one itemgetter call.
+        padding = [COLUMN_DEFAULTS.get(column, "") for column in CANONICAL_COLUMNS]
+        pad_rows = any(column not in positions for column in CANONICAL_COLUMNS)
+        pick = itemgetter(
+            *(
+                positions.get(column, width + offset)
+                for offset, column in enumerate(CANONICAL_COLUMNS)
+            )
+        )
+
+        for row in reader:
+            if not row:
+                continue
+            if len(row) < width:
+                row += [""] * (width - len(row))
+            if pad_rows:
+                row += padding
+            yield pick(row)
+
+
+def iter_transaction_records(csv_file: Path) -> Iterator[TransactionRecord]:
+    parse_date = make_date_parser()
+    parse_posted_date = make_date_parser(optional=True)
+    for (
+        tx_date,
+        posted_date,
+        amount,
+        currency,
+        account_id,
+        account_name,
+        transaction_type,
+        description,
+        merchant,
+        category,
+        source_file,
+        parser_id,
+        confidence,
+    ) in iter_canonical_rows(csv_file):
+        yield (
+            parse_date(tx_date),
+            parse_posted_date(posted_date),
+            parse_csv_amount(amount),
+            currency,
+            account_id,
+            account_name,
+            transaction_type,
+            description,
+            merchant,
+            category,
+            source_file,
+            parser_id,
+            float(confidence or "1.0"),
+        )
+
+
+def load_transaction_records(csv_file: Path) -> list[TransactionRecord]:
+    return list(iter_transaction_records(csv_file))
+
+
+def iter_transactions_from_csv(csv_file: Path) -> Iterator[Transaction]:
+    for (
+        tx_date,
+        posted_date,
+        amount,
+        currency,
+        account_id,
+        account_name,
+        transaction_type,
+        description,
+        merchant,
+        category,
+        source_file,
+        parser_id,
+        confidence,
+    ) in iter_transaction_records(csv_file):
+        yield Transaction(
+            tx_date,
+            amount,
+            currency,
+            account_name,
+            description,
+            posted_date,
+            account_id,
+            transaction_type,
+            merchant,
+            category,
+            source_file,
+            parser_id,
+            confidence,
+        )
+
+
+def load_transactions_from_csv(csv_file: Path) -> list[Transaction]:
+    return list(iter_transactions_from_csv(csv_file))
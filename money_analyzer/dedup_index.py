@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import heapq
+import mmap
+import os
+import struct
+from collections.abc import Iterable, Iterator
+from pathlib import Path
+
+from money_analyzer.csv_io import iter_transactions_from_csv
+from money_analyzer.models import FINGERPRINT_BYTES
+
+
+MAGIC = b"MADEDUP1"
+# ledger size, ledger mtime_ns, digest count
+HEADER = struct.Struct("<QqQ")
+DATA_START = len(MAGIC) + HEADER.size
+
+
+class DigestIndexError(ValueError):
+    pass
+
+
+def default_index_path(ledger_file: Path) -> Path:
+    return ledger_file.with_name(f"{ledger_file.name}.dedup")
+
+
+def ledger_signature(ledger_file: Path) -> tuple[int, int]:
+    stat = ledger_file.stat()
+    return stat.st_size, stat.st_mtime_ns
+
+
+class DigestIndex:
+    # Sorted fixed-width fingerprints of every row in a ledger. Lookups are a
+    # binary search over the memory-mapped file, so checking new rows against
+    # years of history never materializes a set of all fingerprints.
+    def __init__(self, index_file: Path) -> None:
+        self.index_file = index_file
+        self.ledger_size = 0
+        self.ledger_mtime_ns = 0
+        self._count = 0
+        self._handle = None
+        self._mmap: mmap.mmap | None = None
+        if not index_file.exists():
+            return
+        self._handle = index_file.open("rb")
+        try:
+            self._mmap = mmap.mmap(self._handle.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as error:
+            self.close()
+            raise DigestIndexError(f"{index_file} is empty") from error
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise DigestIndexError(f"{index_file} is not a dedup index")
+        self.ledger_size, self.ledger_mtime_ns, self._count = HEADER.unpack_from(
+            self._mmap, len(MAGIC)
+        )
+        if len(self._mmap) != DATA_START + self._count * FINGERPRINT_BYTES:
+            self.close()
+            raise DigestIndexError(f"{index_file} is truncated")
+
+    def __enter__(self) -> "DigestIndex":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def covers(self, ledger_file: Path) -> bool:
+        # The index is only trusted for the exact ledger file it was built for.
+        if not ledger_file.exists():
+            return False
+        return (self.ledger_size, self.ledger_mtime_ns) == ledger_signature(ledger_file)
+
+    def _digest_at(self, position: int) -> bytes:
+        assert self._mmap is not None
+        start = DATA_START + position * FINGERPRINT_BYTES
+        return self._mmap[start : start + FINGERPRINT_BYTES]
+
+    def __contains__(self, fingerprint: int) -> bool:
+        if not self._count:
+            return False
+        # Big-endian digests compare as bytes in the same order as integers.
+        target = fingerprint.to_bytes(FINGERPRINT_BYTES, "big")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._digest_at(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        return low < self._count and self._digest_at(low) == target
+
+    def __iter__(self) -> Iterator[int]:
+        for position in range(self._count):
+            yield int.from_bytes(self._digest_at(position), "big")
+
+
+def write_digest_index(index_file: Path, digests: Iterable[int], ledger_file: Path) -> int:
+    # Digests must arrive sorted; repeats are dropped.
+    index_file.parent.mkdir(parents=True, exist_ok=True)
+    tmp_file = index_file.with_name(f".{index_file.name}.tmp")
+    count = 0
+    try:
+        with tmp_file.open("wb") as handle:
+            handle.write(MAGIC)
+            handle.write(HEADER.pack(0, 0, 0))
+            previous = None
+            for digest in digests:
+                if digest == previous:
+                    continue
+                handle.write(digest.to_bytes(FINGERPRINT_BYTES, "big"))
+                previous = digest
+                count += 1
+            size, mtime_ns = ledger_signature(ledger_file)
+            handle.seek(len(MAGIC))
+            handle.write(HEADER.pack(size, mtime_ns, count))
+        os.replace(tmp_file, index_file)
+    finally:
+        tmp_file.unlink(missing_ok=True)
+    return count
+
+
+def build_digest_index(index_file: Path, ledger_file: Path) -> int:
+    digests = sorted(tx.fingerprint() for tx in iter_transactions_from_csv(ledger_file))
+    return write_digest_index(index_file, digests, ledger_file)
+
+
+def extend_digest_index(index_file: Path, new_digests: Iterable[int], ledger_file: Path) -> int:
+    # Linear merge of the stored run with the sorted new digests.
+    with DigestIndex(index_file) as index:
+        return write_digest_index(
+            index_file, heapq.merge(index, sorted(new_digests)), ledger_file
+        )
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import cProfile
+import json
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from time import perf_counter
+from typing import TypeVar
+
+
+T = TypeVar("T")
+
+
+def elapsed_ms(started: float) -> float:
+    return (perf_counter() - started) * 1000
+
+
+@dataclass(slots=True)
+class FileMetrics:
+    source_file: str
+    bytes: int = 0
+    pages: int = 0
+    lines: int = 0
+    transactions: int = 0
+    parser_id: str = ""
+    read_ms: float = 0.0
+    extract_ms: float = 0.0
+    route_ms: float = 0.0
+    parse_ms: float = 0.0
+    export_ms: float = 0.0
+
+    def timed_pages(self, pages: Iterable[str]) -> Iterator[str]:
+        # Pages are extracted lazily, so time spent waiting on the page
+        # iterator is extraction time wherever the consumer happens to be.
+        iterator = iter(pages)
+        while True:
+            started = perf_counter()
+            page = next(iterator, None)
+            self.extract_ms += elapsed_ms(started)
+            if page is None:
+                return
+            self.pages += 1
+            yield page
+
+    def counted_lines(self, lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            self.lines += 1
+            yield line
+
+    def timed_transactions(self, transactions: Iterable[T]) -> Iterator[T]:
+        # Pulling a transaction may extract more pages; that share is already
+        # booked as extract_ms and is taken back out of parse_ms.
+        iterator = iter(transactions)
+        while True:
+            started = perf_counter()
+            extract_before = self.extract_ms
+            tx = next(iterator, None)
+            self.parse_ms += elapsed_ms(started) - (self.extract_ms - extract_before)
+            if tx is None:
+                return
+            self.transactions += 1
+            yield tx
+
+
+@dataclass(slots=True)
+class CsvFileMetrics:
+    source_file: str
+    bytes: int = 0
+    rows: int = 0
+    load_ms: float = 0.0
+
+
+@dataclass(slots=True)
+class StageMetrics:
+    stages: dict[str, float] = field(default_factory=dict)
+    files: list[CsvFileMetrics] = field(default_factory=list)
+
+    def record(self, name: str, ms: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + ms
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, elapsed_ms(started))
+
+    def payload(self) -> dict[str, object]:
+        return {
+            "stages": {name: round(ms, 3) for name, ms in self.stages.items()},
+            "files": file_metrics_payload(self.files),
+        }
+
+
+def write_stats(stats_file: Path, payload: dict[str, object]) -> None:
+    stats_file.parent.mkdir(parents=True, exist_ok=True)
+    stats_file.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+
+
+def file_metrics_payload(
+    metrics: Iterable[FileMetrics | CsvFileMetrics],
+) -> list[dict[str, object]]:
+    return [
+        {
+            name: round(value, 3) if isinstance(value, float) else value
+            for name, value in asdict(item).items()
+        }
+        for item in metrics
+    ]
+
+
+@contextmanager
+def profiled(profile_file: Path | None) -> Iterator[None]:
+    if profile_file is None:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profile_file.parent.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(profile_file))
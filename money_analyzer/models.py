@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from dataclasses import dataclass
 from datetime import date
 from decimal import Decimal
+from hashlib import blake2b
 
+from money_analyzer.utils import parse_amount, parse_iso_date
+
+
+FINGERPRINT_BYTES = 16
 
 CANONICAL_COLUMNS = [
     "date",
@@ -22,6 +28,12 @@ CANONICAL_COLUMNS = [
 ]
 
 
+def fingerprint_fields(fields: Iterable[str]) -> int:
+    # The unit separator never occurs inside statement text.
+    key = "\x1f".join(fields).encode("utf-8")
+    return int.from_bytes(blake2b(key, digest_size=FINGERPRINT_BYTES).digest(), "big")
+
+
 @dataclass(slots=True)
 class Transaction:
     date: date
@@ -57,8 +69,6 @@ class Transaction:
 
     @staticmethod
     def from_csv_row(row: dict[str, str]) -> "Transaction":
-        from .utils import parse_amount, parse_iso_date
-
         return Transaction(
             date=parse_iso_date(row["date"]),
             posted_date=parse_iso_date(row["posted_date"]) if row.get("posted_date") else None,
@@ -75,13 +85,17 @@ class Transaction:
             confidence=float(row.get("confidence", "1.0") or "1.0"),
         )
 
-    def fingerprint(self) -> tuple[str, ...]:
-        return (
-            self.date.isoformat(),
-            f"{self.amount:.2f}",
-            self.currency,
-            self.account_id,
-            self.account_name,
-            self.description.strip().lower(),
-            self.merchant.strip().lower(),
+    def fingerprint(self) -> int:
+        # One 128-bit digest over the identity fields instead of a tuple of
+        # fresh strings; equal for exactly the rows the old 7-tuple matched.
+        return fingerprint_fields(
+            (
+                self.date.isoformat(),
+                f"{self.amount:.2f}",
+                self.currency,
+                self.account_id,
+                self.account_name,
+                self.description.strip().lower(),
+                self.merchant.strip().lower(),
+            )
         )
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
+from collections.abc import Iterable, Iterator, Mapping
 from dataclasses import dataclass, field
 from pathlib import Path
+from types import MappingProxyType
 
 from money_analyzer.models import Transaction
-from money_analyzer.parsing.pdf_text import extract_text_from_pdf
+from money_analyzer.parsing.pdf_text import iter_pdf_pages
+from money_analyzer.utils import iter_non_empty_lines
+
+
+NO_TRANSACTIONS_WARNING = "No transactions parsed from statement"
 
 
 @dataclass(slots=True)
@@ -19,15 +25,36 @@ class ParseResult:
 class StatementParser(ABC):
     parser_id: str
     bank_name: str
+    detection_keywords: tuple[str, ...] = ()
+    # Routing score per matched keyword; keywords not listed count 1.0.
+    keyword_weights: Mapping[str, float] = MappingProxyType({})
 
     @abstractmethod
     def can_parse(self, text: str, file_name: str = "") -> bool:
         raise NotImplementedError
 
     @abstractmethod
-    def parse_text(self, text: str, source_file: str = "") -> ParseResult:
+    def iter_line_transactions(
+        self, lines: Iterable[str], source_file: str = ""
+    ) -> Iterator[Transaction]:
         raise NotImplementedError
 
+    def iter_transactions(
+        self, chunks: Iterable[str], source_file: str = ""
+    ) -> Iterator[Transaction]:
+        # Chunks may be whole pages or single lines; both are split into the
+        # stripped non-empty lines the parsers work on.
+        return self.iter_line_transactions(iter_non_empty_lines(chunks), source_file)
+
+    def parse_pages(self, pages: Iterable[str], source_file: str = "") -> ParseResult:
+        result = ParseResult(parser_id=self.parser_id, source_file=source_file)
+        result.transactions.extend(self.iter_transactions(pages, source_file=source_file))
+        if not result.transactions:
+            result.warnings.append(NO_TRANSACTIONS_WARNING)
+        return result
+
+    def parse_text(self, text: str, source_file: str = "") -> ParseResult:
+        return self.parse_pages([text], source_file=source_file)
+
     def parse_pdf(self, pdf_path: Path) -> ParseResult:
-        text = extract_text_from_pdf(pdf_path)
-        return self.parse_text(text, source_file=pdf_path.name)
+        return self.parse_pages(iter_pdf_pages(pdf_path), source_file=pdf_path.name)
@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Iterable[str]) -> None:
+        self.keywords = sorted({keyword.lower() for keyword in keywords if keyword})
+        # Longest alternatives first, so a match reports the longest keyword
+        # starting at that position; shorter keywords contained in it are
+        # credited through ``implied`` instead of needing overlapping matches.
+        alternatives = sorted(self.keywords, key=len, reverse=True)
+        self.implied = {
+            keyword: frozenset(other for other in self.keywords if other in keyword)
+            for keyword in self.keywords
+        }
+        self.pattern = (
+            re.compile("|".join(re.escape(keyword) for keyword in alternatives))
+            if alternatives
+            else None
+        )
+
+    def find(self, *texts: str) -> set[str]:
+        found: set[str] = set()
+        if self.pattern is None:
+            return found
+        for text in texts:
+            for keyword in set(self.pattern.findall(text.lower())):
+                found |= self.implied[keyword]
+        return found
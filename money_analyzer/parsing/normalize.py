@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import re
+from datetime import date, datetime
+from decimal import Decimal
+
+from money_analyzer.utils import parse_amount, parse_date
+
+
+DATE_LAYOUTS = (
+    (re.compile(r"\d{2}\.\d{2}\.\d{4}"), "%d.%m.%Y"),
+    (re.compile(r"\d{2}/\d{2}/\d{4}"), "%d/%m/%Y"),
+    (re.compile(r"\d{4}-\d{2}-\d{2}"), "%Y-%m-%d"),
+)
+DECIMAL_SUFFIX_PATTERN = re.compile(r"[.,]\d{2}$")
+# Amounts these patterns accept parse to the same value as utils.parse_amount.
+COMMA_AMOUNT_PATTERN = re.compile(r"[+-]?(?:\d{1,3}(?:\.\d{3})+|\d+),\d{2}")
+POINT_AMOUNT_PATTERN = re.compile(r"[+-]?\d+\.\d{2}")
+
+
+class StatementNormalizer:
+    def __init__(self, date_format: str | None = None, decimal_comma: bool | None = None) -> None:
+        self.date_format = date_format
+        self.decimal_comma = decimal_comma
+        self._dates: dict[str, date] = {}
+        self._amounts: dict[str, Decimal] = {}
+
+    def parse_date(self, value: str) -> date:
+        try:
+            return self._dates[value]
+        except KeyError:
+            parsed = self._dates[value] = self._parse_new_date(value)
+            return parsed
+
+    def parse_amount(self, value: str) -> Decimal:
+        try:
+            return self._amounts[value]
+        except KeyError:
+            parsed = self._amounts[value] = self._parse_new_amount(value)
+            return parsed
+
+    def _parse_new_date(self, value: str) -> date:
+        if self.date_format is None:
+            self.date_format = self._detect_date_format(value)
+        if self.date_format is not None:
+            try:
+                return datetime.strptime(value, self.date_format).date()
+            except ValueError:
+                pass
+        return parse_date(value)
+
+    def _parse_new_amount(self, value: str) -> Decimal:
+        if self.decimal_comma is None:
+            match = DECIMAL_SUFFIX_PATTERN.search(value.strip())
+            if match:
+                self.decimal_comma = match.group(0)[0] == ","
+        if self.decimal_comma and COMMA_AMOUNT_PATTERN.fullmatch(value):
+            return Decimal(value.replace(".", "").replace(",", "."))
+        if self.decimal_comma is False and POINT_AMOUNT_PATTERN.fullmatch(value):
+            return Decimal(value)
+        return parse_amount(value)
+
+    @staticmethod
+    def _detect_date_format(value: str) -> str | None:
+        for pattern, date_format in DATE_LAYOUTS:
+            if pattern.fullmatch(value):
+                return date_format
+        return None
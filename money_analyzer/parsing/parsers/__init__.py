@@ -1,5 +1,12 @@
-from .c24 import C24Parser
-from .n26 import N26Parser
-from .vivid import VividParser
+from importlib import import_module
 
 __all__ = ["N26Parser", "C24Parser", "VividParser"]
+
+_MODULES = {"N26Parser": ".n26", "C24Parser": ".c24", "VividParser": ".vivid"}
+
+
+def __getattr__(name: str) -> object:
+    # Importing one parser module must not import every other bank.
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(import_module(_MODULES[name], __name__), name)
@@ -4,11 +4,12 @@ import re
 from collections.abc import Iterable
 
 from money_analyzer.models import Transaction
-from money_analyzer.utils import parse_amount, parse_date
+from money_analyzer.parsing.normalize import StatementNormalizer
+from money_analyzer.utils import iter_non_empty_lines, parse_amount, parse_date
 
 
 def split_non_empty_lines(text: str) -> list[str]:
-    return [line.strip() for line in text.splitlines() if line.strip()]
+    return list(iter_non_empty_lines([text]))
 
 
 def contains_keywords(text: str, keywords: Iterable[str]) -> bool:
@@ -22,6 +23,7 @@ def parse_transaction_line(
     account_name: str,
     source_file: str,
     parser_id: str,
+    normalizer: StatementNormalizer | None = None,
 ) -> Transaction | None:
     match = pattern.search(line)
     if not match:
@@ -29,10 +31,12 @@ def parse_transaction_line(
     groups = match.groupdict()
     description = " ".join(groups["description"].split())
     merchant = groups.get("merchant") or description
+    to_date = normalizer.parse_date if normalizer else parse_date
+    to_amount = normalizer.parse_amount if normalizer else parse_amount
     return Transaction(
-        date=parse_date(groups["date"]),
-        posted_date=parse_date(groups["posted_date"]) if groups.get("posted_date") else None,
-        amount=parse_amount(groups["amount"]),
+        date=to_date(groups["date"]),
+        posted_date=to_date(groups["posted_date"]) if groups.get("posted_date") else None,
+        amount=to_amount(groups["amount"]),
         currency=(groups.get("currency") or "EUR").replace("€", "EUR"),
         account_name=account_name,
         description=description,
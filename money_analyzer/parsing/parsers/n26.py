@@ -1,14 +1,23 @@
 from __future__ import annotations
 
 import re
+from collections.abc import Iterable, Iterator
+from datetime import date
+from enum import Enum
 
 from money_analyzer.models import Transaction
-from money_analyzer.parsing.base import ParseResult, StatementParser
-from money_analyzer.parsing.parsers.common import (
-    contains_keywords,
-    split_non_empty_lines,
-)
-from money_analyzer.utils import parse_amount, parse_date
+from money_analyzer.parsing.base import StatementParser
+from money_analyzer.parsing.normalize import StatementNormalizer
+from money_analyzer.parsing.parsers.common import contains_keywords
+
+
+TABLE_HEADER = "beschreibung verbuchungsdatum betrag"
+
+
+class LineKind(Enum):
+    HEADER = "header"
+    IGNORED = "ignored"
+    CANDIDATE = "candidate"
 
 
 class N26Parser(StatementParser):
@@ -66,105 +75,99 @@ class N26Parser(StatementParser):
     def can_parse(self, text: str, file_name: str = "") -> bool:
         return contains_keywords(text + " " + file_name, self.detection_keywords)
 
-    def parse_text(self, text: str, source_file: str = "") -> ParseResult:
-        result = ParseResult(parser_id=self.parser_id, source_file=source_file)
-        lines = split_non_empty_lines(text)
-        previous_booking_index = -1
-
-        for index, line in enumerate(lines):
-            single_line_match = self.single_line_pattern.match(line)
-            if single_line_match:
-                groups = single_line_match.groupdict()
-                description = " ".join(groups["description"].split())
-                result.transactions.append(
-                    Transaction(
-                        date=parse_date(groups["date"]),
-                        amount=parse_amount(groups["amount"]),
-                        currency=(groups.get("currency") or "EUR").replace("€", "EUR"),
-                        account_name=self.bank_name,
-                        description=description,
-                        merchant=description,
-                        source_file=source_file,
-                        parser_id=self.parser_id,
-                        confidence=0.9,
+    def iter_line_transactions(
+        self, lines: Iterable[str], source_file: str = ""
+    ) -> Iterator[Transaction]:
+        # One forward pass that looks at each line once and keeps only what the
+        # next booking needs: its description (the first candidate after the
+        # latest table header) and the value date from the line right before it.
+        normalizer = StatementNormalizer()
+        description: str | None = None
+        posted_date: str | None = None
+
+        for line in lines:
+            first = line[:1]
+            if first.isdecimal():
+                single_line_match = self.single_line_pattern.match(line)
+                if single_line_match:
+                    description = " ".join(single_line_match["description"].split())
+                    yield self._transaction(
+                        single_line_match, description, None, normalizer, source_file
                     )
-                )
-                previous_booking_index = index
-                continue
-
-            booking_match = self.booking_line_pattern.match(line)
-            if not booking_match:
-                continue
-
-            posted_date = None
-            description_search_end = index - 1
-            if index > 0:
-                value_date_match = self.value_date_pattern.match(lines[index - 1])
+                    description = posted_date = None
+                    continue
+
+                booking_match = self.booking_line_pattern.match(line)
+                if booking_match:
+                    posted = normalizer.parse_date(posted_date) if posted_date else None
+                    if description:
+                        yield self._transaction(
+                            booking_match, description, posted, normalizer, source_file
+                        )
+                    description = posted_date = None
+                    continue
+
+            if first == "W":
+                value_date_match = self.value_date_pattern.match(line)
                 if value_date_match:
-                    posted_date = parse_date(value_date_match.group("posted_date"))
-                    description_search_end = index - 2
-
-            description = self._find_description(
-                lines,
-                start=previous_booking_index + 1,
-                end=description_search_end,
-            )
-            previous_booking_index = index
-            if not description:
-                continue
-
-            groups = booking_match.groupdict()
-            result.transactions.append(
-                Transaction(
-                    date=parse_date(groups["date"]),
-                    posted_date=posted_date,
-                    amount=parse_amount(groups["amount"]),
-                    currency=(groups.get("currency") or "EUR").replace("€", "EUR"),
-                    account_name=self.bank_name,
-                    description=description,
-                    merchant=description,
-                    source_file=source_file,
-                    parser_id=self.parser_id,
-                    confidence=0.9,
-                )
-            )
-
-        if not result.transactions:
-            result.warnings.append("No transactions parsed from statement")
-        return result
+                    posted_date = value_date_match.group("posted_date")
+                    continue
+            posted_date = None
 
-    @classmethod
-    def _find_description(cls, lines: list[str], start: int, end: int) -> str | None:
-        if end < start:
-            return None
-
-        table_header_index = None
-        for index in range(start, end + 1):
-            normalized = cls._normalize(lines[index])
-            if normalized == "beschreibung verbuchungsdatum betrag":
-                table_header_index = index
-
-        description_start = (table_header_index + 1) if table_header_index is not None else start
-        for index in range(description_start, end + 1):
-            candidate = lines[index].strip()
-            if candidate and not cls._is_ignored_line(candidate):
-                return " ".join(candidate.split())
-        return None
+            # Once the booking has a description only a table header, which
+            # restarts the search, can change the state.
+            if description is not None and first not in "bB" and not first.isspace():
+                continue
+            kind, value = self._classify_line(line)
+            if kind is LineKind.HEADER:
+                description = None
+            elif kind is LineKind.CANDIDATE and description is None:
+                description = value
+
+    def _transaction(
+        self,
+        match: re.Match[str],
+        description: str,
+        posted_date: date | None,
+        normalizer: StatementNormalizer,
+        source_file: str,
+    ) -> Transaction:
+        return Transaction(
+            date=normalizer.parse_date(match["date"]),
+            posted_date=posted_date,
+            amount=normalizer.parse_amount(match["amount"]),
+            currency=(match["currency"] or "EUR").replace("€", "EUR"),
+            account_name=self.bank_name,
+            description=description,
+            merchant=description,
+            source_file=source_file,
+            parser_id=self.parser_id,
+            confidence=0.9,
+        )
 
     @classmethod
-    def _is_ignored_line(cls, line: str) -> bool:
-        normalized = cls._normalize(line)
-        if normalized in cls.ignored_exact_lines:
-            return True
-        if cls.date_range_pattern.match(line):
-            return True
-        if cls.page_pattern.match(line):
-            return True
-        if cls.date_only_pattern.match(line):
-            return True
-        if normalized.startswith(("/", "0", "1", "2", "3", "4", "5", "6", "7", "8", "9")):
-            return True
-        return normalized.startswith(cls.ignored_prefixes)
+    def _classify_line(cls, line: str) -> tuple[LineKind, str | None]:
+        candidate = line.strip()
+        if not candidate:
+            return LineKind.IGNORED, None
+        first = candidate[0]
+        # Dates, date ranges, page numbers and amounts never describe a booking.
+        # Non-ASCII digits only count when one of the numeric patterns matches.
+        if first == "/" or "0" <= first <= "9":
+            return LineKind.IGNORED, None
+        if first.isdecimal() and (
+            cls.date_range_pattern.match(candidate)
+            or cls.page_pattern.match(candidate)
+            or cls.date_only_pattern.match(candidate)
+        ):
+            return LineKind.IGNORED, None
+
+        normalized = cls._normalize(candidate)
+        if normalized == TABLE_HEADER:
+            return LineKind.HEADER, None
+        if normalized in cls.ignored_exact_lines or normalized.startswith(cls.ignored_prefixes):
+            return LineKind.IGNORED, None
+        return LineKind.CANDIDATE, " ".join(candidate.split())
 
     @staticmethod
     def _normalize(value: str) -> str:
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+
+DEFAULT_CACHE_MAX_BYTES = 512 * 1024 * 1024
+CACHE_FORMAT_VERSION = 1
+# Other workers write to the same directory, so the running size total is
+# re-synced with a directory scan every this many writes.
+RESCAN_EVERY_WRITES = 64
+STALE_TMP_SECONDS = 3600
+
+
+def default_cache_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or str(Path.home() / ".cache")
+    return Path(base) / "money-analyzer" / "pdf-text"
+
+
+@lru_cache(maxsize=None)
+def pypdf_version() -> str:
+    # Read from package metadata so a cache hit never imports pypdf itself.
+    try:
+        return version("pypdf")
+    except PackageNotFoundError:
+        import pypdf
+
+        return pypdf.__version__
+
+
+class PdfTextCache:
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_MAX_BYTES) -> None:
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._known_bytes: int | None = None
+        self._writes_since_scan = 0
+
+    def key_for(self, data: bytes) -> str:
+        digest = hashlib.sha256(data)
+        digest.update(f"\0pypdf={pypdf_version()}\0v{CACHE_FORMAT_VERSION}".encode("ascii"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> list[str] | None:
+        # Touching the entry on read keeps mtime order equal to LRU order.
+        entry = self._entry_path(key)
+        try:
+            payload = json.loads(entry.read_text(encoding="utf-8"))
+            os.utime(entry)
+        except (OSError, ValueError):
+            return None
+        pages = payload.get("pages")
+        if not isinstance(pages, list):
+            return None
+        return pages
+
+    def put(self, key: str, pages: list[str]) -> None:
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"pages": pages}, ensure_ascii=False).encode("utf-8")
+        entry = self._entry_path(key)
+        try:
+            replaced = entry.stat().st_size
+        except OSError:
+            replaced = 0
+        # Write to a temp file first so concurrent ingest workers never see a
+        # partially written entry.
+        fd, tmp_name = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as handle:
+                handle.write(payload)
+            os.replace(tmp_name, entry)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+
+        # Writes only add to a running total; the directory is scanned when
+        # the total passes the cap or is due for a re-sync.
+        self._writes_since_scan += 1
+        if self._known_bytes is None or self._writes_since_scan >= RESCAN_EVERY_WRITES:
+            self.evict()
+            return
+        self._known_bytes += len(payload) - replaced
+        if self._known_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self) -> None:
+        entries = []
+        total = 0
+        stale_before = time.time() - STALE_TMP_SECONDS
+        for path in self.cache_dir.iterdir():
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.suffix == ".tmp":
+                # Left behind by a worker that died mid-write.
+                if stat.st_mtime < stale_before:
+                    path.unlink(missing_ok=True)
+                else:
+                    total += stat.st_size
+            elif path.suffix == ".json":
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, entry in entries:
+                if total <= self.max_bytes:
+                    break
+                entry.unlink(missing_ok=True)
+                total -= size
+        self._known_bytes = total
+        self._writes_since_scan = 0
+
+    def _entry_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
@@ -1,13 +1,157 @@
 from __future__ import annotations
 
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from io import BytesIO
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
-from pypdf import PdfReader
+from money_analyzer.parsing.pdf_cache import PdfTextCache
 
+if TYPE_CHECKING:
+    from pypdf import PdfReader
 
-def extract_text_from_pdf(pdf_path: Path) -> str:
-    reader = PdfReader(str(pdf_path))
-    pages = []
+
+DEFAULT_MIN_RANGE_PAGES = 20
+
+
+def load_pdf_reader() -> type[PdfReader]:
+    # pypdf is imported on first extraction so commands and workers that
+    # never open a PDF do not pay for it.
+    from pypdf import PdfReader
+
+    return PdfReader
+
+
+def _iter_pages(stream: str | BinaryIO) -> Iterator[str]:
+    reader = load_pdf_reader()(stream)
     for page in reader.pages:
-        pages.append(page.extract_text() or "")
-    return "\n".join(pages)
+        yield page.extract_text() or ""
+
+
+def _extract_page_range(data: bytes, start: int, stop: int) -> list[str]:
+    reader = load_pdf_reader()(BytesIO(data))
+    return [reader.pages[index].extract_text() or "" for index in range(start, stop)]
+
+
+class PageRangeExtractor:
+    # Splits a long PDF into contiguous page ranges extracted in separate
+    # processes. Ranges are yielded in page order as soon as each is done, so
+    # routing can start on the first range while later ones are still being
+    # extracted. The pool is only started by the first document long enough
+    # to split.
+    def __init__(self, workers: int, min_range_pages: int = DEFAULT_MIN_RANGE_PAGES) -> None:
+        self.workers = workers
+        self.min_range_pages = max(min_range_pages, 1)
+        self._executor: ProcessPoolExecutor | None = None
+
+    def __enter__(self) -> "PageRangeExtractor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+
+    def page_ranges(self, page_count: int) -> list[tuple[int, int]]:
+        count = min(self.workers, page_count // self.min_range_pages)
+        if count <= 1:
+            return [(0, page_count)]
+        size, extra = divmod(page_count, count)
+        ranges = []
+        start = 0
+        for index in range(count):
+            stop = start + size + (index < extra)
+            ranges.append((start, stop))
+            start = stop
+        return ranges
+
+    def splits(self, data: bytes) -> bool:
+        # Whether iter_pages would extract data in more than one range.
+        return len(self.page_ranges(len(load_pdf_reader()(BytesIO(data)).pages))) > 1
+
+    def iter_pages(self, data: bytes) -> Iterator[str]:
+        reader = load_pdf_reader()(BytesIO(data))
+        ranges = self.page_ranges(len(reader.pages))
+        if len(ranges) == 1:
+            for page in reader.pages:
+                yield page.extract_text() or ""
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        futures: list[Future[list[str]]] = [
+            self._executor.submit(_extract_page_range, data, start, stop)
+            for start, stop in ranges
+        ]
+        try:
+            for future in futures:
+                yield from future.result()
+        finally:
+            # Consumers that stop early (e.g. routing rejects the document)
+            # do not wait for the ranges nobody will read.
+            for future in futures:
+                future.cancel()
+
+
+def iter_pdf_pages(
+    pdf_path: Path,
+    cache: PdfTextCache | None = None,
+    page_extractor: PageRangeExtractor | None = None,
+) -> Iterator[str]:
+    if cache is None and page_extractor is None:
+        yield from _iter_pages(str(pdf_path))
+        return
+    yield from iter_pdf_data_pages(
+        pdf_path.read_bytes(), cache=cache, page_extractor=page_extractor
+    )
+
+
+def iter_pdf_data_pages(
+    data: bytes,
+    cache: PdfTextCache | None = None,
+    page_extractor: PageRangeExtractor | None = None,
+) -> Iterator[str]:
+    # Extraction from bytes that were already read, e.g. by an I/O thread.
+    key = cache.key_for(data) if cache is not None else ""
+    if cache is not None:
+        cached_pages = cache.get(key)
+        if cached_pages is not None:
+            yield from cached_pages
+            return
+
+    if page_extractor is not None:
+        extracted = page_extractor.iter_pages(data)
+    else:
+        extracted = _iter_pages(BytesIO(data))
+    if cache is None:
+        yield from extracted
+        return
+
+    pages = []
+    for text in extracted:
+        pages.append(text)
+        yield text
+    # Only fully extracted documents are cached; consumers that stop early
+    # (e.g. rejected by routing) leave no partial entry behind.
+    cache.put(key, pages)
+
+
+def extract_pages_from_pdf(
+    pdf_path: Path, cache: PdfTextCache | None = None, page_workers: int = 1
+) -> list[str]:
+    # page_workers > 1 extracts page ranges of long documents in that many
+    # processes.
+    if page_workers <= 1:
+        return list(iter_pdf_pages(pdf_path, cache=cache))
+    with PageRangeExtractor(page_workers) as page_extractor:
+        return list(iter_pdf_pages(pdf_path, cache=cache, page_extractor=page_extractor))
+
+
+def extract_text_from_pdf(
+    pdf_path: Path, cache: PdfTextCache | None = None, page_workers: int = 1
+) -> str:
+    return "\n".join(extract_pages_from_pdf(pdf_path, cache=cache, page_workers=page_workers))
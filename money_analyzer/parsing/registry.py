@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from importlib import import_module
+from importlib.metadata import entry_points
+
+from money_analyzer.parsing.base import StatementParser
+
+
+ENTRY_POINT_GROUP = "money_analyzer.parsers"
+
+# parser_id -> "module:ClassName". Modules are imported only when a router
+# first needs its parsers, so adding a bank does not slow down CLI startup.
+BUILTIN_PARSERS = {
+    "n26": "money_analyzer.parsing.parsers.n26:N26Parser",
+    "c24": "money_analyzer.parsing.parsers.c24:C24Parser",
+    "vivid": "money_analyzer.parsing.parsers.vivid:VividParser",
+}
+
+_registered: dict[str, str] = dict(BUILTIN_PARSERS)
+_entry_points_loaded = False
+
+
+def register_parser(parser_id: str, target: str) -> None:
+    if ":" not in target:
+        raise ValueError(f"Parser target '{target}' must look like 'module:ClassName'")
+    _registered[parser_id] = target
+
+
+def registered_parsers() -> dict[str, str]:
+    # Installed plugins add banks through the money_analyzer.parsers entry
+    # point group; built-in and explicitly registered ids take precedence.
+    global _entry_points_loaded
+    if not _entry_points_loaded:
+        for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+            _registered.setdefault(entry_point.name, entry_point.value)
+        _entry_points_loaded = True
+    return dict(_registered)
+
+
+def load_parser_class(target: str) -> type[StatementParser]:
+    module_name, _, class_name = target.partition(":")
+    parser_class = getattr(import_module(module_name), class_name)
+    if not (isinstance(parser_class, type) and issubclass(parser_class, StatementParser)):
+        raise TypeError(f"'{target}' is not a StatementParser subclass")
+    return parser_class
+
+
+def load_parsers() -> list[StatementParser]:
+    return [load_parser_class(target)() for target in registered_parsers().values()]
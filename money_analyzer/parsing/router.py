@@ -1,19 +1,53 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass
+from itertools import chain, islice
 from pathlib import Path
+from time import perf_counter
 
+from money_analyzer.metrics import FileMetrics, elapsed_ms
+from money_analyzer.models import Transaction
 from money_analyzer.parsing.base import ParseResult, StatementParser
-from money_analyzer.parsing.parsers.c24 import C24Parser
-from money_analyzer.parsing.parsers.n26 import N26Parser
-from money_analyzer.parsing.parsers.vivid import VividParser
-from money_analyzer.parsing.pdf_text import extract_text_from_pdf
+from money_analyzer.parsing.keywords import KeywordMatcher
+from money_analyzer.parsing.pdf_cache import PdfTextCache
+from money_analyzer.parsing.pdf_text import (
+    PageRangeExtractor,
+    iter_pdf_data_pages,
+    iter_pdf_pages,
+    load_pdf_reader,
+)
+from money_analyzer.parsing.registry import load_parsers
+from money_analyzer.utils import iter_non_empty_lines
+
+
+DEFAULT_ROUTING_PAGES = 2
+# A full-weight keyword names the bank; lighter weights only tip the balance.
+IDENTIFYING_SCORE = 1.0
 
 
 @dataclass(slots=True)
 class RoutingDecision:
     parser_id: str
     source_file: str
+    score: float = 0.0
+    confidence: float = 1.0
+
+
+@dataclass(slots=True)
+class RoutingScore:
+    parser: StatementParser
+    score: float
+    matched_keywords: tuple[str, ...] = ()
+    confidence: float = 0.0
+
+    def decision(self, source_file: str) -> RoutingDecision:
+        return RoutingDecision(
+            parser_id=self.parser.parser_id,
+            source_file=source_file,
+            score=self.score,
+            confidence=self.confidence,
+        )
 
 
 class ParserNotFoundError(RuntimeError):
@@ -21,21 +55,154 @@ class ParserNotFoundError(RuntimeError):
 
 
 class ParserRouter:
-    def __init__(self, parsers: list[StatementParser] | None = None) -> None:
-        self.parsers = parsers or [N26Parser(), C24Parser(), VividParser()]
+    def __init__(
+        self,
+        parsers: list[StatementParser] | None = None,
+        text_cache: PdfTextCache | None = None,
+        routing_pages: int = DEFAULT_ROUTING_PAGES,
+        page_extractor: PageRangeExtractor | None = None,
+    ) -> None:
+        # Without explicit parsers the registered ones are imported and built
+        # on first use, not when the router is created.
+        self._parsers = parsers
+        self.text_cache = text_cache
+        self.routing_pages = routing_pages
+        self.page_extractor = page_extractor
+        self._matcher_parsers: tuple[StatementParser, ...] = ()
+        self._matcher = KeywordMatcher(())
+
+    @property
+    def parsers(self) -> list[StatementParser]:
+        if self._parsers is None:
+            self._parsers = load_parsers()
+        return self._parsers
+
+    @parsers.setter
+    def parsers(self, parsers: list[StatementParser]) -> None:
+        self._parsers = parsers
+
+    def warm_up(self) -> None:
+        # Pays the parser, keyword matcher and pypdf start-up cost now rather
+        # than on the first statement, for long-running ingest processes.
+        self._keyword_matcher()
+        load_pdf_reader()
 
     def route(self, text: str, source_file: str = "") -> StatementParser:
+        best = self._match(text, source_file)
+        if best is None:
+            raise self._not_found(source_file)
+        return best.parser
+
+    def route_pages(
+        self, pages: Iterator[str], source_file: str = ""
+    ) -> tuple[RoutingScore, list[str]]:
+        # Routing stops early only on a bank-identifying match; a weak one
+        # such as a generic "statement" on a cover page waits until every
+        # routing page has been scored.
+        head: list[str] = []
+        best = None
+        for page in islice(pages, self.routing_pages):
+            head.append(page)
+            best = self._match("\n".join(head), source_file)
+            if best is not None and best.score >= IDENTIFYING_SCORE:
+                return best, head
+        if not head:
+            best = self._match("", source_file)
+        if best is None:
+            raise self._not_found(source_file)
+        return best, head
+
+    def score(self, text: str, source_file: str = "") -> list[RoutingScore]:
+        found = self._keyword_matcher().find(text, source_file)
+        scores = []
         for parser in self.parsers:
-            if parser.can_parse(text, source_file):
-                return parser
+            if parser.detection_keywords:
+                matched = tuple(
+                    keyword for keyword in parser.detection_keywords if keyword.lower() in found
+                )
+                weights = parser.keyword_weights
+                score = sum(weights.get(keyword, 1.0) for keyword in matched)
+            else:
+                matched = ()
+                score = 1.0 if parser.can_parse(text, source_file) else 0.0
+            scores.append(RoutingScore(parser=parser, score=score, matched_keywords=matched))
+        total = sum(candidate.score for candidate in scores)
+        if total:
+            for candidate in scores:
+                candidate.confidence = candidate.score / total
+        return scores
+
+    def parse_pdf(self, pdf_path: Path) -> tuple[ParseResult, RoutingDecision]:
+        pages = self._pdf_pages(pdf_path, None)
+        best, head = self.route_pages(pages, source_file=pdf_path.name)
+        result = best.parser.parse_pages(chain(head, pages), source_file=pdf_path.name)
+        return result, best.decision(pdf_path.name)
+
+    def stream_pdf(
+        self,
+        pdf_path: Path,
+        metrics: FileMetrics | None = None,
+        data: bytes | None = None,
+        source_file: str | None = None,
+        pages: Iterable[str] | None = None,
+    ) -> tuple[Iterator[Transaction], RoutingDecision]:
+        # With data the PDF bytes are already in memory and pdf_path only
+        # names the statement; source_file overrides that name, e.g. for an
+        # archive member. With pages the text was already extracted and only
+        # routing and parsing run here; metrics.bytes is left to the caller.
+        # With metrics every stage is wrapped so the time spent in pypdf,
+        # routing and the parser can be told apart; without it the stages run
+        # unwrapped.
+        source_file = source_file or pdf_path.name
+        page_stream = iter(pages) if pages is not None else self._pdf_pages(pdf_path, data)
+        if metrics is not None:
+            if data is not None:
+                metrics.bytes = len(data)
+            elif pages is None:
+                metrics.bytes = pdf_path.stat().st_size
+            page_stream = metrics.timed_pages(page_stream)
+        started = perf_counter()
+        best, head = self.route_pages(page_stream, source_file=source_file)
+        lines = iter_non_empty_lines(chain(head, page_stream))
+        if metrics is not None:
+            metrics.route_ms += elapsed_ms(started) - metrics.extract_ms
+            metrics.parser_id = best.parser.parser_id
+            lines = metrics.counted_lines(lines)
+        transactions = best.parser.iter_line_transactions(lines, source_file=source_file)
+        if metrics is not None:
+            transactions = metrics.timed_transactions(transactions)
+        return transactions, best.decision(source_file)
+
+    def _pdf_pages(self, pdf_path: Path, data: bytes | None) -> Iterator[str]:
+        if data is None:
+            return iter_pdf_pages(
+                pdf_path, cache=self.text_cache, page_extractor=self.page_extractor
+            )
+        return iter_pdf_data_pages(
+            data, cache=self.text_cache, page_extractor=self.page_extractor
+        )
+
+    def _match(self, text: str, source_file: str) -> RoutingScore | None:
+        # Highest score wins; ties keep registration order.
+        best = None
+        for candidate in self.score(text, source_file):
+            if candidate.score > 0 and (best is None or candidate.score > best.score):
+                best = candidate
+        return best
+
+    def _keyword_matcher(self) -> KeywordMatcher:
+        # One combined matcher for every registered parser, rebuilt only when
+        # the parser list changes.
+        parsers = tuple(self.parsers)
+        if parsers != self._matcher_parsers:
+            self._matcher = KeywordMatcher(
+                keyword for parser in parsers for keyword in parser.detection_keywords
+            )
+            self._matcher_parsers = parsers
+        return self._matcher
+
+    def _not_found(self, source_file: str) -> ParserNotFoundError:
         parser_ids = ", ".join(parser.parser_id for parser in self.parsers)
-        raise ParserNotFoundError(
+        return ParserNotFoundError(
             f"No parser matched '{source_file}'. Available parsers: {parser_ids}"
         )
-
-    def parse_pdf(self, pdf_path: Path) -> tuple[ParseResult, RoutingDecision]:
-        text = extract_text_from_pdf(pdf_path)
-        parser = self.route(text, source_file=pdf_path.name)
-        result = parser.parse_text(text, source_file=pdf_path.name)
-        decision = RoutingDecision(parser_id=parser.parser_id, source_file=pdf_path.name)
-        return result, decision
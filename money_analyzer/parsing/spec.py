@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import re
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+from operator import itemgetter
+from types import MappingProxyType
+
+from money_analyzer.models import Transaction
+from money_analyzer.parsing.base import StatementParser
+from money_analyzer.parsing.normalize import StatementNormalizer
+from money_analyzer.parsing.parsers.common import contains_keywords
+
+
+DATE_TOKEN = r"\d{2}[./]\d{2}[./]\d{4}"
+GROUP_NAME_PATTERN = re.compile(r"\(\?P(?:<(\w+)>|=(\w+)\))")
+TRANSACTION_FIELDS = ("date", "posted_date", "amount", "currency", "description", "merchant")
+
+
+def starts_with_date_token(line: str) -> bool:
+    # Cheap stand-in for a leading DATE_TOKEN: rejects headers and footers
+    # before the full line grammar runs.
+    return len(line) >= 10 and line[2] in "./" and line[:2].isdecimal()
+
+
+PREFILTERS: dict[str, Callable[[str], bool]] = {
+    "date": starts_with_date_token,
+}
+# What every line grammar must start with for the prefilter to be safe.
+PREFILTER_TOKENS = {
+    "date": DATE_TOKEN,
+}
+LEADING_GROUP_PATTERN = re.compile(r"\((?:\?P<\w+>|\?:)?")
+
+
+def leads_with(pattern: str, token: str) -> bool:
+    # True when an anchored pattern can only match lines starting with token,
+    # allowing for the groups it is wrapped in.
+    if not pattern.startswith("^"):
+        return False
+    rest = pattern[1:]
+    while match := LEADING_GROUP_PATTERN.match(rest):
+        rest = rest[match.end() :]
+    return rest.startswith(token)
+
+
+@dataclass(frozen=True, slots=True)
+class LineGrammar:
+    pattern: str
+    # Transaction field -> regex group name. date, amount and description are
+    # required; posted_date, currency and merchant may be left out.
+    fields: Mapping[str, str] = field(
+        default_factory=lambda: MappingProxyType({name: name for name in TRANSACTION_FIELDS})
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class ParserSpec:
+    parser_id: str
+    bank_name: str
+    detection_keywords: tuple[str, ...]
+    line_grammars: tuple[LineGrammar, ...]
+    keyword_weights: Mapping[str, float] = field(default_factory=lambda: MappingProxyType({}))
+    ignored_prefixes: tuple[str, ...] = ()
+    # Opt-in cheap line check, e.g. "date" when every grammar starts with
+    # DATE_TOKEN; checked against the grammars when the parser is built.
+    prefilter: str | None = None
+    default_currency: str = "EUR"
+    confidence: float = 0.9
+
+
+REQUIRED_FIELDS = ("date", "amount", "description")
+
+
+class CompiledLineMatcher:
+    def __init__(self, spec: ParserSpec) -> None:
+        self.spec = spec
+        self.prefilter = self._compile_prefilter(spec)
+        self.ignored_prefixes = tuple(prefix.lower() for prefix in spec.ignored_prefixes)
+        if not spec.line_grammars:
+            raise ValueError(f"{spec.parser_id}: parser spec has no line grammars")
+        # Group names are prefixed per grammar so all grammars fit in one
+        # alternation; the outer group's name tells which grammar matched.
+        prefixes = [f"g{index}" for index in range(len(spec.line_grammars))]
+        self.pattern = re.compile(
+            "|".join(
+                f"(?P<{prefix}>{_prefix_groups(grammar.pattern, prefix)})"
+                for prefix, grammar in zip(prefixes, spec.line_grammars)
+            )
+        )
+        # Anchored grammars only need to be tried at the start of the line.
+        anchored = all(grammar.pattern.startswith("^") for grammar in spec.line_grammars)
+        self._find = self.pattern.match if anchored else self.pattern.search
+        self._pickers = {
+            prefix: self._compile_fields(prefix, grammar.fields)
+            for prefix, grammar in zip(prefixes, spec.line_grammars)
+        }
+
+    @staticmethod
+    def _compile_prefilter(spec: ParserSpec) -> Callable[[str], bool] | None:
+        if spec.prefilter is None:
+            return None
+        if spec.prefilter not in PREFILTERS:
+            raise ValueError(
+                f"{spec.parser_id}: unknown prefilter '{spec.prefilter}', "
+                f"expected one of {', '.join(PREFILTERS)}"
+            )
+        token = PREFILTER_TOKENS[spec.prefilter]
+        for grammar in spec.line_grammars:
+            if not leads_with(grammar.pattern, token):
+                raise ValueError(
+                    f"{spec.parser_id}: prefilter '{spec.prefilter}' would drop every line of "
+                    f"grammar {grammar.pattern!r}"
+                )
+        return PREFILTERS[spec.prefilter]
+
+    def _compile_fields(
+        self, prefix: str, fields: Mapping[str, str]
+    ) -> Callable[[tuple[str | None, ...]], tuple[str | None, ...]]:
+        # Picks TRANSACTION_FIELDS out of match.groups() in one call; fields
+        # the grammar leaves out point at the None appended past the groups.
+        groupindex = self.pattern.groupindex
+        absent = self.pattern.groups
+        positions = {
+            name: groupindex[f"{prefix}_{group}"] - 1
+            for name, group in fields.items()
+            if f"{prefix}_{group}" in groupindex
+        }
+        for name in REQUIRED_FIELDS:
+            if name not in positions:
+                raise ValueError(f"{self.spec.parser_id}: line grammar has no group for '{name}'")
+        return itemgetter(*(positions.get(name, absent) for name in TRANSACTION_FIELDS))
+
+    def parse_line(
+        self, line: str, source_file: str, normalizer: StatementNormalizer
+    ) -> Transaction | None:
+        if self.prefilter is not None and not self.prefilter(line):
+            return None
+        if self.ignored_prefixes and line.lower().startswith(self.ignored_prefixes):
+            return None
+        match = self._find(line)
+        if match is None:
+            return None
+        tx_date, posted_date, amount, currency, description, merchant = self._pickers[
+            match.lastgroup or ""
+        ](match.groups() + (None,))
+        description = " ".join(description.split())
+        return Transaction(
+            date=normalizer.parse_date(tx_date),
+            posted_date=normalizer.parse_date(posted_date) if posted_date else None,
+            amount=normalizer.parse_amount(amount),
+            currency=(currency or self.spec.default_currency).replace("€", "EUR"),
+            account_name=self.spec.bank_name,
+            description=description,
+            merchant=merchant or description,
+            source_file=source_file,
+            parser_id=self.spec.parser_id,
+            confidence=self.spec.confidence,
+        )
+
+
+def _prefix_groups(pattern: str, prefix: str) -> str:
+    def rename(match: re.Match[str]) -> str:
+        if match.group(1):
+            return f"(?P<{prefix}_{match.group(1)}>"
+        return f"(?P={prefix}_{match.group(2)})"
+
+    return GROUP_NAME_PATTERN.sub(rename, pattern)
+
+
+class SpecParser(StatementParser):
+    spec: ParserSpec
+
+    def __init_subclass__(cls, **kwargs: object) -> None:
+        super().__init_subclass__(**kwargs)
+        spec = cls.__dict__.get("spec")
+        if spec is not None:
+            cls.parser_id = spec.parser_id
+            cls.bank_name = spec.bank_name
+            cls.detection_keywords = spec.detection_keywords
+            cls.keyword_weights = spec.keyword_weights
+
+    def __init__(self, spec: ParserSpec | None = None) -> None:
+        # A bank described only by a spec needs no subclass: SpecParser(spec).
+        if spec is not None:
+            self.spec = spec
+            self.parser_id = spec.parser_id
+            self.bank_name = spec.bank_name
+            self.detection_keywords = spec.detection_keywords
+            self.keyword_weights = spec.keyword_weights
+        self.matcher = CompiledLineMatcher(self.spec)
+
+    def can_parse(self, text: str, file_name: str = "") -> bool:
+        return contains_keywords(text + " " + file_name, self.detection_keywords)
+
+    def iter_line_transactions(
+        self, lines: Iterable[str], source_file: str = ""
+    ) -> Iterator[Transaction]:
+        normalizer = StatementNormalizer()
+        parse_line = self.matcher.parse_line
+        for line in lines:
+            tx = parse_line(line, source_file, normalizer)
+            if tx:
+                yield tx
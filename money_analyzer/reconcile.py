@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import csv
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+from money_analyzer.csv_io import open_atomic_output
+from money_analyzer.table import TransactionTable, format_cents
+
+
+DEFAULT_TRANSFER_WINDOW_DAYS = 3
+TRANSFER_TYPE = "transfer"
+
+TRANSFER_COLUMNS = [
+    "transfer_id",
+    "amount",
+    "currency",
+    "from_account",
+    "to_account",
+    "out_date",
+    "in_date",
+    "out_description",
+    "in_description",
+]
+
+
+@dataclass(slots=True)
+class TransferPair:
+    outgoing: int
+    incoming: int
+    days_apart: int
+
+
+def match_transfers(
+    table: TransactionTable, window_days: int = DEFAULT_TRANSFER_WINDOW_DAYS
+) -> list[TransferPair]:
+    # Rows are bucketed by (absolute amount, currency); only rows in the same
+    # bucket can pair up, so the work is linear in the ledger plus the size
+    # of each bucket's date window instead of quadratic.
+    buckets: dict[tuple[int, int], tuple[list[int], list[int]]] = defaultdict(lambda: ([], []))
+    for index, (cents, currency) in enumerate(zip(table.cents, table.codes["currency"])):
+        if cents:
+            outgoing, incoming = buckets[(abs(cents), currency)]
+            (outgoing if cents < 0 else incoming).append(index)
+
+    dates = table.dates
+    accounts = table.codes["account_name"]
+    pairs: list[TransferPair] = []
+    for outgoing, incoming in buckets.values():
+        if not incoming:
+            continue
+        outgoing.sort(key=dates.__getitem__)
+        incoming.sort(key=dates.__getitem__)
+        incoming_dates = [dates[index] for index in incoming]
+        matched = [False] * len(incoming)
+        first_open = 0
+        # Outgoing rows claim, in date order, the closest unmatched incoming
+        # row from another account; ties go to the earlier incoming row.
+        for out_index in outgoing:
+            out_date = dates[out_index]
+            position = bisect_left(incoming_dates, out_date - window_days, lo=first_open)
+            best = -1
+            best_distance = window_days + 1
+            while position < len(incoming) and incoming_dates[position] <= out_date + window_days:
+                distance = abs(incoming_dates[position] - out_date)
+                if (
+                    not matched[position]
+                    and distance < best_distance
+                    and accounts[incoming[position]] != accounts[out_index]
+                ):
+                    best, best_distance = position, distance
+                position += 1
+            if best < 0:
+                continue
+            matched[best] = True
+            while first_open < len(matched) and matched[first_open]:
+                first_open += 1
+            pairs.append(
+                TransferPair(outgoing=out_index, incoming=incoming[best], days_apart=best_distance)
+            )
+
+    pairs.sort(key=lambda pair: (dates[pair.outgoing], pair.outgoing))
+    return pairs
+
+
+def mark_transfers(table: TransactionTable, pairs: list[TransferPair]) -> None:
+    code = table.dictionaries["transaction_type"].encode(TRANSFER_TYPE)
+    types = table.codes["transaction_type"]
+    for pair in pairs:
+        types[pair.outgoing] = code
+        types[pair.incoming] = code
+
+
+def default_transfers_path(ledger_file: Path) -> Path:
+    return ledger_file.with_name(f"{ledger_file.stem}.transfers.csv")
+
+
+def export_transfer_pairs(
+    table: TransactionTable, pairs: list[TransferPair], output_file: Path
+) -> int:
+    currencies = table.dictionaries["currency"].values
+    accounts = table.dictionaries["account_name"].values
+    descriptions = table.text["description"]
+    with open_atomic_output(output_file) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(TRANSFER_COLUMNS)
+        for transfer_id, pair in enumerate(pairs, start=1):
+            out_index, in_index = pair.outgoing, pair.incoming
+            writer.writerow(
+                [
+                    transfer_id,
+                    format_cents(table.cents[in_index]),
+                    currencies[table.codes["currency"][out_index]],
+                    accounts[table.codes["account_name"][out_index]],
+                    accounts[table.codes["account_name"][in_index]],
+                    date.fromordinal(table.dates[out_index]).isoformat(),
+                    date.fromordinal(table.dates[in_index]).isoformat(),
+                    descriptions[out_index],
+                    descriptions[in_index],
+                ]
+            )
+    return len(pairs)
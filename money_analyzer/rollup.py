@@ -0,0 +1,231 @@
+from __future__ import annotations
+
+import csv
+import hashlib
+import json
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from money_analyzer.csv_io import open_atomic_output
+from money_analyzer.table import csv_amount_to_cents
+
+
+ROLLUP_VERSION = 1
+DIMENSIONS = ("month", "account", "category", "merchant")
+REPORT_COLUMNS = ("amount", "account_name", "category", "merchant")
+READ_BLOCK_BYTES = 1024 * 1024
+
+# (account, category, merchant) -> [count, sum, min, max] in cents.
+Buckets = dict[tuple[str, str, str], list[int]]
+
+
+@dataclass(slots=True)
+class MonthRollup:
+    # Byte range of the month's rows in the ledger and their hash, so an
+    # unchanged month is recognised without parsing it again.
+    start: int
+    end: int
+    sha256: str
+    buckets: Buckets = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class Rollup:
+    header_sha256: str = ""
+    months: dict[str, MonthRollup] = field(default_factory=dict)
+    reused_months: int = 0
+    scanned_months: int = 0
+
+
+def default_rollup_path(ledger_file: Path) -> Path:
+    return ledger_file.with_name(f"{ledger_file.name}.rollup.json")
+
+
+def load_rollup(rollup_file: Path) -> Rollup:
+    # A missing or older-version file is an empty rollup; a damaged one, e.g.
+    # partially written by hand, raises ValueError so callers can rebuild it.
+    if not rollup_file.exists():
+        return Rollup()
+    try:
+        payload = json.loads(rollup_file.read_text(encoding="utf-8"))
+        if payload.get("version") != ROLLUP_VERSION:
+            return Rollup()
+        return Rollup(
+            header_sha256=payload["header_sha256"],
+            months={
+                month: MonthRollup(
+                    start=entry["start"],
+                    end=entry["end"],
+                    sha256=entry["sha256"],
+                    buckets={
+                        (account, category, merchant): values
+                        for account, category, merchant, *values in entry["buckets"]
+                    },
+                )
+                for month, entry in payload["months"].items()
+            },
+        )
+    except (AttributeError, KeyError, TypeError, ValueError) as error:
+        raise ValueError(f"{rollup_file} is not a valid rollup ({error!r})") from error
+
+
+def save_rollup(rollup_file: Path, rollup: Rollup) -> None:
+    payload = {
+        "version": ROLLUP_VERSION,
+        "header_sha256": rollup.header_sha256,
+        "months": {
+            month: {
+                "start": entry.start,
+                "end": entry.end,
+                "sha256": entry.sha256,
+                "buckets": [[*key, *values] for key, values in entry.buckets.items()],
+            }
+            for month, entry in rollup.months.items()
+        },
+    }
+    with open_atomic_output(rollup_file) as handle:
+        json.dump(payload, handle)
+
+
+def _hash_range(handle, start: int, end: int) -> str:
+    digest = hashlib.sha256()
+    handle.seek(start)
+    remaining = end - start
+    while remaining > 0:
+        block = handle.read(min(READ_BLOCK_BYTES, remaining))
+        if not block:
+            break
+        digest.update(block)
+        remaining -= len(block)
+    return digest.hexdigest()
+
+
+def _line_month(line: bytes) -> str | None:
+    # Ledger rows start with their ISO date; lines that do not are the
+    # continuation of a quoted multi-line field.
+    if len(line) > 10 and line[4:5] == b"-" and line[7:8] == b"-" and line[10:11] == b",":
+        month = line[:7]
+        if month[:4].isdigit() and month[5:7].isdigit():
+            return month.decode("ascii")
+    return None
+
+
+def _column_positions(header: bytes) -> tuple[int, int, int, int]:
+    columns = next(csv.reader([header.decode("utf-8")]))
+    if not columns or columns[0] != "date":
+        raise ValueError("Ledger must start with the date column")
+    missing = [column for column in REPORT_COLUMNS if column not in columns]
+    if missing:
+        raise ValueError(f"Ledger is missing column(s): {', '.join(missing)}")
+    amount, account, category, merchant = (columns.index(column) for column in REPORT_COLUMNS)
+    return amount, account, category, merchant
+
+
+def _aggregate(lines: list[bytes], positions: tuple[int, int, int, int], start: int) -> Buckets:
+    amount_at, account_at, category_at, merchant_at = positions
+    buckets: Buckets = {}
+    reader = csv.reader(line.decode("utf-8") for line in lines)
+    row_line = reader.line_num
+    for row in reader:
+        if not row:
+            row_line = reader.line_num
+            continue
+        try:
+            cents = csv_amount_to_cents(row[amount_at])
+        except (ArithmeticError, ValueError) as error:
+            offset = start + sum(map(len, lines[:row_line]))
+            raise ValueError(
+                f"Bad amount {row[amount_at]!r} in ledger line at byte {offset}"
+            ) from error
+        row_line = reader.line_num
+        key = (row[account_at], row[category_at], row[merchant_at])
+        bucket = buckets.get(key)
+        if bucket is None:
+            buckets[key] = [1, cents, cents, cents]
+        else:
+            bucket[0] += 1
+            bucket[1] += cents
+            if cents < bucket[2]:
+                bucket[2] = cents
+            if cents > bucket[3]:
+                bucket[3] = cents
+    return buckets
+
+
+def _iter_month_chunks(handle, offset: int) -> Iterator[tuple[str, int, int, list[bytes]]]:
+    handle.seek(offset)
+    month = None
+    start = offset
+    lines: list[bytes] = []
+    position = offset
+    for line in handle:
+        line_month = _line_month(line)
+        if line_month is not None and line_month != month:
+            if month is not None:
+                yield month, start, position, lines
+            month, start, lines = line_month, position, []
+        if month is None:
+            raise ValueError(f"Unexpected ledger line at byte {position}")
+        lines.append(line)
+        position += len(line)
+    if month is not None:
+        yield month, start, position, lines
+
+
+def update_rollup(ledger_file: Path, previous: Rollup) -> Rollup:
+    # Months are verified in ledger order by hashing their stored byte range;
+    # the ledger is re-parsed only from the first month that changed, so
+    # appending a month to a date-sorted ledger re-aggregates just that month.
+    with ledger_file.open("rb") as handle:
+        header = handle.readline()
+        positions = _column_positions(header)
+        rollup = Rollup(header_sha256=hashlib.sha256(header).hexdigest())
+
+        offset = len(header)
+        if previous.header_sha256 == rollup.header_sha256:
+            for month, entry in previous.months.items():
+                if entry.start != offset or _hash_range(handle, entry.start, entry.end) != entry.sha256:
+                    break
+                rollup.months[month] = entry
+                offset = entry.end
+            # Rows added to the last reused month sit right after its range.
+            handle.seek(offset)
+            next_month = _line_month(handle.readline())
+            if rollup.months and next_month is not None and next_month in rollup.months:
+                offset = rollup.months.pop(next_month).start
+        rollup.reused_months = len(rollup.months)
+
+        for month, start, end, lines in _iter_month_chunks(handle, offset):
+            if month in rollup.months:
+                raise ValueError(f"{ledger_file} is not sorted by date (month {month} repeats)")
+            digest = hashlib.sha256()
+            for line in lines:
+                digest.update(line)
+            buckets = _aggregate(lines, positions, start)
+            rollup.months[month] = MonthRollup(
+                start=start, end=end, sha256=digest.hexdigest(), buckets=buckets
+            )
+            rollup.scanned_months += 1
+    return rollup
+
+
+def group_rollup(rollup: Rollup, dimensions: Iterable[str]) -> dict[tuple[str, ...], list[int]]:
+    dimensions = tuple(dimensions)
+    for dimension in dimensions:
+        if dimension not in DIMENSIONS:
+            raise ValueError(f"Unknown dimension '{dimension}', expected {', '.join(DIMENSIONS)}")
+    groups: dict[tuple[str, ...], list[int]] = {}
+    for month, entry in rollup.months.items():
+        for (account, category, merchant), (count, total, low, high) in entry.buckets.items():
+            values = {"month": month, "account": account, "category": category, "merchant": merchant}
+            key = tuple(values[dimension] for dimension in dimensions)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [count, total, low, high]
+            else:
+                group[0] += count
+                group[1] += total
+                group[2] = min(group[2], low)
+                group[3] = max(group[3], high)
+    return dict(sorted(groups.items()))
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import sqlite3
+from collections.abc import Iterable, Iterator
+from datetime import date
+from itertools import islice
+from pathlib import Path
+from typing import Any
+
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.models import FINGERPRINT_BYTES, Transaction
+from money_analyzer.table import amount_to_cents, cents_to_amount
+
+
+SCHEMA_VERSION = 2
+INSERT_BATCH_ROWS = 5_000
+BUSY_TIMEOUT_SECONDS = 30.0
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    posted_date TEXT NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    currency TEXT NOT NULL,
+    account_id TEXT NOT NULL,
+    account_name TEXT NOT NULL,
+    transaction_type TEXT NOT NULL,
+    description TEXT NOT NULL,
+    merchant TEXT NOT NULL,
+    category TEXT NOT NULL,
+    source_file TEXT NOT NULL,
+    parser_id TEXT NOT NULL,
+    confidence REAL NOT NULL,
+    fingerprint BLOB NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS transactions_fingerprint ON transactions (fingerprint);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (date);
+CREATE INDEX IF NOT EXISTS transactions_account ON transactions (account_name, date);
+"""
+
+ROW_COLUMNS = (
+    "date",
+    "posted_date",
+    "amount_cents",
+    "currency",
+    "account_id",
+    "account_name",
+    "transaction_type",
+    "description",
+    "merchant",
+    "category",
+    "source_file",
+    "parser_id",
+    "confidence",
+)
+INSERT_SQL = (
+    f"INSERT OR IGNORE INTO transactions ({', '.join(ROW_COLUMNS)}, fingerprint) "
+    f"VALUES ({', '.join('?' for _ in ROW_COLUMNS)}, ?)"
+)
+# Same order as combine's ledger_sort_key: (date, amount, description.lower()).
+ORDER_BY = "ORDER BY date, amount_cents, py_lower(description), id"
+
+
+class SqliteLedgerError(RuntimeError):
+    pass
+
+
+def fingerprint_key(tx: Transaction) -> bytes:
+    return tx.fingerprint().to_bytes(FINGERPRINT_BYTES, "big")
+
+
+def _to_row(tx: Transaction) -> tuple[object, ...]:
+    return (
+        tx.date.isoformat(),
+        tx.posted_date.isoformat() if tx.posted_date else "",
+        amount_to_cents(tx.amount),
+        tx.currency,
+        tx.account_id,
+        tx.account_name,
+        tx.transaction_type,
+        tx.description,
+        tx.merchant,
+        tx.category,
+        tx.source_file,
+        tx.parser_id,
+        tx.confidence,
+        fingerprint_key(tx),
+    )
+
+
+def _from_row(row: tuple[Any, ...]) -> Transaction:
+    (
+        tx_date,
+        posted_date,
+        cents,
+        currency,
+        account_id,
+        account_name,
+        transaction_type,
+        description,
+        merchant,
+        category,
+        source_file,
+        parser_id,
+        confidence,
+    ) = row
+    return Transaction(
+        date=date.fromisoformat(tx_date),
+        posted_date=date.fromisoformat(posted_date) if posted_date else None,
+        amount=cents_to_amount(cents),
+        currency=currency,
+        account_id=account_id,
+        account_name=account_name,
+        transaction_type=transaction_type,
+        description=description,
+        merchant=merchant,
+        category=category,
+        source_file=source_file,
+        parser_id=parser_id,
+        confidence=confidence,
+    )
+
+
+class SqliteLedger:
+    def __init__(self, ledger_file: Path) -> None:
+        self.ledger_file = ledger_file
+        ledger_file.parent.mkdir(parents=True, exist_ok=True)
+        # Autocommit mode; writes open their own transaction per batch.
+        self._connection = sqlite3.connect(
+            ledger_file, timeout=BUSY_TIMEOUT_SECONDS, isolation_level=None
+        )
+        self._connection.create_function("py_lower", 1, str.lower, deterministic=True)
+        try:
+            # WAL lets ingest workers append while readers query the ledger.
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+            version = self._connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise SqliteLedgerError(
+                    f"{ledger_file} has ledger schema {version}, expected {SCHEMA_VERSION}"
+                )
+            self._connection.executescript(SCHEMA)
+            self._connection.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        except sqlite3.DatabaseError as error:
+            self._connection.close()
+            raise SqliteLedgerError(f"{ledger_file} is not a SQLite ledger ({error})") from error
+
+    def __enter__(self) -> "SqliteLedger":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __len__(self) -> int:
+        return self._connection.execute("SELECT count(*) FROM transactions").fetchone()[0]
+
+    def upsert(self, transactions: Iterable[Transaction]) -> int:
+        # Rows whose fingerprint is already stored are skipped by the unique
+        # index, so re-ingesting a statement only writes its new rows.
+        inserted = 0
+        rows = map(_to_row, transactions)
+        while batch := list(islice(rows, INSERT_BATCH_ROWS)):
+            before = self._connection.total_changes
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                self._connection.executemany(INSERT_SQL, batch)
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+            inserted += self._connection.total_changes - before
+        return inserted
+
+    def query(
+        self,
+        start: date | None = None,
+        end: date | None = None,
+        account_name: str | None = None,
+    ) -> Iterator[Transaction]:
+        conditions = []
+        parameters: list[object] = []
+        if start is not None:
+            conditions.append("date >= ?")
+            parameters.append(start.isoformat())
+        if end is not None:
+            conditions.append("date <= ?")
+            parameters.append(end.isoformat())
+        if account_name is not None:
+            conditions.append("account_name = ?")
+            parameters.append(account_name)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        cursor = self._connection.execute(
+            f"SELECT {', '.join(ROW_COLUMNS)} FROM transactions {where}{ORDER_BY}", parameters
+        )
+        for row in cursor:
+            yield _from_row(row)
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        return self.query()
+
+    def export_csv(
+        self,
+        output_file: Path,
+        start: date | None = None,
+        end: date | None = None,
+        account_name: str | None = None,
+    ) -> int:
+        return export_transactions_to_csv(self.query(start, end, account_name), output_file)
@@ -0,0 +1,341 @@
+from __future__ import annotations
+
+import csv
+from array import array
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date
+from decimal import Decimal
+from itertools import islice
+from pathlib import Path
+from typing import TypeVar
+
+from money_analyzer.csv_io import iter_canonical_rows, open_atomic_output, parse_csv_amount
+from money_analyzer.models import CANONICAL_COLUMNS, Transaction, fingerprint_fields
+from money_analyzer.utils import parse_iso_date
+
+
+DICTIONARY_COLUMNS = (
+    "currency",
+    "account_id",
+    "account_name",
+    "transaction_type",
+    "category",
+    "source_file",
+    "parser_id",
+)
+TEXT_COLUMNS = ("description", "merchant")
+CSV_CHUNK_ROWS = 65_536
+
+T = TypeVar("T")
+
+
+class StringDictionary:
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Iterable[str] = ()) -> None:
+        self.values: list[str] = []
+        self.codes: dict[str, int] = {}
+        for value in values:
+            self.encode(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def encode(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+def amount_to_cents(amount: Decimal) -> int:
+    return int(amount.scaleb(2).to_integral_value())
+
+
+def cents_to_amount(cents: int) -> Decimal:
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents: int) -> str:
+    sign = "-" if cents < 0 else ""
+    whole, fraction = divmod(abs(cents), 100)
+    return f"{sign}{whole}.{fraction:02}"
+
+
+def csv_amount_to_cents(value: str) -> int:
+    # "%.2f" strings map straight to integer cents without building a Decimal.
+    whole, dot, fraction = value.rpartition(".")
+    if dot and len(fraction) == 2 and fraction.isdecimal():
+        negative = whole.startswith("-")
+        digits = whole[1:] if negative else whole
+        if digits.isdecimal():
+            cents = int(digits) * 100 + int(fraction)
+            return -cents if negative else cents
+    return amount_to_cents(parse_csv_amount(value))
+
+
+def normalize_text(value: str) -> str:
+    return value.strip().lower()
+
+
+def _iso_ordinal(value: str) -> int:
+    return parse_iso_date(value).toordinal() if value else 0
+
+
+def _csv_confidence(value: str) -> float:
+    return float(value or "1.0")
+
+
+def _distinct_map(function: Callable[[str], T], values: Iterable[str]) -> dict[str, T]:
+    return {value: function(value) for value in set(values)}
+
+
+class TransactionTable:
+    __slots__ = (
+        "dates",
+        "posted_dates",
+        "cents",
+        "confidence",
+        "codes",
+        "dictionaries",
+        "text",
+        "_strings",
+    )
+
+    def __init__(self, dictionaries: dict[str, StringDictionary] | None = None) -> None:
+        self.dates = array("i")
+        self.posted_dates = array("i")
+        self.cents = array("q")
+        self.confidence = array("d")
+        self.codes = {name: array("I") for name in DICTIONARY_COLUMNS}
+        self.dictionaries = dictionaries or {name: StringDictionary() for name in DICTIONARY_COLUMNS}
+        self.text: dict[str, list[str]] = {name: [] for name in TEXT_COLUMNS}
+        # Repeated description/merchant strings share one object per table.
+        self._strings: dict[str, str] = {}
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionTable":
+        table = cls()
+        table.extend(transactions)
+        return table
+
+    @classmethod
+    def from_csv(cls, csv_file: Path) -> "TransactionTable":
+        table = cls()
+        table.extend_from_csv(csv_file)
+        return table
+
+    def append(self, tx: Transaction) -> None:
+        self.dates.append(tx.date.toordinal())
+        self.posted_dates.append(tx.posted_date.toordinal() if tx.posted_date else 0)
+        self.cents.append(amount_to_cents(tx.amount))
+        self.confidence.append(tx.confidence)
+        for name in DICTIONARY_COLUMNS:
+            self.codes[name].append(self.dictionaries[name].encode(getattr(tx, name)))
+        for name in TEXT_COLUMNS:
+            self.text[name].append(self._intern(getattr(tx, name)))
+
+    def extend(self, transactions: Iterable[Transaction]) -> None:
+        for tx in transactions:
+            self.append(tx)
+
+    def extend_from_csv(self, csv_file: Path) -> None:
+        # Rows are transposed in fixed-size chunks, so peak memory is the
+        # table plus one chunk rather than a second copy of the whole file.
+        rows = iter_canonical_rows(csv_file)
+        while chunk := list(islice(rows, CSV_CHUNK_ROWS)):
+            self._extend_from_rows(chunk)
+
+    def _extend_from_rows(self, rows: list[tuple[str, ...]]) -> None:
+        columns = dict(zip(CANONICAL_COLUMNS, zip(*rows)))
+        rows.clear()
+
+        # Each column is converted once per distinct value and then mapped
+        # through a dict lookup, which keeps the per-row work in C.
+        dates = _distinct_map(_iso_ordinal, columns["date"] + columns["posted_date"])
+        self.dates.extend(map(dates.__getitem__, columns["date"]))
+        self.posted_dates.extend(map(dates.__getitem__, columns["posted_date"]))
+        amounts = _distinct_map(csv_amount_to_cents, columns["amount"])
+        self.cents.extend(map(amounts.__getitem__, columns["amount"]))
+        confidence = _distinct_map(_csv_confidence, columns["confidence"])
+        self.confidence.extend(map(confidence.__getitem__, columns["confidence"]))
+        for name in DICTIONARY_COLUMNS:
+            dictionary = self.dictionaries[name]
+            for value in dict.fromkeys(columns[name]):
+                dictionary.encode(value)
+            self.codes[name].extend(map(dictionary.codes.__getitem__, columns[name]))
+        for name in TEXT_COLUMNS:
+            self.text[name].extend(map(self._strings.setdefault, columns[name], columns[name]))
+
+    def _intern(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def column(self, name: str) -> list[str]:
+        if name in DICTIONARY_COLUMNS:
+            values = self.dictionaries[name].values
+            return [values[code] for code in self.codes[name]]
+        if name in TEXT_COLUMNS:
+            return self.text[name]
+        raise KeyError(f"'{name}' is not a string column")
+
+    def transaction(self, index: int) -> Transaction:
+        posted = self.posted_dates[index]
+        fields = {
+            name: self.dictionaries[name].values[self.codes[name][index]]
+            for name in DICTIONARY_COLUMNS
+        }
+        return Transaction(
+            date=date.fromordinal(self.dates[index]),
+            posted_date=date.fromordinal(posted) if posted else None,
+            amount=cents_to_amount(self.cents[index]),
+            description=self.text["description"][index],
+            merchant=self.text["merchant"][index],
+            confidence=self.confidence[index],
+            **fields,
+        )
+
+    def iter_transactions(self) -> Iterator[Transaction]:
+        for index in range(len(self)):
+            yield self.transaction(index)
+
+    def to_transactions(self) -> list[Transaction]:
+        return list(self.iter_transactions())
+
+    def take(self, indexes: Iterable[int]) -> "TransactionTable":
+        indexes = list(indexes)
+        table = TransactionTable(self.dictionaries)
+        table._strings = self._strings
+        for source, target in (
+            (self.dates, table.dates),
+            (self.posted_dates, table.posted_dates),
+            (self.cents, table.cents),
+            (self.confidence, table.confidence),
+        ):
+            target.extend(map(source.__getitem__, indexes))
+        for name in DICTIONARY_COLUMNS:
+            table.codes[name].extend(map(self.codes[name].__getitem__, indexes))
+        for name in TEXT_COLUMNS:
+            table.text[name] = list(map(self.text[name].__getitem__, indexes))
+        return table
+
+    def filter(self, mask: Sequence[bool]) -> "TransactionTable":
+        return self.take(index for index, keep in enumerate(mask) if keep)
+
+    def mask_date_range(self, start: date | None = None, end: date | None = None) -> list[bool]:
+        low = start.toordinal() if start else 0
+        high = end.toordinal() if end else date.max.toordinal()
+        return [low <= value <= high for value in self.dates]
+
+    def mask_equals(self, name: str, value: str) -> list[bool]:
+        code = self.dictionaries[name].codes.get(value)
+        return [item == code for item in self.codes[name]]
+
+    def sort_indexes(self) -> list[int]:
+        # Same order as sorting Transactions by (date, amount, description.lower()).
+        lowered = _map_distinct(str.lower, self.text["description"])
+        keys = list(zip(self.dates, self.cents, lowered))
+        return sorted(range(len(self)), key=keys.__getitem__)
+
+    def sorted(self) -> "TransactionTable":
+        return self.take(self.sort_indexes())
+
+    def fingerprints(self) -> list[int]:
+        # Transaction.fingerprint() of every row. Each distinct date, amount
+        # and text is formatted once; a row only joins and hashes them.
+        iso_dates = {ordinal: date.fromordinal(ordinal).isoformat() for ordinal in set(self.dates)}
+        amounts = {cents: format_cents(cents) for cents in set(self.cents)}
+        currency, account_id, account_name = (
+            self.dictionaries[name].values for name in ("currency", "account_id", "account_name")
+        )
+        rows = zip(
+            map(iso_dates.__getitem__, self.dates),
+            map(amounts.__getitem__, self.cents),
+            map(currency.__getitem__, self.codes["currency"]),
+            map(account_id.__getitem__, self.codes["account_id"]),
+            map(account_name.__getitem__, self.codes["account_name"]),
+            _map_distinct(normalize_text, self.text["description"]),
+            _map_distinct(normalize_text, self.text["merchant"]),
+        )
+        return list(map(fingerprint_fields, rows))
+
+    def unique_indexes(self) -> list[int]:
+        seen: set[int] = set()
+        keep: list[int] = []
+        for index, fingerprint in enumerate(self.fingerprints()):
+            if fingerprint not in seen:
+                seen.add(fingerprint)
+                keep.append(index)
+        return keep
+
+    def deduplicated(self) -> "TransactionTable":
+        return self.take(self.unique_indexes())
+
+    def iter_csv_rows(self) -> Iterator[list[str]]:
+        iso_dates: dict[int, str] = {0: ""}
+
+        def isoformat(ordinal: int) -> str:
+            try:
+                return iso_dates[ordinal]
+            except KeyError:
+                formatted = iso_dates[ordinal] = date.fromordinal(ordinal).isoformat()
+                return formatted
+
+        values = {name: self.dictionaries[name].values for name in DICTIONARY_COLUMNS}
+        columns = zip(
+            self.dates,
+            self.posted_dates,
+            self.cents,
+            *(self.codes[name] for name in DICTIONARY_COLUMNS),
+            self.text["description"],
+            self.text["merchant"],
+            self.confidence,
+        )
+        currency, account_id, account_name, transaction_type, category, source_file, parser_id = (
+            values[name] for name in DICTIONARY_COLUMNS
+        )
+        for (
+            tx_date,
+            posted,
+            cents,
+            c_currency,
+            c_account_id,
+            c_account_name,
+            c_type,
+            c_category,
+            c_source,
+            c_parser,
+            description,
+            merchant,
+            confidence,
+        ) in columns:
+            yield [
+                isoformat(tx_date),
+                isoformat(posted),
+                format_cents(cents),
+                currency[c_currency],
+                account_id[c_account_id],
+                account_name[c_account_name],
+                transaction_type[c_type],
+                description,
+                merchant,
+                category[c_category],
+                source_file[c_source],
+                parser_id[c_parser],
+                f"{confidence:.2f}",
+            ]
+
+
+def _map_distinct(function: Callable[[str], object], values: list[str]) -> list[object]:
+    return list(map(_distinct_map(function, values).__getitem__, values))
+
+
+def export_table_to_csv(table: TransactionTable, output_file: Path) -> int:
+    with open_atomic_output(output_file) as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CANONICAL_COLUMNS)
+        writer.writerows(table.iter_csv_rows())
+    return len(table)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from collections.abc import Iterable, Iterator
 from datetime import date, datetime
 from decimal import Decimal
 
@@ -27,3 +28,11 @@ def parse_amount(value: str) -> Decimal:
     elif "," in raw:
         raw = raw.replace(",", ".")
     return Decimal(raw)
+
+
+def iter_non_empty_lines(chunks: Iterable[str]) -> Iterator[str]:
+    for chunk in chunks:
+        for line in chunk.splitlines():
+            line = line.strip()
+            if line:
+                yield line
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from time import monotonic
+
+
+DEFAULT_POLL_INTERVAL = 0.2
+DEFAULT_SETTLE_SECONDS = 0.3
+
+
+@dataclass(slots=True)
+class FileSignature:
+    size: int
+    mtime_ns: int
+
+
+@dataclass(slots=True)
+class PendingFile:
+    signature: FileSignature
+    changed_at: float
+
+
+class FolderWatcher:
+    # A file is reported once its size and mtime have stayed the same for
+    # settle_seconds, so statements still being copied into the folder are
+    # not picked up half written.
+    def __init__(
+        self,
+        watch_dir: Path,
+        settle_seconds: float = DEFAULT_SETTLE_SECONDS,
+        pattern: str = "*.pdf",
+        is_current: Callable[[Path, FileSignature], bool] | None = None,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        self.watch_dir = watch_dir
+        self.settle_seconds = settle_seconds
+        self.pattern = pattern
+        self.clock = clock
+        self._seen: dict[Path, FileSignature] = {}
+        self._pending: dict[Path, PendingFile] = {}
+        if is_current is not None:
+            # Files that are already processed are remembered as seen, so only
+            # later changes to them are reported.
+            for path, signature in self._scan().items():
+                if is_current(path, signature):
+                    self._seen[path] = signature
+
+    def _scan(self) -> dict[Path, FileSignature]:
+        signatures = {}
+        for path in sorted(self.watch_dir.glob(self.pattern)):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if path.is_file():
+                signatures[path] = FileSignature(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+        return signatures
+
+    def poll(self) -> list[Path]:
+        now = self.clock()
+        current = self._scan()
+        for path in list(self._pending):
+            if path not in current:
+                del self._pending[path]
+        for path in list(self._seen):
+            if path not in current:
+                del self._seen[path]
+
+        ready = []
+        for path, signature in current.items():
+            if self._seen.get(path) == signature:
+                continue
+            pending = self._pending.get(path)
+            if pending is None or pending.signature != signature:
+                self._pending[path] = PendingFile(signature=signature, changed_at=now)
+                if self.settle_seconds > 0:
+                    continue
+            elif now - pending.changed_at < self.settle_seconds:
+                continue
+            del self._pending[path]
+            self._seen[path] = signature
+            ready.append(path)
+        return ready
+
+    def retry(self, path: Path) -> None:
+        # Reported again once it has settled, even though it did not change.
+        self._seen.pop(path, None)
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import random
+import re
+import time
+from collections.abc import Callable, Iterator
+
+from money_analyzer.parsing.normalize import StatementNormalizer
+from money_analyzer.parsing.parsers.c24 import C24Parser
+from money_analyzer.parsing.parsers.common import parse_transaction_line
+from money_analyzer.parsing.parsers.vivid import VividParser
+from money_analyzer.parsing.spec import SpecParser
+
+
+NOISE_LINES = (
+    "Kontoauszug Seite 1 von 12",
+    "Buchungstag Wertstellung Verwendungszweck Betrag",
+    "IBAN DE12 3456 7890 1234 5678 90",
+    "Alter Kontostand 1.234,56 EUR",
+    "Statement period 01.01.2024 - 31.01.2024",
+)
+MERCHANTS = ("REWE Markt", "Amazon Marketplace", "Lidl Dienstleistung", "Deutsche Bahn", "Miete")
+
+
+def synthetic_lines(count: int, seed: int = 7) -> list[str]:
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        if rng.random() < 0.3:
+            lines.append(rng.choice(NOISE_LINES))
+            continue
+        day = f"{rng.randint(1, 28):02}.{rng.randint(1, 12):02}.2024"
+        amount = f"{rng.choice('-+')}{rng.randint(1, 2000)},{rng.randint(0, 99):02}"
+        lines.append(f"{day} {rng.choice(MERCHANTS)} {rng.randint(1000, 9999)} {amount} EUR")
+    return lines
+
+
+def handwritten(parser: SpecParser) -> Callable[[list[str]], Iterator[object]]:
+    # The per-line regex loop C24Parser and VividParser used before specs.
+    pattern = re.compile(parser.spec.line_grammars[0].pattern)
+
+    def parse(lines: list[str]) -> Iterator[object]:
+        normalizer = StatementNormalizer()
+        for line in lines:
+            tx = parse_transaction_line(
+                line,
+                pattern=pattern,
+                account_name=parser.bank_name,
+                source_file="bench.pdf",
+                parser_id=parser.parser_id,
+                normalizer=normalizer,
+            )
+            if tx:
+                yield tx
+
+    return parse
+
+
+def best_of(repeat: int, *functions: Callable[[], int]) -> list[tuple[float, int]]:
+    # Runs are interleaved so machine noise hits every contender alike.
+    timings = [[] for _ in functions]
+    rows = [0 for _ in functions]
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            for index, function in enumerate(functions):
+                started = time.perf_counter()
+                rows[index] = function()
+                timings[index].append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+    return [(min(seconds), count) for seconds, count in zip(timings, rows)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare spec-compiled and hand-written statement line parsing."
+    )
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    lines = synthetic_lines(args.lines)
+    for statement_parser in (C24Parser(), VividParser()):
+        old = handwritten(statement_parser)
+        assert list(old(lines)) == list(statement_parser.iter_line_transactions(lines, "bench.pdf"))
+        (old_seconds, _), (new_seconds, rows) = best_of(
+            args.repeat,
+            lambda: sum(1 for _ in old(lines)),
+            lambda: sum(1 for _ in statement_parser.iter_line_transactions(lines, "bench.pdf")),
+        )
+        print(
+            f"{statement_parser.parser_id:6} rows={rows} "
+            f"handwritten={len(lines) / old_seconds:,.0f} lines/s "
+            f"spec={len(lines) / new_seconds:,.0f} lines/s "
+            f"({old_seconds / new_seconds:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import gc
+import hashlib
+import random
+import time
+
+from money_analyzer.parsing.parsers.n26 import N26Parser
+
+
+MERCHANTS = (
+    "NORTH STAR SUPERMARKET",
+    "BLUE RIVER ELECTRIC",
+    "From Rainy Day Space",
+    "Café Zürich",
+    "DB Fernverkehr",
+    "Rückerstattung Online Shop",
+)
+DETAIL_LINES = (
+    "Mastercard - Groceries",
+    "Lastschriften",
+    "Gutschriften",
+    "IBAN: DE00888877776666555544 - BIC: TESTDEFFXXX",
+    "Abo Januar 2026",
+    "Anmerkung",
+    "Space: Rainy Day",
+)
+PAGE_HEADER = (
+    "Vorläufiger Kontoauszug",
+    "ALEX EXAMPLE",
+    "IBAN: DE00999900001111222233 - BIC: NTSBDEB1XXX",
+    "Erstellt am",
+    "26.01.2026",
+    "01.01.2026 bis 31.01.2026",
+    "Beschreibung Verbuchungsdatum Betrag",
+)
+
+
+def synthetic_statement(bookings: int, seed: int = 26, per_page: int = 12) -> list[str]:
+    rng = random.Random(seed)
+    pages = -(-bookings // per_page)
+    lines: list[str] = []
+    for index in range(bookings):
+        if index % per_page == 0:
+            lines.append(f"{index // per_page + 1} / {pages}")
+            lines.extend(PAGE_HEADER)
+        day = f"{rng.randint(1, 28):02}.01.2026"
+        euros = f"{rng.randint(1, 4000):,}".replace(",", ".")
+        amount = f"{rng.choice('-+')}{euros},{rng.randint(0, 99):02}"
+        if rng.random() < 0.15:
+            lines.append(f"{day} {rng.choice(MERCHANTS)} {amount} EUR")
+            continue
+        if rng.random() > 0.05:
+            lines.append(rng.choice(MERCHANTS))
+        lines.extend(rng.sample(DETAIL_LINES, rng.randint(0, 3)))
+        if rng.random() < 0.8:
+            lines.append(f"Wertstellung {day}")
+        lines.append(f"{day} {amount}{rng.choice(('€', ' EUR', ''))}")
+    return lines
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Time N26 parsing of a synthetic multi-line statement.")
+    parser.add_argument("--bookings", type=int, default=5_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    lines = synthetic_statement(args.bookings)
+    n26 = N26Parser()
+    timings = []
+    gc.disable()
+    try:
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            transactions = list(n26.iter_line_transactions(lines, "bench.pdf"))
+            timings.append(time.perf_counter() - started)
+    finally:
+        gc.enable()
+
+    # The digest lets runs on different revisions confirm identical output.
+    digest = hashlib.sha256()
+    for tx in transactions:
+        digest.update(repr(sorted(tx.to_csv_row().items())).encode("utf-8"))
+    best = min(timings)
+    print(
+        f"lines={len(lines)} transactions={len(transactions)} best={best * 1000:.1f} ms "
+        f"({len(lines) / best:,.0f} lines/s) digest={digest.hexdigest()[:16]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
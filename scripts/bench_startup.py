@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Each step runs in a fresh interpreter after registering the synthetic banks.
+STEPS = {
+    "combine --help": (
+        "import contextlib, io\n"
+        "sys.argv = ['money-combine', '--help']\n"
+        "from money_analyzer.cli.combine_csv import main\n"
+        "with contextlib.redirect_stdout(io.StringIO()), contextlib.suppress(SystemExit):\n"
+        "    main()\n"
+    ),
+    "import ingest": "import money_analyzer.cli.ingest_pdf\n",
+    "ParserRouter()": (
+        "from money_analyzer.parsing.router import ParserRouter\n"
+        "router = ParserRouter()\n"
+    ),
+    "load parsers": (
+        "from money_analyzer.parsing.router import ParserRouter\n"
+        "router = ParserRouter()\n"
+        "router.parsers\n"
+    ),
+}
+
+PROLOGUE = """\
+import json, sys, time
+started = time.perf_counter()
+sys.path.insert(0, {module_dir!r})
+from money_analyzer.parsing.registry import register_parser
+for index in range({parsers}):
+    register_parser(f"bench{{index}}", f"bench_bank_{{index}}:Parser")
+"""
+
+EPILOGUE = """\
+print(json.dumps({
+    "ms": (time.perf_counter() - started) * 1000,
+    "pypdf": "pypdf" in sys.modules,
+    "parser_modules": sum(name.startswith(("bench_bank_", "money_analyzer.parsing.parsers."))
+                          for name in sys.modules),
+}))
+"""
+
+PARSER_MODULE = """\
+from money_analyzer.parsing.spec import DATE_TOKEN, LineGrammar, ParserSpec, SpecParser
+
+
+class Parser(SpecParser):
+    spec = ParserSpec(
+        parser_id="bench{index}",
+        bank_name="Bench Bank {index}",
+        detection_keywords=("bench bank {index}",),
+        prefilter="date",
+        line_grammars=(
+            LineGrammar(
+                rf"^(?P<date>{{DATE_TOKEN}})\\s+(?P<description>.+?)\\s+"
+                r"(?P<amount>[+-]?\\d[\\d.,]*)\\s*(?P<currency>EUR|€)?$"
+            ),
+        ),
+    )
+"""
+
+
+def write_parser_modules(module_dir: Path, count: int) -> None:
+    for index in range(count):
+        (module_dir / f"bench_bank_{index}.py").write_text(
+            PARSER_MODULE.format(index=index), encoding="utf-8"
+        )
+
+
+def run_step(code: str, module_dir: Path, parsers: int) -> dict[str, object]:
+    script = PROLOGUE.format(module_dir=str(module_dir), parsers=parsers) + code + EPILOGUE
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def measure(step: str, module_dir: Path, parsers: int, repeat: int) -> dict[str, object]:
+    runs = [run_step(STEPS[step], module_dir, parsers) for _ in range(repeat)]
+    return {**runs[-1], "ms": statistics.median(run["ms"] for run in runs)}
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time CLI start-up with the built-in banks and with many extra registered banks."
+    )
+    parser.add_argument("--extra-parsers", type=int, default=50, help="Synthetic banks to register.")
+    parser.add_argument("--repeat", type=int, default=5, help="Interpreter runs per step; the median is kept.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        module_dir = Path(tmp_dir)
+        write_parser_modules(module_dir, args.extra_parsers)
+        # Warm the bytecode cache of the generated modules once.
+        run_step(STEPS["load parsers"], module_dir, args.extra_parsers)
+
+        print(
+            f"{'step':16} {'builtin ms':>11} {f'+{args.extra_parsers} ms':>11} "
+            f"{'modules':>9} {'pypdf':>6}"
+        )
+        for step in STEPS:
+            base = measure(step, module_dir, 0, args.repeat)
+            extra = measure(step, module_dir, args.extra_parsers, args.repeat)
+            print(
+                f"{step:16} {base['ms']:11.1f} {extra['ms']:11.1f} "
+                f"{extra['parser_modules']:>9} {'yes' if extra['pypdf'] else 'no':>6}"
+            )
+
+
+if __name__ == "__main__":
+    main()
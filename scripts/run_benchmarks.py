@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import TypeVar
+
+from money_analyzer.cli.combine_csv import combine_csv_files
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.parsing.pdf_text import extract_text_from_pdf
+from money_analyzer.parsing.router import ParserRouter
+
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "tests" / "fixtures"))
+
+from generate_statement_pdf_fixtures import STATEMENT_GENERATORS, build_statement_pdf  # noqa: E402
+
+
+STAGES = ("extract", "route", "parse", "export", "combine")
+DEFAULT_THRESHOLD = 0.25
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class StageResult:
+    seconds: float
+    rows: int
+    peak_bytes: int
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+
+def measure(function: Callable[[], T], rows: int, repeat: int) -> tuple[StageResult, T]:
+    # Timed runs and the tracemalloc run are separate: tracing slows every
+    # allocation and would skew the timings.
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(seconds=min(timings), rows=rows, peak_bytes=peak), result
+
+
+def run_benchmarks(bookings: int, repeat: int, work_dir: Path) -> dict[str, StageResult]:
+    pdf_files = {}
+    for bank in STATEMENT_GENERATORS:
+        pdf_files[bank] = work_dir / f"{bank}_{bookings}.pdf"
+        pdf_files[bank].write_bytes(build_statement_pdf(bank, bookings))
+    csv_files = {bank: work_dir / f"{bank}_{bookings}.csv" for bank in pdf_files}
+    rows = bookings * len(pdf_files)
+    router = ParserRouter()
+    results: dict[str, StageResult] = {}
+
+    results["extract"], texts = measure(
+        lambda: {bank: extract_text_from_pdf(pdf) for bank, pdf in pdf_files.items()}, rows, repeat
+    )
+    results["route"], parsers = measure(
+        lambda: {bank: router.route(texts[bank], pdf.name) for bank, pdf in pdf_files.items()},
+        rows,
+        repeat,
+    )
+    results["parse"], parsed = measure(
+        lambda: {
+            bank: parsers[bank].parse_text(texts[bank], pdf.name).transactions
+            for bank, pdf in pdf_files.items()
+        },
+        rows,
+        repeat,
+    )
+    parsed_rows = sum(len(transactions) for transactions in parsed.values())
+    if parsed_rows != rows:
+        raise RuntimeError(f"Parsed {parsed_rows} transactions, generated {rows}")
+    results["export"], _ = measure(
+        lambda: sum(export_transactions_to_csv(parsed[bank], csv_files[bank]) for bank in parsed),
+        rows,
+        repeat,
+    )
+    results["combine"], _ = measure(lambda: combine_csv_files(list(csv_files.values())), rows, repeat)
+    return results
+
+
+def to_json(bookings: int, results: dict[str, StageResult]) -> dict[str, object]:
+    return {
+        "bookings": bookings,
+        "python": platform.python_version(),
+        "stages": {
+            stage: {**asdict(result), "rows_per_second": result.rows_per_second}
+            for stage, result in results.items()
+        },
+    }
+
+
+def find_regressions(
+    results: dict[str, StageResult], baseline: dict[str, object], threshold: float
+) -> list[str]:
+    regressions = []
+    stages = baseline["stages"]
+    assert isinstance(stages, dict)
+    for stage, result in results.items():
+        if stage not in stages:
+            continue
+        previous = stages[stage]
+        if result.rows_per_second * (1 + threshold) < previous["rows_per_second"]:
+            regressions.append(
+                f"{stage}: {result.rows_per_second:,.0f} rows/s vs baseline "
+                f"{previous['rows_per_second']:,.0f} rows/s"
+            )
+        if result.peak_bytes > previous["peak_bytes"] * (1 + threshold):
+            regressions.append(
+                f"{stage}: peak {result.peak_bytes / 1e6:.1f} MB vs baseline "
+                f"{previous['peak_bytes'] / 1e6:.1f} MB"
+            )
+    return regressions
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Time each ingestion stage on generated N26, C24 and Vivid statements."
+    )
+    parser.add_argument("--bookings", type=int, default=2_000, help="Bookings per generated statement.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per stage; the best is kept.")
+    parser.add_argument("--work-dir", type=Path, help="Keep generated PDFs and CSVs here.")
+    parser.add_argument("--save-baseline", type=Path, help="Write the results as a baseline JSON file.")
+    parser.add_argument("--baseline", type=Path, help="Compare against a baseline JSON file.")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        help="Allowed slowdown or memory growth relative to the baseline (0.25 = 25%%).",
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if args.work_dir:
+        args.work_dir.mkdir(parents=True, exist_ok=True)
+        results = run_benchmarks(args.bookings, args.repeat, args.work_dir)
+    else:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            results = run_benchmarks(args.bookings, args.repeat, Path(tmp_dir))
+
+    print(f"{'stage':8} {'seconds':>9} {'rows/s':>12} {'peak MB':>9}")
+    for stage in STAGES:
+        result = results[stage]
+        print(
+            f"{stage:8} {result.seconds:9.3f} {result.rows_per_second:12,.0f} "
+            f"{result.peak_bytes / 1e6:9.1f}"
+        )
+
+    if args.save_baseline:
+        args.save_baseline.write_text(
+            json.dumps(to_json(args.bookings, results), indent=2) + "\n", encoding="utf-8"
+        )
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        if baseline.get("bookings") != args.bookings:
+            print(f"WARN baseline was recorded with {baseline.get('bookings')} bookings per statement")
+        regressions = find_regressions(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
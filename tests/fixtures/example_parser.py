@@ -0,0 +1,19 @@
+from __future__ import annotations
+
+from money_analyzer.parsing.spec import DATE_TOKEN, LineGrammar, ParserSpec, SpecParser
+
+
+EXAMPLE_SPEC = ParserSpec(
+    parser_id="example",
+    bank_name="Example Bank",
+    detection_keywords=("example bank",),
+    line_grammars=(
+        LineGrammar(
+            rf"^(?P<date>{DATE_TOKEN})\s+(?P<description>.+?)\s+(?P<amount>[+-]?\d[\d.,]*)$"
+        ),
+    ),
+)
+
+
+class ExampleParser(SpecParser):
+    spec = EXAMPLE_SPEC
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import argparse
+import random
+from datetime import date, timedelta
 from pathlib import Path
 
 
@@ -7,22 +10,37 @@ def _escape_pdf_text(value: str) -> str:
     return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
 
 
-def _build_pdf_with_text_lines(lines: list[str]) -> bytes:
+def _page_content(lines: list[str]) -> bytes:
     content_parts = ["BT", "/F1 12 Tf", "36 780 Td"]
     for index, line in enumerate(lines):
         if index > 0:
             content_parts.append("0 -16 Td")
         content_parts.append(f"({_escape_pdf_text(line)}) Tj")
     content_parts.append("ET")
-    stream = ("\n".join(content_parts) + "\n").encode("latin-1")
+    return ("\n".join(content_parts) + "\n").encode("latin-1")
+
 
+def _build_pdf_with_pages(pages: list[list[str]]) -> bytes:
+    # Objects: catalog, page tree, then a page and its content stream per
+    # page, then the shared font.
+    font_ref = 3 + 2 * len(pages)
+    kids = " ".join(f"{3 + 2 * index} 0 R" for index in range(len(pages)))
     objects = [
         b"<< /Type /Catalog /Pages 2 0 R >>",
-        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
-        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Resources << /Font << /F1 5 0 R >> >> /Contents 4 0 R >>",
-        b"<< /Length " + str(len(stream)).encode("ascii") + b" >>\nstream\n" + stream + b"endstream",
-        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>".encode("ascii"),
     ]
+    for index, lines in enumerate(pages):
+        stream = _page_content(lines)
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                f"/Resources << /Font << /F1 {font_ref} 0 R >> >> /Contents {4 + 2 * index} 0 R >>"
+            ).encode("ascii")
+        )
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode("ascii") + b" >>\nstream\n" + stream + b"endstream"
+        )
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
 
     pdf = bytearray(b"%PDF-1.4\n")
     offsets = [0]
@@ -46,6 +64,91 @@ def _build_pdf_with_text_lines(lines: list[str]) -> bytes:
     return bytes(pdf)
 
 
+def _build_pdf_with_text_lines(lines: list[str]) -> bytes:
+    return _build_pdf_with_pages([lines])
+
+
+LINES_PER_PAGE = 45
+MERCHANTS = (
+    "NORTH STAR SUPERMARKET",
+    "BLUE RIVER ELECTRIC",
+    "CITY TRANSIT MONTHLY",
+    "CORNER BAKERY",
+    "ONLINE BOOKSHOP",
+    "Salary Example GmbH",
+    "From Rainy Day Space",
+)
+
+
+def _random_booking(rng: random.Random, start: date) -> tuple[str, str, str]:
+    booked = start + timedelta(days=rng.randrange(365))
+    euros = f"{rng.randint(1, 3000):,}".replace(",", ".")
+    amount = f"{rng.choice(('-', '-', '+'))}{euros},{rng.randint(0, 99):02}"
+    return booked.strftime("%d.%m.%Y"), f"{rng.choice(MERCHANTS)} {rng.randint(1000, 9999)}", amount
+
+
+def _paginate(header: list[str], bodies: list[list[str]]) -> list[list[str]]:
+    # Bookings never straddle a page, like real statements; every page
+    # repeats the header.
+    pages: list[list[str]] = []
+    page = list(header)
+    for body in bodies:
+        if len(page) + len(body) > LINES_PER_PAGE and len(page) > len(header):
+            pages.append(page)
+            page = list(header)
+        page.extend(body)
+    pages.append(page)
+    return [[*page, f"{number} / {len(pages)}"] for number, page in enumerate(pages, start=1)]
+
+
+def n26_statement_pages(bookings: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(bookings):
+        booked, description, amount = _random_booking(rng, date(2025, 1, 1))
+        body = [description]
+        if rng.random() < 0.5:
+            body.append(rng.choice(("Mastercard - Groceries", "Lastschriften", "Gutschriften")))
+        body.extend([f"Wertstellung {booked}", f"{booked} {amount} EUR"])
+        bodies.append(body)
+    header = [
+        "Vorlaeufiger Kontoauszug",
+        "IBAN: DE00999900001111222233 - BIC: NTSBDEB1XXX",
+        "01.01.2025 bis 31.12.2025",
+        "Beschreibung Verbuchungsdatum Betrag",
+    ]
+    return _paginate(header, bodies)
+
+
+def c24_statement_pages(bookings: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(bookings):
+        booked, description, amount = _random_booking(rng, date(2025, 1, 1))
+        bodies.append([f"{booked} {booked} {description} {amount} EUR"])
+    return _paginate(["C24 Bank Kontoauszug", "Buchungstag Wertstellung Vorgang Betrag"], bodies)
+
+
+def vivid_statement_pages(bookings: int, seed: int = 0) -> list[list[str]]:
+    rng = random.Random(seed)
+    bodies = []
+    for _ in range(bookings):
+        booked, description, amount = _random_booking(rng, date(2025, 1, 1))
+        bodies.append([f"{booked} {description} {amount} EUR"])
+    return _paginate(["Vivid Money Statement", "Date Description Amount"], bodies)
+
+
+STATEMENT_GENERATORS = {
+    "n26": n26_statement_pages,
+    "c24": c24_statement_pages,
+    "vivid": vivid_statement_pages,
+}
+
+
+def build_statement_pdf(bank: str, bookings: int, seed: int = 0) -> bytes:
+    return _build_pdf_with_pages(STATEMENT_GENERATORS[bank](bookings, seed))
+
+
 def generate_fixtures(output_dir: Path) -> None:
     fixtures: dict[str, list[str]] = {
         "n26_synthetic_statement.pdf": [
@@ -85,5 +188,27 @@ def generate_fixtures(output_dir: Path) -> None:
         (output_dir / filename).write_bytes(_build_pdf_with_text_lines(lines))
 
 
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generate synthetic statement PDF fixtures.")
+    parser.add_argument(
+        "--large",
+        type=int,
+        metavar="BOOKINGS",
+        help="Write multi-page N26, C24 and Vivid statements with this many bookings each.",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", type=Path, default=Path(__file__).parent / "statements_pdf")
+    args = parser.parse_args()
+
+    if args.large is None:
+        generate_fixtures(args.out_dir)
+        return
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    for bank in STATEMENT_GENERATORS:
+        output = args.out_dir / f"{bank}_large_{args.large}.pdf"
+        output.write_bytes(build_statement_pdf(bank, args.large, args.seed))
+        print(output)
+
+
 if __name__ == "__main__":
-    generate_fixtures(Path(__file__).parent / "statements_pdf")
+    main()
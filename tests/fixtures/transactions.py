@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from money_analyzer.models import Transaction
+
+
+def make_tx(
+    day: int,
+    amount: str,
+    description: str,
+    account_name: str = "N26",
+    month: int = 1,
+    **fields: Any,
+) -> Transaction:
+    # A synthetic EUR booking in 2026. merchant and parser_id follow the
+    # description and account unless fields overrides them.
+    values: dict[str, Any] = {
+        "merchant": description,
+        "parser_id": account_name.lower(),
+        **fields,
+    }
+    return Transaction(
+        date=date(2026, month, day),
+        amount=Decimal(amount),
+        currency="EUR",
+        account_name=account_name,
+        description=description,
+        **values,
+    )
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.categorize import (
+    CategorizeReport,
+    Categorizer,
+    CategoryRule,
+    load_category_rules,
+)
+from money_analyzer.table import TransactionTable
+from tests.fixtures.transactions import make_tx
+
+
+RULES = [
+    CategoryRule("exact", "Rewe", "groceries-exact"),
+    CategoryRule("prefix", "REWE", "groceries"),
+    CategoryRule("prefix", "rewe to go", "snacks"),
+    CategoryRule("substring", "bakery", "bakery"),
+    CategoryRule("substring", "bake", "baking"),
+    CategoryRule("regex", r"db\s+(fern|regio)", "travel"),
+    CategoryRule("regex", r"^amzn|amazon", "shopping"),
+]
+
+
+@pytest.mark.parametrize(
+    ("merchant", "category"),
+    [
+        (" rewe ", "groceries-exact"),
+        ("REWE Markt 123", "groceries"),
+        ("Rewe   To Go Hbf", "snacks"),
+        ("Corner Bakery Berlin", "bakery"),
+        ("Bake House", "baking"),
+        ("DB Fernverkehr AG", "travel"),
+        ("AMZN Mktp DE", "shopping"),
+        ("Unknown Shop", ""),
+    ],
+)
+def test_categorizer_applies_rule_kinds_in_priority_order(merchant: str, category: str) -> None:
+    assert Categorizer(RULES).classify(merchant) == category
+
+
+def test_stream_and_table_categorization_agree_and_report_cache_hits() -> None:
+    merchants = ["REWE Markt 1", "Corner Bakery", "rewe markt 1", "Unknown", "REWE Markt 1"]
+    categorizer = Categorizer(RULES, cache_size=16)
+    report = CategorizeReport()
+
+    transactions = [make_tx(1, "-1.00", merchant) for merchant in merchants]
+    transactions.append(make_tx(1, "-1.00", "Rewe", category="rent"))
+    streamed = list(categorizer.iter_categorized(transactions, report))
+
+    assert [tx.category for tx in streamed] == [
+        "groceries",
+        "bakery",
+        "groceries",
+        "",
+        "groceries",
+        "rent",
+    ]
+    assert (report.rows, report.matched) == (5, 4)
+    assert (report.cache_hits, report.cache_misses) == (2, 3)
+
+    table = TransactionTable.from_transactions(
+        make_tx(1, "-1.00", merchant) for merchant in merchants
+    )
+    table_report = CategorizeReport()
+    Categorizer(RULES).categorize_table(table, table_report)
+    assert table.column("category") == [tx.category for tx in streamed[:-1]]
+    assert table_report.hit_rate == pytest.approx(2 / 5)
+
+
+def test_load_category_rules_rejects_unknown_match(tmp_path: Path) -> None:
+    rules_file = tmp_path / "rules.csv"
+    rules_file.write_text(
+        "match,pattern,category\nprefix,REWE,groceries\nfuzzy,rewe,groceries\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match="rules.csv:3: unknown match 'fuzzy'"):
+        load_category_rules(rules_file)
+
+
+def test_regex_rules_that_cannot_share_an_alternation_match_one_by_one() -> None:
+    categorizer = Categorizer(
+        [
+            CategoryRule("regex", "(?i)rewe", "groceries"),
+            CategoryRule("regex", r"(\w)\1x", "doubled"),
+            CategoryRule("regex", "shop", "shopping"),
+        ]
+    )
+
+    assert categorizer.regex_pattern is None
+    assert categorizer.classify("My REWE shop") == "groceries"
+    assert categorizer.classify("aax shop") == "doubled"
+    assert categorizer.classify("shop aax") == "shopping"
+
+
+def test_load_category_rules_reports_invalid_regex_line(tmp_path: Path) -> None:
+    rules_file = tmp_path / "rules.csv"
+    rules_file.write_text(
+        "match,pattern,category\nexact,rewe,groceries\nregex,(unclosed,broken\n",
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match=r"rules\.csv:3: invalid regex '\(unclosed'"):
+        load_category_rules(rules_file)
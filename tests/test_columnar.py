@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import csv
+from decimal import Decimal
+from pathlib import Path
+
+from money_analyzer.columnar import ColumnarLedger, columnar_to_csv, csv_to_columnar
+
+
+EXPECTED_DIR = Path(__file__).parent / "fixtures" / "expected"
+
+
+def read_rows(csv_file: Path) -> list[dict[str, str]]:
+    with csv_file.open("r", encoding="utf-8", newline="") as handle:
+        return list(csv.DictReader(handle))
+
+
+def test_columnar_ledger_round_trips_canonical_csv(tmp_path: Path) -> None:
+    for name in ("n26_sample.csv", "c24_sample.csv", "vivid_sample.csv"):
+        ledger_file = tmp_path / f"{name}.mcol"
+        csv_file = tmp_path / name
+
+        rows = csv_to_columnar(EXPECTED_DIR / name, ledger_file)
+        columnar_to_csv(ledger_file, csv_file)
+
+        assert rows == 2
+        assert read_rows(csv_file) == read_rows(EXPECTED_DIR / name)
+
+
+def test_columnar_ledger_reads_single_columns(tmp_path: Path) -> None:
+    ledger_file = tmp_path / "c24.mcol"
+    csv_to_columnar(EXPECTED_DIR / "c24_sample.csv", ledger_file)
+
+    with ColumnarLedger(ledger_file) as ledger:
+        assert ledger.rows == 2
+        assert list(ledger.raw("amount")) == [-5520, 10000]
+        assert ledger.column("amount") == [Decimal("-55.20"), Decimal("100.00")]
+        assert ledger.dictionary("parser_id") == ["c24"]
+        assert ledger.column("description") == ["REWE HAMBURG", "Incoming Transfer"]
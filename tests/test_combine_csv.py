@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.cli import combine_csv
+from money_analyzer.cli.combine_csv import (
+    combine_csv_files,
+    combine_csv_files_external,
+    combine_csv_files_incremental,
+    save_manifest,
+    update_ledger_incremental,
+)
+from money_analyzer.csv_io import export_transactions_to_csv, load_transactions_from_csv
+from money_analyzer.dedup_index import DigestIndex
+from money_analyzer.models import Transaction
+from tests.fixtures.transactions import make_tx
+
+
+def run_incremental(csv_files: list[Path], ledger: Path) -> list[Path]:
+    manifest_file = ledger.with_name("ledger.manifest.json")
+    result = combine_csv_files_incremental(csv_files, ledger, manifest_file)
+    if result.changes_ledger:
+        export_transactions_to_csv(result.transactions, ledger)
+    save_manifest(manifest_file, result.manifest)
+    return result.loaded_files
+
+
+def ledger_rows(transactions: list[Transaction]) -> list[dict[str, str]]:
+    return [tx.to_csv_row() for tx in transactions]
+
+
+def test_incremental_combine_loads_only_new_and_changed_files(tmp_path: Path) -> None:
+    january = tmp_path / "jan.csv"
+    february = tmp_path / "feb.csv"
+    ledger = tmp_path / "ledger.csv"
+    export_transactions_to_csv(
+        [make_tx(1, "-10.00", "Bakery"), make_tx(2, "-5.00", "Coffee")], january
+    )
+    export_transactions_to_csv([make_tx(2, "-5.00", "Coffee")], february)
+
+    assert run_incremental([january, february], ledger) == [january, february]
+    assert run_incremental([january, february], ledger) == []
+
+    march = tmp_path / "mar.csv"
+    export_transactions_to_csv([make_tx(3, "-7.50", "Books")], march)
+    assert run_incremental([january, february, march], ledger) == [march]
+
+    # Coffee is still backed by february, Bakery is gone, Rent is new.
+    export_transactions_to_csv(
+        [make_tx(2, "-5.00", "Coffee"), make_tx(4, "-900.00", "Rent")], january
+    )
+    assert run_incremental([january, february, march], ledger) == [january]
+
+    assert ledger_rows(load_transactions_from_csv(ledger)) == ledger_rows(
+        combine_csv_files([january, february, march])
+    )
+
+
+def test_incremental_combine_retracts_rows_of_removed_inputs(tmp_path: Path) -> None:
+    a, b, c = (tmp_path / f"{name}.csv" for name in "abc")
+    ledger = tmp_path / "ledger.csv"
+    export_transactions_to_csv([make_tx(1, "-10.00", "Bakery")], a)
+    export_transactions_to_csv([make_tx(2, "-5.00", "Coffee"), make_tx(3, "-7.50", "Books")], b)
+    export_transactions_to_csv([make_tx(2, "-5.00", "Coffee")], c)
+    run_incremental([a, b, c], ledger)
+
+    # Coffee was backed by b and c; neither holds it any more.
+    b.unlink()
+    export_transactions_to_csv([make_tx(4, "-900.00", "Rent")], c)
+    assert run_incremental([a, c], ledger) == [c]
+    assert ledger_rows(load_transactions_from_csv(ledger)) == ledger_rows(
+        combine_csv_files([a, c])
+    )
+
+    c.unlink()
+    assert run_incremental([a], ledger) == []
+    assert ledger_rows(load_transactions_from_csv(ledger)) == ledger_rows(
+        combine_csv_files([a])
+    )
+
+
+def test_external_combine_matches_in_memory_combine(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(combine_csv, "MERGE_FAN_IN", 2)
+    csv_files = []
+    for index, rows in enumerate(
+        [
+            [make_tx(3, "-5.00", "Coffee"), make_tx(1, "-10.00", "Bakery")],
+            [make_tx(2, "-5.00", "coffee"), make_tx(3, "-5.00", "Coffee")],
+            [make_tx(3, "-5.00", "Coffee", account_name="C24"), make_tx(1, "20.00", "Refund")],
+            [make_tx(1, "-10.00", "Bakery"), make_tx(4, "-900.00", "Rent")],
+        ]
+    ):
+        csv_file = tmp_path / f"input-{index}.csv"
+        export_transactions_to_csv(rows, csv_file)
+        csv_files.append(csv_file)
+    output = tmp_path / "combined.csv"
+
+    rows = combine_csv_files_external(csv_files, output, max_rows_in_memory=3, tmp_dir=tmp_path)
+
+    expected = ledger_rows(combine_csv_files(csv_files))
+    assert ledger_rows(load_transactions_from_csv(output)) == expected
+    assert rows == len(expected) == 6
+
+
+@pytest.mark.parametrize("max_rows_in_memory", [1, 100])
+def test_external_combine_keeps_the_same_duplicate_as_in_memory_combine(
+    tmp_path: Path, max_rows_in_memory: int
+) -> None:
+    # The later copies sort first (" coffee " < "coffee"), but the first copy
+    # read must survive in both modes.
+    first = tmp_path / "first.csv"
+    second = tmp_path / "second.csv"
+    export_transactions_to_csv(
+        [make_tx(3, "-5.00", "Coffee", source_file="first.pdf"), make_tx(1, "-10.00", "Bakery")],
+        first,
+    )
+    export_transactions_to_csv(
+        [
+            make_tx(3, "-5.00", " coffee ", source_file="second.pdf"),
+            make_tx(3, "-5.00", "COFFEE", confidence=0.5),
+        ],
+        second,
+    )
+    output = tmp_path / "combined.csv"
+
+    combine_csv_files_external([first, second], output, max_rows_in_memory, tmp_dir=tmp_path)
+
+    combined = load_transactions_from_csv(output)
+    assert ledger_rows(combined) == ledger_rows(combine_csv_files([first, second]))
+    assert [tx.source_file for tx in combined] == ["", "first.pdf"]
+
+
+def test_dedup_index_appends_new_inputs_without_loading_ledger(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    january = tmp_path / "jan.csv"
+    february = tmp_path / "feb.csv"
+    ledger = tmp_path / "ledger.csv"
+    manifest_file = tmp_path / "ledger.manifest.json"
+    index_file = tmp_path / "ledger.csv.dedup"
+    export_transactions_to_csv(
+        [make_tx(3, "-5.00", "Coffee"), make_tx(1, "-10.00", "Bakery")], january
+    )
+    export_transactions_to_csv(
+        [make_tx(3, "-5.00", "coffee"), make_tx(2, "20.00", "Refund")], february
+    )
+    update_ledger_incremental([january], ledger, manifest_file, index_file)
+    with DigestIndex(index_file) as index:
+        assert index.covers(ledger)
+        assert len(index) == 2
+
+    def fail_full_load(csv_file: Path) -> list[Transaction]:
+        assert csv_file != ledger, "ledger must not be loaded into memory"
+        return load_transactions_from_csv(csv_file)
+
+    monkeypatch.setattr(combine_csv, "load_transactions_from_csv", fail_full_load)
+    result = update_ledger_incremental([january, february], ledger, manifest_file, index_file)
+    monkeypatch.undo()
+
+    assert result.merge_into_ledger
+    assert result.ledger_rows == 3
+    assert ledger_rows(load_transactions_from_csv(ledger)) == ledger_rows(
+        combine_csv_files([january, february])
+    )
+    with DigestIndex(index_file) as index:
+        assert index.covers(ledger)
+        assert sorted(index) == list(index)
+        assert all(tx.fingerprint() in index for tx in load_transactions_from_csv(ledger))
+
+
+def test_columnar_combine_never_overwrites_the_csv_ledger(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    export_transactions_to_csv([make_tx(1, "-10.00", "Bakery")], tmp_path / "jan.csv")
+    monkeypatch.setattr(sys, "argv", ["money-combine", "jan.csv"])
+    combine_csv.main()
+    csv_ledger = tmp_path / "output" / "combined" / "transactions.csv"
+    csv_bytes = csv_ledger.read_bytes()
+
+    monkeypatch.setattr(sys, "argv", ["money-combine", "jan.csv", "--format", "columnar"])
+    combine_csv.main()
+
+    assert csv_ledger.read_bytes() == csv_bytes
+    assert (tmp_path / "output" / "combined" / "transactions.columnar").exists()
+    assert "transactions.columnar (1 rows)" in capsys.readouterr().out
+
+
+def test_sqlite_combine_defaults_to_its_own_ledger_file(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    export_transactions_to_csv([make_tx(1, "-10.00", "Bakery")], tmp_path / "jan.csv")
+    monkeypatch.setattr(sys, "argv", ["money-combine", "jan.csv", "--format", "sqlite"])
+    combine_csv.main()
+
+    combined = tmp_path / "output" / "combined"
+    assert not (combined / "transactions.csv").exists()
+    assert (combined / "transactions.sqlite").read_bytes().startswith(b"SQLite format 3")
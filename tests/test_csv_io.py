@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import csv
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.csv_io import load_transaction_records, load_transactions_from_csv
+from money_analyzer.models import Transaction
+
+
+EXPECTED_DIR = Path(__file__).parent / "fixtures" / "expected"
+
+
+def test_bulk_loader_matches_dict_rows() -> None:
+    for name in ("n26_sample.csv", "c24_sample.csv", "vivid_sample.csv"):
+        csv_file = EXPECTED_DIR / name
+        with csv_file.open("r", encoding="utf-8", newline="") as handle:
+            expected = [Transaction.from_csv_row(row) for row in csv.DictReader(handle)]
+
+        assert load_transactions_from_csv(csv_file) == expected
+
+
+def test_bulk_loader_maps_reordered_and_missing_columns(tmp_path: Path) -> None:
+    csv_file = tmp_path / "partial.csv"
+    csv_file.write_text(
+        "amount,description,date\n"
+        "\"-1.234,50\",Rent,2026-01-01\n"
+        "\n"
+        "12.30,Refund,2026-01-01\n",
+        encoding="utf-8",
+    )
+
+    records = load_transaction_records(csv_file)
+
+    assert records == [
+        (date(2026, 1, 1), None, Decimal("-1234.50"), "EUR", "", "", "", "Rent", "", "", "", "", 1.0),
+        (date(2026, 1, 1), None, Decimal("12.30"), "EUR", "", "", "", "Refund", "", "", "", "", 1.0),
+    ]
+    assert records[0][0] is records[1][0]
+
+
+def test_bulk_loader_rejects_an_empty_date(tmp_path: Path) -> None:
+    csv_file = tmp_path / "undated.csv"
+    csv_file.write_text(
+        "date,posted_date,amount\n2026-01-01,,1.00\n,2026-01-02,2.00\n", encoding="utf-8"
+    )
+
+    with pytest.raises(ValueError):
+        load_transaction_records(csv_file)
@@ -0,0 +1,400 @@
+from __future__ import annotations
+
+import csv
+import json
+import shutil
+import sys
+import tarfile
+import threading
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.cli import ingest_pdf
+from money_analyzer.cli.ingest_pdf import (
+    ParsedStatement,
+    iter_pipelined_outcomes,
+    parse_statement,
+    run_ingest,
+    run_watch,
+)
+from money_analyzer.parsing import pdf_text
+from money_analyzer.parsing.pdf_cache import PdfTextCache
+from money_analyzer.parsing.router import ParserRouter
+from money_analyzer.watch import FolderWatcher
+from tests.fixtures.generate_statement_pdf_fixtures import build_statement_pdf
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "statements_pdf"
+
+
+def prepare_inputs(tmp_path: Path) -> list[Path]:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    pdf_files = []
+    for name in ("n26_synthetic_statement.pdf", "n26_synthetic_multiline_statement.pdf"):
+        pdf_files.append(Path(shutil.copy(FIXTURES_DIR / name, inbox / name)))
+    broken = inbox / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+    pdf_files.insert(1, broken)
+    return pdf_files
+
+
+def test_parallel_ingest_matches_sequential_output(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pdf_files = prepare_inputs(tmp_path)
+    output_dir = tmp_path / "parsed"
+
+    sequential_failures = run_ingest(pdf_files, output_dir, jobs=1)
+    sequential_output = capsys.readouterr().out
+    sequential_csv = {path.name: path.read_bytes() for path in output_dir.iterdir()}
+    shutil.rmtree(output_dir)
+
+    parallel_failures = run_ingest(pdf_files, output_dir, jobs=2)
+    parallel_output = capsys.readouterr().out
+    parallel_csv = {path.name: path.read_bytes() for path in output_dir.iterdir()}
+
+    assert sequential_failures == parallel_failures == 1
+    assert parallel_output == sequential_output
+    assert parallel_csv == sequential_csv
+    assert [line.split(" ", 2)[:2] for line in parallel_output.splitlines()] == [
+        ["OK", "n26_synthetic_statement.pdf:"],
+        ["ERROR", "broken.pdf:"],
+        ["OK", "n26_synthetic_multiline_statement.pdf:"],
+    ]
+
+
+def test_pipeline_bounds_statements_in_flight_and_keeps_input_order(tmp_path: Path) -> None:
+    pdf_files = prepare_inputs(tmp_path) * 3
+    router = ParserRouter()
+    read: list[Path] = []
+    written = 0
+    most_in_flight = 0
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+
+        def submit(pdf_file: Path, member: str, data: bytes) -> Future[ParsedStatement]:
+            read.append(pdf_file)
+            return executor.submit(parse_statement, router, pdf_file, data)
+
+        outcomes = []
+        for outcome in iter_pipelined_outcomes(pdf_files, submit, tmp_path / "parsed", 2):
+            most_in_flight = max(most_in_flight, len(read) - written)
+            written += 1
+            outcomes.append(outcome)
+
+    assert most_in_flight <= 2
+    assert [outcome.pdf_file for outcome in outcomes] == pdf_files
+    assert [outcome.failed for outcome in outcomes] == [False, True, False] * 3
+
+
+def test_cli_splits_long_statements_across_jobs_with_one_page_pool(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf_files = []
+    for bank in ("n26", "c24", "vivid"):
+        pdf_file = tmp_path / f"{bank}_long.pdf"
+        pdf_file.write_bytes(build_statement_pdf(bank, bookings=200, seed=5))
+        pdf_files.append(pdf_file)
+    serial_dir = tmp_path / "serial"
+    assert run_ingest(pdf_files, serial_dir) == 0
+    capsys.readouterr()
+
+    parallel_dir = tmp_path / "parallel"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "money-ingest",
+            *map(str, pdf_files),
+            "--out-dir",
+            str(parallel_dir),
+            "--no-cache",
+            "--jobs",
+            "2",
+            "--page-workers",
+            "2",
+            "--min-range-pages",
+            "2",
+        ],
+    )
+    ingest_pdf.main()
+
+    assert capsys.readouterr().out.count("OK ") == 3
+    for serial_csv in sorted(serial_dir.iterdir()):
+        assert (parallel_dir / serial_csv.name).read_bytes() == serial_csv.read_bytes()
+
+
+def test_split_ingest_skips_pypdf_in_every_process_on_a_warm_cache(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf_files = []
+    for bank in ("n26", "c24"):
+        pdf_file = tmp_path / f"{bank}_long.pdf"
+        pdf_file.write_bytes(build_statement_pdf(bank, bookings=200, seed=5))
+        pdf_files.append(pdf_file)
+    text_cache = PdfTextCache(tmp_path / "cache")
+    options = {"jobs": 2, "text_cache": text_cache, "page_workers": 2, "min_range_pages": 2}
+    assert run_ingest(pdf_files, tmp_path / "cold", **options) == 0
+    capsys.readouterr()
+
+    loads: list[None] = []
+
+    def fail_load() -> None:
+        loads.append(None)
+        raise AssertionError("pypdf should not run on a cache hit")
+
+    # The job processes are forked after the patch, so it applies to them too.
+    monkeypatch.setattr(pdf_text, "load_pdf_reader", fail_load)
+    assert run_ingest(pdf_files, tmp_path / "warm", **options) == 0
+
+    assert loads == []
+    assert capsys.readouterr().out.count("OK ") == 2
+    for cold_csv in sorted((tmp_path / "cold").iterdir()):
+        assert (tmp_path / "warm" / cold_csv.name).read_bytes() == cold_csv.read_bytes()
+
+
+def test_ingest_reads_statements_from_zip_and_tar_archives(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pdf_files = prepare_inputs(tmp_path)
+    zip_file = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(zip_file, "w") as bundle:
+        for pdf_file in pdf_files:
+            bundle.write(pdf_file, f"2026/{pdf_file.name}")
+        bundle.writestr("2026/readme.txt", "not a statement")
+    tar_file = tmp_path / "backup.tar.gz"
+    with tarfile.open(tar_file, "w:gz") as bundle:
+        bundle.add(pdf_files[0], arcname="jan/statement.pdf")
+
+    failures = run_ingest([zip_file, tar_file], tmp_path / "parsed", jobs=2)
+
+    assert failures == 1
+    assert [line.split(" ", 2)[:2] for line in capsys.readouterr().out.splitlines()] == [
+        ["OK", "bundle.zip!2026/n26_synthetic_statement.pdf:"],
+        ["ERROR", "bundle.zip!2026/broken.pdf:"],
+        ["OK", "bundle.zip!2026/n26_synthetic_multiline_statement.pdf:"],
+        ["OK", "backup.tar.gz!jan/statement.pdf:"],
+    ]
+    output_file = tmp_path / "parsed" / "backup!jan_statement.n26.csv"
+    with output_file.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert {row["source_file"] for row in rows} == {"backup.tar.gz!jan/statement.pdf"}
+
+
+def test_unreadable_archive_member_is_reported_and_later_members_are_read(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    statement = FIXTURES_DIR / "n26_synthetic_statement.pdf"
+    zip_file = tmp_path / "bundle.zip"
+    with zipfile.ZipFile(zip_file, "w") as bundle:
+        for name in ("jan.pdf", "feb.pdf", "mar.pdf"):
+            bundle.write(statement, name)
+    with zipfile.ZipFile(zip_file) as bundle:
+        damaged = bundle.getinfo("feb.pdf")
+    # Flip bytes inside feb.pdf's data so only its CRC check fails.
+    raw = bytearray(zip_file.read_bytes())
+    data_start = damaged.header_offset + 30 + len(damaged.filename)
+    raw[data_start + 100 : data_start + 104] = bytes(
+        byte ^ 0xFF for byte in raw[data_start + 100 : data_start + 104]
+    )
+    zip_file.write_bytes(raw)
+    empty_zip = tmp_path / "empty.zip"
+    with zipfile.ZipFile(empty_zip, "w") as bundle:
+        bundle.writestr("readme.txt", "no statements here")
+
+    failures = run_ingest([zip_file, empty_zip], tmp_path / "parsed")
+
+    lines = capsys.readouterr().out.splitlines()
+    assert failures == 1
+    assert [line.split(" ", 2)[:2] for line in lines] == [
+        ["OK", "bundle.zip!jan.pdf:"],
+        ["ERROR", "bundle.zip!feb.pdf:"],
+        ["OK", "bundle.zip!mar.pdf:"],
+        ["WARN", "empty.zip:"],
+    ]
+    assert "failed to read" in lines[1]
+    assert lines[3] == "WARN empty.zip: archive contains no PDF statements"
+
+
+def test_stats_file_records_per_file_metrics(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pdf_files = prepare_inputs(tmp_path)
+    output_dir = tmp_path / "parsed"
+    stats_file = tmp_path / "stats.json"
+
+    failures = run_ingest(pdf_files, output_dir, jobs=1, stats_file=stats_file)
+    capsys.readouterr()
+
+    stats = json.loads(stats_file.read_text(encoding="utf-8"))
+    assert failures == stats["failures"] == 1
+    assert [Path(item["source_file"]).name for item in stats["files"]] == [
+        path.name for path in pdf_files
+    ]
+    parsed = stats["files"][0]
+    rows = (output_dir / "n26_synthetic_statement.n26.csv").read_text(encoding="utf-8")
+    assert parsed["parser_id"] == "n26"
+    assert parsed["bytes"] == pdf_files[0].stat().st_size
+    assert parsed["pages"] >= 1
+    assert parsed["lines"] > parsed["transactions"] == len(rows.splitlines()) - 1
+    for stage in ("extract_ms", "route_ms", "parse_ms", "export_ms"):
+        assert parsed[stage] >= 0
+    assert stats["files"][1]["transactions"] == 0
+
+
+def test_folder_watcher_reports_settled_new_and_modified_files(tmp_path: Path) -> None:
+    now = [0.0]
+    done = tmp_path / "done.pdf"
+    done.write_bytes(b"old")
+    watcher = FolderWatcher(
+        tmp_path,
+        settle_seconds=1.0,
+        is_current=lambda path, _: path == done,
+        clock=lambda: now[0],
+    )
+    fresh = tmp_path / "fresh.pdf"
+    fresh.write_bytes(b"partial")
+
+    assert watcher.poll() == []
+    now[0] = 0.5
+    fresh.write_bytes(b"partial, still copying")
+    assert watcher.poll() == []
+    now[0] = 1.2
+    assert watcher.poll() == []
+    now[0] = 1.6
+    assert watcher.poll() == [fresh]
+    assert watcher.poll() == []
+
+    done.write_bytes(b"replaced statement")
+    assert watcher.poll() == []
+    now[0] = 3.0
+    assert watcher.poll() == [done]
+
+
+def stop_after_polls(monkeypatch: pytest.MonkeyPatch, polls: int) -> threading.Event:
+    stop = threading.Event()
+    remaining = iter(range(polls, 0, -1))
+    poll = FolderWatcher.poll
+
+    def counted_poll(watcher: FolderWatcher) -> list[Path]:
+        if next(remaining, 0) == 1:
+            stop.set()
+        return poll(watcher)
+
+    monkeypatch.setattr(FolderWatcher, "poll", counted_poll)
+    return stop
+
+
+def test_watch_ingests_new_statements_and_updates_ledger(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    output_dir = tmp_path / "parsed"
+    ledger = tmp_path / "ledger.csv"
+    shutil.copy(FIXTURES_DIR / "n26_synthetic_statement.pdf", inbox)
+
+    failures = run_watch(
+        inbox,
+        output_dir,
+        combine_output=ledger,
+        poll_interval=0,
+        settle_seconds=0,
+        stop=stop_after_polls(monkeypatch, 2),
+    )
+
+    output = capsys.readouterr().out
+    assert failures == 0
+    assert "OK n26_synthetic_statement.pdf:" in output
+    assert (output_dir / "n26_synthetic_statement.n26.csv").exists()
+    assert len(ledger.read_text(encoding="utf-8").splitlines()) == 3
+
+    # A restarted watcher skips statements whose CSV is already up to date.
+    stop = stop_after_polls(monkeypatch, 1)
+    assert run_watch(inbox, output_dir, poll_interval=0, settle_seconds=0, stop=stop) == 0
+    assert "OK" not in capsys.readouterr().out
+
+
+def test_watch_survives_a_broken_pool_and_a_failed_combine(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    ledger = tmp_path / "ledger.csv"
+    shutil.copy(FIXTURES_DIR / "n26_synthetic_statement.pdf", inbox)
+    pipeline = ingest_pdf.iter_pipelined_outcomes
+    combine = ingest_pdf.update_ledger_incremental
+    batches: list[list[Path]] = []
+    combines: list[Path] = []
+
+    def crashing_pipeline(pdf_files: list[Path], *args, **kwargs):
+        batches.append(pdf_files)
+        if len(batches) == 1:
+            raise BrokenProcessPool("worker died")
+        return pipeline(pdf_files, *args, **kwargs)
+
+    def failing_combine(csv_files: list[Path], output: Path):
+        combines.append(output)
+        if len(combines) == 1:
+            raise OSError("disk full")
+        return combine(csv_files, output)
+
+    monkeypatch.setattr(ingest_pdf, "iter_pipelined_outcomes", crashing_pipeline)
+    monkeypatch.setattr(ingest_pdf, "update_ledger_incremental", failing_combine)
+
+    failures = run_watch(
+        inbox,
+        tmp_path / "parsed",
+        combine_output=ledger,
+        poll_interval=0,
+        settle_seconds=0,
+        stop=stop_after_polls(monkeypatch, 3),
+    )
+
+    output = capsys.readouterr().out
+    assert failures == 0
+    assert len(batches) == 2
+    assert "ERROR parser pool stopped (worker died); restarting it" in output
+    assert "OK n26_synthetic_statement.pdf:" in output
+    assert "failed (disk full); will retry" in output
+    assert len(ledger.read_text(encoding="utf-8").splitlines()) == 3
+
+
+def test_watch_retries_a_failing_statement_before_giving_up(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    (inbox / "broken.pdf").write_bytes(b"not a pdf")
+
+    failures = run_watch(
+        inbox,
+        tmp_path / "parsed",
+        poll_interval=0,
+        settle_seconds=0,
+        stop=stop_after_polls(monkeypatch, 5),
+    )
+
+    lines = capsys.readouterr().out.splitlines()
+    assert failures == 1
+    assert sum(line.startswith("ERROR broken.pdf:") for line in lines) == 3
+    assert lines[-1] == "WARN broken.pdf: giving up after 3 attempts until the file changes"
+
+
+def test_parallel_ingest_accepts_regex_rules_with_inline_flags(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    rules_file = tmp_path / "rules.csv"
+    rules_file.write_text("match,pattern,category\nregex,(?i)grocery,groceries\n", encoding="utf-8")
+
+    failures = run_ingest(
+        prepare_inputs(tmp_path), tmp_path / "parsed", jobs=2, categories_file=rules_file
+    )
+
+    assert failures == 1
+    assert "matched" in capsys.readouterr().out.splitlines()[-1]
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import pytest
+
+from money_analyzer.parsing.normalize import StatementNormalizer
+from money_analyzer.utils import parse_amount, parse_date
+
+
+AMOUNTS = ["-42,33", "2500,00", "+1.234,56", "1.234", "12,5", "-3,00 EUR", "7,00-", "99"]
+DATES = ["01.02.2026", "01.02.2026", "03/02/2026", "2026-02-04", " 05.02.2026 "]
+
+
+def test_german_statement_is_detected_and_matches_fallback() -> None:
+    normalizer = StatementNormalizer()
+
+    assert [normalizer.parse_date(value) for value in DATES] == [parse_date(v) for v in DATES]
+    assert [normalizer.parse_amount(value) for value in AMOUNTS] == [
+        parse_amount(value) for value in AMOUNTS
+    ]
+    assert normalizer.date_format == "%d.%m.%Y"
+    assert normalizer.decimal_comma is True
+
+
+def test_point_decimal_statement_keeps_fallback_semantics() -> None:
+    normalizer = StatementNormalizer()
+    values = ["-42.33", "1,234.56", "2500"]
+
+    assert [normalizer.parse_amount(value) for value in values] == [
+        parse_amount(value) for value in values
+    ]
+    assert normalizer.decimal_comma is False
+
+
+def test_invalid_dates_still_raise() -> None:
+    normalizer = StatementNormalizer()
+
+    with pytest.raises(ValueError):
+        normalizer.parse_date("31.02.2026")
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 import csv
+import subprocess
+import sys
+from collections.abc import Iterator
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.parsing import registry
+from money_analyzer.parsing.base import StatementParser
 from money_analyzer.parsing.parsers.c24 import C24Parser
 from money_analyzer.parsing.parsers.n26 import N26Parser
 from money_analyzer.parsing.parsers.vivid import VividParser
-from money_analyzer.parsing.router import ParserRouter
+from money_analyzer.parsing.router import ParserNotFoundError, ParserRouter
+from money_analyzer.parsing.spec import DATE_TOKEN, LineGrammar, ParserSpec, SpecParser
 
 
 FIXTURES = Path(__file__).parent / "fixtures"
@@ -61,3 +71,199 @@ def test_router_selects_correct_parser() -> None:
     assert n26_parser.parser_id == "n26"
     assert c24_parser.parser_id == "c24"
     assert vivid_parser.parser_id == "vivid"
+
+
+def test_router_rejects_unknown_document_after_first_pages() -> None:
+    router = ParserRouter()
+    consumed: list[int] = []
+
+    def pages() -> Iterator[str]:
+        for number in range(200):
+            consumed.append(number)
+            yield f"Invoice page {number}"
+
+    with pytest.raises(ParserNotFoundError):
+        router.route_pages(pages(), source_file="invoice.pdf")
+
+    assert consumed == [0, 1]
+
+
+def test_router_routes_from_first_page_and_keeps_remaining_pages() -> None:
+    router = ParserRouter()
+    pages = iter(["N26 Bank\nKontoauszug", "01.01.2026 EDEKA BERLIN -42,33 EUR"])
+
+    best, head = router.route_pages(pages, source_file="statement.pdf")
+
+    assert best.parser.parser_id == "n26"
+    assert head == ["N26 Bank\nKontoauszug"]
+    assert list(pages) == ["01.01.2026 EDEKA BERLIN -42,33 EUR"]
+
+
+def test_router_reads_next_page_when_cover_page_only_matches_weakly() -> None:
+    router = ParserRouter()
+    pages = iter(["Account statement", "N26 Bank\nKontoauszug", "01.01.2026 EDEKA -1,00 EUR"])
+
+    best, head = router.route_pages(pages, source_file="jan.pdf")
+
+    assert best.parser.parser_id == "n26"
+    assert head == ["Account statement", "N26 Bank\nKontoauszug"]
+    fallback = router.route_pages(iter(["Account statement"]), "jan.pdf")[0]
+    assert fallback.parser.parser_id == "vivid"
+
+
+@pytest.mark.parametrize(
+    ("parser", "fixture_name"),
+    [(N26Parser(), "n26_sample"), (C24Parser(), "c24_sample"), (VividParser(), "vivid_sample")],
+)
+def test_streaming_parse_matches_golden_fixture(
+    parser: StatementParser, fixture_name: str, tmp_path: Path
+) -> None:
+    lines = read_fixture(f"{fixture_name}.txt").splitlines()
+    stream = parser.iter_transactions(iter(lines), source_file=f"{fixture_name}.pdf")
+
+    output_file = tmp_path / f"{fixture_name}.csv"
+    count = export_transactions_to_csv(stream, output_file)
+
+    expected = read_expected_csv(f"{fixture_name}.csv")
+    with output_file.open("r", encoding="utf-8", newline="") as handle:
+        assert list(csv.DictReader(handle)) == expected
+    assert count == len(expected)
+
+
+def test_router_scores_parsers_in_one_pass() -> None:
+    router = ParserRouter()
+    text = "C24 Bank Kontoauszug\nAccount statement\n03.01.2026 REWE -1,00 EUR"
+
+    scores = {candidate.parser.parser_id: candidate for candidate in router.score(text, "jan.pdf")}
+
+    assert scores["c24"].matched_keywords == ("c24", "c24 bank")
+    assert scores["c24"].score == 2.0
+    assert scores["vivid"].score == 0.25
+    assert scores["n26"].score == 0.0
+    assert scores["c24"].confidence == pytest.approx(2.0 / 2.25)
+    assert router.route(text, "jan.pdf").parser_id == "c24"
+
+
+def test_cli_startup_does_not_import_pypdf_or_parser_modules() -> None:
+    script = (
+        "import sys\n"
+        "import money_analyzer.cli.ingest_pdf, money_analyzer.cli.combine_csv\n"
+        "from money_analyzer.parsing.router import ParserRouter\n"
+        "router = ParserRouter()\n"
+        "print(sorted(name for name in sys.modules"
+        " if name.startswith(('pypdf', 'money_analyzer.parsing.parsers.'))))\n"
+        "router.parsers\n"
+        "print(sorted(name for name in sys.modules"
+        " if name.startswith('money_analyzer.parsing.parsers.')))\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=Path(__file__).parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    before, after = completed.stdout.splitlines()
+    assert before == "[]"
+    assert "money_analyzer.parsing.parsers.n26" in after
+
+
+def test_registered_parser_is_loaded_by_default_router(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(registry, "_registered", dict(registry.BUILTIN_PARSERS))
+    registry.register_parser("example", "tests.fixtures.example_parser:ExampleParser")
+
+    router = ParserRouter()
+
+    assert [parser.parser_id for parser in router.parsers] == ["n26", "c24", "vivid", "example"]
+    assert router.route("Example Bank statement", "jan.pdf").parser_id == "example"
+
+
+def test_spec_parser_tries_each_line_grammar() -> None:
+    spec = ParserSpec(
+        parser_id="example",
+        bank_name="Example Bank",
+        detection_keywords=("example bank",),
+        ignored_prefixes=("01.01.2024 opening balance",),
+        line_grammars=(
+            LineGrammar(
+                rf"^(?P<date>{DATE_TOKEN})\s+(?P<description>.+?)\s+(?P<amount>[+-]?\d[\d.,]*)$"
+            ),
+            LineGrammar(
+                rf"^(?P<day>{DATE_TOKEN})\s+(?P<payee>.+?)\s+\|\s+"
+                r"(?P<value>[+-]?\d[\d.,]*)\s+(?P<currency>USD)$",
+                fields={
+                    "date": "day",
+                    "description": "payee",
+                    "amount": "value",
+                    "currency": "currency",
+                },
+            ),
+        ),
+    )
+    parser = SpecParser(spec)
+    text = "\n".join(
+        [
+            "Example Bank statement",
+            "01.01.2024 Opening balance 100,00",
+            "02.01.2024 Coffee shop -3,50",
+            "03.01.2024 Bookstore | -12,00 USD",
+        ]
+    )
+
+    result = parser.parse_text(text, source_file="example.pdf")
+
+    assert parser.can_parse(text)
+    rows = [
+        (tx.date.day, tx.description, str(tx.amount), tx.currency) for tx in result.transactions
+    ]
+    assert rows == [(2, "Coffee shop", "-3.50", "EUR"), (3, "Bookstore", "-12.00", "USD")]
+    assert {tx.parser_id for tx in result.transactions} == {"example"}
+
+
+def test_n26_booking_takes_description_after_latest_table_header() -> None:
+    text = "\n".join(
+        [
+            "N26 Bank",
+            "PREVIOUS PAGE TEXT",
+            "Beschreibung Verbuchungsdatum Betrag",
+            "Mastercard - Groceries",
+            "CORNER BAKERY",
+            "Bargeld Service",
+            "Wertstellung 05.01.2026",
+            "Lastschriften",
+            "05.01.2026 -3,20€",
+            "Wertstellung 06.01.2026",
+            "06.01.2026 -1,00 EUR",
+        ]
+    )
+
+    result = N26Parser().parse_text(text, source_file="n26.pdf")
+
+    rows = [tx.to_csv_row() for tx in result.transactions]
+    assert [(row["description"], row["posted_date"], row["amount"]) for row in rows] == [
+        ("CORNER BAKERY", "", "-3.20")
+    ]
+
+
+def test_spec_rejects_prefilter_that_would_drop_grammar_lines() -> None:
+    grammar = LineGrammar(rf"^(?P<description>.+?)\s+(?P<date>{DATE_TOKEN})\s+(?P<amount>\S+)$")
+    spec = ParserSpec(
+        parser_id="example",
+        bank_name="Example Bank",
+        detection_keywords=("example bank",),
+        line_grammars=(grammar,),
+    )
+
+    transactions = list(SpecParser(spec).iter_line_transactions(["Coffee 01.01.2026 -3,00"]))
+    assert [tx.description for tx in transactions] == ["Coffee"]
+    with pytest.raises(ValueError, match="would drop every line"):
+        SpecParser(replace(spec, prefilter="date"))
+
+
+def test_router_with_explicit_empty_parser_list_does_not_load_registry() -> None:
+    router = ParserRouter(parsers=[])
+
+    assert router.parsers == []
+    with pytest.raises(ParserNotFoundError):
+        router.route("N26 Bank", "jan.pdf")
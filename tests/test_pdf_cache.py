@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.parsing import pdf_text
+from money_analyzer.parsing.pdf_cache import PdfTextCache
+from money_analyzer.parsing.pdf_text import extract_text_from_pdf
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "statements_pdf"
+
+
+def test_cached_text_is_reused_without_pypdf(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    pdf_path = FIXTURES_DIR / "n26_synthetic_statement.pdf"
+    cache = PdfTextCache(tmp_path / "cache")
+
+    first = extract_text_from_pdf(pdf_path, cache=cache)
+
+    def fail_extract(stream: object) -> Iterator[str]:
+        raise AssertionError("pypdf should not run on a cache hit")
+
+    monkeypatch.setattr(pdf_text, "_iter_pages", fail_extract)
+    second = extract_text_from_pdf(pdf_path, cache=cache)
+
+    assert second == first
+    assert "Grocery Store" in second
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path: Path) -> None:
+    cache = PdfTextCache(tmp_path, max_bytes=120)
+    cache.put("old", ["a" * 40])
+    cache.put("recent", ["b" * 40])
+    os.utime(tmp_path / "old.json", ns=(1, 1))
+    os.utime(tmp_path / "recent.json", ns=(2, 2))
+    assert cache.get("old") == ["a" * 40]
+
+    cache.put("new", ["c" * 40])
+
+    assert cache.get("recent") is None
+    assert cache.get("old") == ["a" * 40]
+    assert cache.get("new") == ["c" * 40]
+
+
+def test_cache_scans_directory_only_when_over_the_cap(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    cache = PdfTextCache(tmp_path, max_bytes=1024)
+    stale_tmp = tmp_path / "crashed.tmp"
+    stale_tmp.write_text("x" * 100, encoding="utf-8")
+    os.utime(stale_tmp, (1, 1))
+    scans = []
+    evict = cache.evict
+
+    def counting_evict() -> None:
+        scans.append(True)
+        evict()
+
+    monkeypatch.setattr(cache, "evict", counting_evict)
+
+    for index in range(10):
+        cache.put(f"entry{index}", ["a" * 40])
+
+    assert len(scans) == 1
+    assert not stale_tmp.exists()
+
+    cache.put("large", ["b" * 600])
+
+    assert len(scans) == 2
+    assert cache.get("entry0") is None
+    assert cache.get("large") == ["b" * 600]
@@ -2,7 +2,12 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import pytest
+
 from money_analyzer.parsing.parsers.n26 import N26Parser
+from money_analyzer.parsing.pdf_text import PageRangeExtractor, extract_pages_from_pdf
+from money_analyzer.parsing.router import ParserRouter
+from tests.fixtures.generate_statement_pdf_fixtures import STATEMENT_GENERATORS, build_statement_pdf
 
 
 FIXTURES_DIR = Path(__file__).parent / "fixtures" / "statements_pdf"
@@ -40,3 +45,30 @@ def test_n26_parser_parse_pdf_with_synthetic_multiline_structure() -> None:
     assert rows[2]["posted_date"] == "2026-01-04"
     assert rows[2]["description"] == "From Rainy Day Space"
     assert rows[2]["amount"] == "520.00"
+
+
+@pytest.mark.parametrize("bank", sorted(STATEMENT_GENERATORS))
+def test_generated_multi_page_statement_parses_every_booking(bank: str, tmp_path: Path) -> None:
+    pdf_bytes = build_statement_pdf(bank, bookings=60, seed=3)
+    pdf_path = tmp_path / f"{bank}.pdf"
+    pdf_path.write_bytes(pdf_bytes)
+
+    result, decision = ParserRouter().parse_pdf(pdf_path)
+
+    assert build_statement_pdf(bank, bookings=60, seed=3) == pdf_bytes
+    assert len(extract_pages_from_pdf(pdf_path)) > 1
+    assert decision.parser_id == bank
+    assert len(result.transactions) == 60
+
+
+def test_page_range_extraction_keeps_page_order(tmp_path: Path) -> None:
+    pdf_path = tmp_path / "long.pdf"
+    pdf_path.write_bytes(build_statement_pdf("n26", bookings=200, seed=5))
+    serial_pages = extract_pages_from_pdf(pdf_path)
+
+    with PageRangeExtractor(workers=3, min_range_pages=4) as page_extractor:
+        assert page_extractor.page_ranges(len(serial_pages)) == [(0, 6), (6, 12), (12, 18)]
+        result, _ = ParserRouter(page_extractor=page_extractor).parse_pdf(pdf_path)
+
+    assert extract_pages_from_pdf(pdf_path, page_workers=2) == serial_pages
+    assert len(result.transactions) == 200
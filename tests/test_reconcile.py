@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import csv
+from pathlib import Path
+
+from money_analyzer.reconcile import export_transfer_pairs, mark_transfers, match_transfers
+from money_analyzer.table import TransactionTable
+from tests.fixtures.transactions import make_tx
+
+
+def brute_force_candidates(table: TransactionTable, window_days: int) -> set[tuple[int, int]]:
+    accounts = table.codes["account_name"]
+    return {
+        (out_index, in_index)
+        for out_index in range(len(table))
+        for in_index in range(len(table))
+        if table.cents[out_index] < 0
+        and table.cents[in_index] == -table.cents[out_index]
+        and accounts[out_index] != accounts[in_index]
+        and abs(table.dates[out_index] - table.dates[in_index]) <= window_days
+    }
+
+
+def test_match_transfers_links_opposite_rows_on_other_accounts(tmp_path: Path) -> None:
+    table = TransactionTable.from_transactions(
+        [
+            make_tx(1, "-100.00", "To C24", "N26"),
+            make_tx(2, "100.00", "From N26", "C24"),
+            make_tx(3, "-50.00", "Groceries", "N26"),
+            make_tx(3, "50.00", "Refund", "N26"),
+            make_tx(4, "-20.00", "To Vivid", "C24"),
+            make_tx(10, "20.00", "Too late", "Vivid"),
+            make_tx(11, "-75.00", "To N26", "Vivid"),
+            make_tx(11, "75.00", "First candidate", "C24"),
+            make_tx(11, "75.00", "From Vivid", "N26"),
+        ]
+    )
+
+    pairs = match_transfers(table, window_days=3)
+
+    assert [(pair.outgoing, pair.incoming, pair.days_apart) for pair in pairs] == [
+        (0, 1, 1),
+        (6, 7, 0),
+    ]
+    assert {(pair.outgoing, pair.incoming) for pair in pairs} <= brute_force_candidates(table, 3)
+
+    mark_transfers(table, pairs)
+    assert [tx.transaction_type for tx in table.iter_transactions()] == [
+        "transfer",
+        "transfer",
+        "",
+        "",
+        "",
+        "",
+        "transfer",
+        "transfer",
+        "",
+    ]
+
+    output = tmp_path / "transfers.csv"
+    assert export_transfer_pairs(table, pairs, output) == 2
+    with output.open(newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    assert rows[0]["from_account"] == "N26"
+    assert rows[0]["to_account"] == "C24"
+    assert rows[0]["amount"] == "100.00"
+    assert rows[1]["in_description"] == "First candidate"
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.cli import report
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.models import Transaction
+from money_analyzer.rollup import Rollup, group_rollup, load_rollup, save_rollup, update_rollup
+from tests.fixtures.transactions import make_tx
+
+
+def card_payment(month: int, day: int, amount: str, merchant: str, **fields: str) -> Transaction:
+    # Multi-line descriptions exercise the quoted rows inside a month's range.
+    return make_tx(
+        day, amount, f"Card payment\n{merchant}", month=month, merchant=merchant, **fields
+    )
+
+
+HISTORY = [
+    card_payment(1, 3, "-12.50", "Bakery", category="food"),
+    card_payment(1, 9, "-40.00", "Books", account_name="C24", category="fun"),
+    card_payment(1, 20, "-7.50", "Bakery", category="food"),
+    card_payment(2, 2, "2500.00", "Employer", category="salary"),
+    card_payment(2, 14, "-3.00", "Bakery", category="food"),
+]
+
+
+def test_rollup_groups_by_any_dimensions(tmp_path: Path) -> None:
+    ledger_file = tmp_path / "transactions.csv"
+    export_transactions_to_csv(HISTORY, ledger_file)
+
+    rollup = update_rollup(ledger_file, Rollup())
+
+    assert group_rollup(rollup, ["month"]) == {
+        ("2026-01",): [3, -6000, -4000, -750],
+        ("2026-02",): [2, 249700, -300, 250000],
+    }
+    assert group_rollup(rollup, ["category", "account"]) == {
+        ("food", "N26"): [3, -2300, -1250, -300],
+        ("fun", "C24"): [1, -4000, -4000, -4000],
+        ("salary", "N26"): [1, 250000, 250000, 250000],
+    }
+
+
+def test_appending_a_month_only_scans_changed_months(tmp_path: Path) -> None:
+    ledger_file = tmp_path / "transactions.csv"
+    rollup_file = tmp_path / "transactions.csv.rollup.json"
+    export_transactions_to_csv(HISTORY, ledger_file)
+    save_rollup(rollup_file, update_rollup(ledger_file, Rollup()))
+
+    grown = HISTORY + [card_payment(3, 1, "-9.99", "Bakery", category="food")]
+    export_transactions_to_csv(grown, ledger_file)
+    rollup = update_rollup(ledger_file, load_rollup(rollup_file))
+
+    assert (rollup.reused_months, rollup.scanned_months) == (2, 1)
+    assert group_rollup(rollup, ["month", "merchant"]) == group_rollup(
+        update_rollup(ledger_file, Rollup()), ["month", "merchant"]
+    )
+
+    # A late row for the newest stored month is appended after its byte range.
+    save_rollup(rollup_file, rollup)
+    late = grown + [card_payment(3, 28, "-1.00", "Kiosk")]
+    export_transactions_to_csv(late, ledger_file)
+    rollup = update_rollup(ledger_file, load_rollup(rollup_file))
+
+    assert (rollup.reused_months, rollup.scanned_months) == (2, 1)
+    assert group_rollup(rollup, ["month"])[("2026-03",)] == [2, -1099, -999, -100]
+
+
+@pytest.mark.parametrize("damage", ["truncate", "wrong_shape"])
+def test_report_rebuilds_a_damaged_rollup_file(
+    damage: str,
+    tmp_path: Path,
+    capsys: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    ledger_file = tmp_path / "transactions.csv"
+    rollup_file = tmp_path / "transactions.csv.rollup.json"
+    export_transactions_to_csv(HISTORY, ledger_file)
+    save_rollup(rollup_file, update_rollup(ledger_file, Rollup()))
+    payload = rollup_file.read_text(encoding="utf-8")
+    if damage == "truncate":
+        rollup_file.write_text(payload[: len(payload) // 2], encoding="utf-8")
+    else:
+        rollup_file.write_text('{"version": 1, "months": []}', encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["money-report", str(ledger_file), "--by", "category"])
+
+    report.main()
+
+    captured = capsys.readouterr()
+    assert captured.err.startswith(f"WARN {rollup_file} is not a valid rollup (")
+    assert "rebuilding it" in captured.err
+    assert "Reused 0 month(s), scanned 2 month(s)" in captured.err
+    assert captured.out.splitlines() == [
+        "category,count,sum,min,max",
+        "food,3,-23.00,-12.50,-3.00",
+        "fun,1,-40.00,-40.00,-40.00",
+        "salary,1,2500.00,2500.00,2500.00",
+    ]
+    assert load_rollup(rollup_file).months.keys() == {"2026-01", "2026-02"}
+
+
+def test_report_names_the_ledger_line_with_a_bad_amount(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    ledger_file = tmp_path / "transactions.csv"
+    export_transactions_to_csv(HISTORY, ledger_file)
+    ledger = ledger_file.read_bytes()
+    ledger_file.write_bytes(ledger.replace(b",2500.00,", b",,"))
+    monkeypatch.setattr(sys, "argv", ["money-report", str(ledger_file)])
+
+    with pytest.raises(SystemExit) as exit_info:
+        report.main()
+
+    offset = ledger.index(b"2026-02-02")
+    assert str(exit_info.value) == f"Bad amount '' in ledger line at byte {offset}"
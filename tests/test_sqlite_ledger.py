@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import shutil
+import sqlite3
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from money_analyzer.cli.combine_csv import combine_csv_files
+from money_analyzer.cli.ingest_pdf import run_ingest
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer import sqlite_ledger
+from money_analyzer.sqlite_ledger import SqliteLedger
+from tests.fixtures.transactions import make_tx
+
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "statements_pdf"
+
+
+def test_upsert_skips_stored_fingerprints_and_matches_combine(tmp_path: Path) -> None:
+    first = [make_tx(3, "-5.00", "Coffee"), make_tx(1, "-10.00", "Bakery")]
+    second = [make_tx(3, "-5.00", "coffee "), make_tx(2, "20.00", "Refund", account_name="C24")]
+    csv_files = [tmp_path / "first.csv", tmp_path / "second.csv"]
+    export_transactions_to_csv(first, csv_files[0])
+    export_transactions_to_csv(second, csv_files[1])
+
+    with SqliteLedger(tmp_path / "ledger.sqlite") as ledger:
+        assert ledger.upsert(first) == 2
+        assert ledger.upsert(first + second) == 1
+        assert len(ledger) == 3
+        rows = [tx.to_csv_row() for tx in ledger.iter_transactions()]
+
+    assert rows == [tx.to_csv_row() for tx in combine_csv_files(csv_files)]
+
+
+def test_queries_filter_by_date_range_and_account(tmp_path: Path) -> None:
+    with SqliteLedger(tmp_path / "ledger.sqlite") as ledger:
+        ledger.upsert(
+            [
+                make_tx(1, "-10.00", "Bakery"),
+                make_tx(5, "-7.50", "Books", account_name="C24"),
+                make_tx(9, "-3.00", "Coffee"),
+            ]
+        )
+
+        in_range = ledger.query(start=date(2026, 1, 2), end=date(2026, 1, 9))
+        assert [tx.description for tx in in_range] == ["Books", "Coffee"]
+        assert [tx.description for tx in ledger.query(account_name="N26")] == ["Bakery", "Coffee"]
+
+    # A plain SQLite client sees the same indexes the ledger queries use.
+    with sqlite3.connect(tmp_path / "ledger.sqlite") as connection:
+        plan = connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM transactions WHERE account_name = ?", ("N26",)
+        ).fetchall()
+    assert "transactions_account" in str(plan)
+
+
+def test_upsert_commits_a_stream_in_batches(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(sqlite_ledger, "INSERT_BATCH_ROWS", 2)
+    ledger_file = tmp_path / "ledger.sqlite"
+    pulled = []
+
+    def stream():
+        for day in range(1, 6):
+            pulled.append(day)
+            if day == 5:
+                # Batches already committed are visible to other readers.
+                with SqliteLedger(ledger_file) as reader:
+                    assert len(reader) == 4
+            yield make_tx(day, "-1.00", f"Row {day}")
+
+    with SqliteLedger(ledger_file) as ledger:
+        assert ledger.upsert(stream()) == 5
+    assert pulled == [1, 2, 3, 4, 5]
+
+
+def test_ingest_upserts_each_statement_once(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    pdf_file = Path(shutil.copy(FIXTURES_DIR / "n26_synthetic_statement.pdf", tmp_path))
+    ledger_file = tmp_path / "ledger.sqlite"
+
+    for _ in range(2):
+        assert run_ingest([pdf_file], tmp_path / "parsed", ledger_file=ledger_file) == 0
+
+    first, second = capsys.readouterr().out.splitlines()
+    assert first.endswith("ledger_new=2")
+    assert second.endswith("ledger_new=0")
+    with SqliteLedger(ledger_file) as ledger:
+        assert len(ledger) == 2
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from dataclasses import replace
+from datetime import date, timedelta
+from pathlib import Path
+
+import pytest
+
+from money_analyzer import table as table_module
+from money_analyzer.csv_io import export_transactions_to_csv
+from money_analyzer.models import Transaction
+from money_analyzer.table import TransactionTable, export_table_to_csv
+from tests.fixtures.transactions import make_tx
+
+
+def with_every_column(tx: Transaction) -> Transaction:
+    # Optional columns are set too, so round trips cover all of them.
+    return replace(
+        tx,
+        posted_date=tx.date + timedelta(days=1),
+        source_file=f"{tx.account_name.lower()}.pdf",
+        confidence=0.9,
+    )
+
+
+TRANSACTIONS = [
+    with_every_column(tx)
+    for tx in (
+        make_tx(3, "-5.00", "Coffee"),
+        make_tx(1, "-1234.50", "Rent"),
+        make_tx(3, "-5.00", " coffee "),
+        make_tx(3, "-5.00", "Coffee", account_name="C24"),
+        make_tx(2, "0.05", "Interest"),
+    )
+]
+
+
+def test_table_round_trips_transactions() -> None:
+    table = TransactionTable.from_transactions(TRANSACTIONS)
+
+    assert len(table) == 5
+    assert table.to_transactions() == TRANSACTIONS
+    assert list(table.cents) == [-500, -123450, -500, -500, 5]
+    assert table.dictionaries["account_name"].values == ["N26", "C24"]
+
+
+def test_table_dedupe_and_sort_match_transaction_semantics() -> None:
+    table = TransactionTable.from_transactions(TRANSACTIONS)
+
+    result = table.deduplicated().sorted().to_transactions()
+
+    assert table.fingerprints() == [tx.fingerprint() for tx in TRANSACTIONS]
+    seen: set[int] = set()
+    expected = []
+    for tx in TRANSACTIONS:
+        if tx.fingerprint() not in seen:
+            seen.add(tx.fingerprint())
+            expected.append(tx)
+    expected.sort(key=lambda tx: (tx.date, tx.amount, tx.description.lower()))
+    assert result == expected
+
+
+def test_table_filter_and_csv_export(tmp_path: Path) -> None:
+    table = TransactionTable.from_transactions(TRANSACTIONS)
+
+    c24 = table.filter(table.mask_equals("account_name", "C24"))
+    early = table.filter(table.mask_date_range(end=date(2026, 1, 2)))
+
+    assert [tx.account_name for tx in c24.iter_transactions()] == ["C24"]
+    assert [tx.description for tx in early.iter_transactions()] == ["Rent", "Interest"]
+
+    table_csv = tmp_path / "table.csv"
+    list_csv = tmp_path / "list.csv"
+    export_table_to_csv(table, table_csv)
+    export_transactions_to_csv(TRANSACTIONS, list_csv)
+    assert table_csv.read_bytes() == list_csv.read_bytes()
+    assert TransactionTable.from_csv(table_csv).to_transactions() == TRANSACTIONS
+
+
+def test_from_csv_reads_in_chunks(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(table_module, "CSV_CHUNK_ROWS", 2)
+    csv_file = tmp_path / "ledger.csv"
+    export_transactions_to_csv(TRANSACTIONS, csv_file)
+
+    assert TransactionTable.from_csv(csv_file).to_transactions() == TRANSACTIONS